@@ -1,11 +1,44 @@
 import sys
 import os
+import time
+
+if __name__ == '__main__':
+    # A second launch (or a CLI call like `DropShelf.py search foo`) only needs
+    # to talk to the running instance — do that before the Qt/keyboard imports.
+    # Anything else (--daemon, Qt's -platform/-style...) starts the app below.
+    import dropshelf_cli
+    if dropshelf_cli.is_command(sys.argv[1:]):
+        sys.exit(dropshelf_cli.main(sys.argv[1:]))
+    elif '--daemon' in sys.argv[1:]:
+        pass   # started below; exits there if an instance is already running
+    elif dropshelf_cli.try_show():
+        sys.exit(0)
+
+_IMPORT_STARTED = time.perf_counter()
+
 import json
+import atexit
+import queue
 import logging
+import logging.handlers
 import platform
 import subprocess
-from collections import deque
-from datetime import datetime
+import heapq
+import functools
+import itertools
+import threading
+import re
+import codecs
+import hashlib
+import hmac
+import zlib
+import base64
+import struct
+import sqlite3
+import traceback
+import importlib.util
+from collections import deque, Counter
+from datetime import datetime, timedelta
 from enum import Enum
 
 import keyboard
@@ -18,37 +51,55 @@ from PyQt6.QtWidgets import (
     QSpinBox, QFormLayout, QGroupBox
 )
 from PyQt6.QtCore import (
-    Qt, QMimeData, QUrl, QSize, QPoint, pyqtSignal, QFileInfo, QEvent,
-    QTimer, QThread, pyqtSignal as Signal
+    Qt, QMimeData, QUrl, QSize, QPoint, QRect, pyqtSignal, QFileInfo, QEvent,
+    QTimer, QThread, QObject, QBuffer, QByteArray, QIODevice, pyqtSignal as Signal
 )
 from PyQt6.QtNetwork import QLocalServer, QLocalSocket
 from PyQt6.QtGui import (
     QDrag, QPixmap, QIcon, QAction, QColor, QDesktopServices, QCursor,
-    QPainter, QKeySequence, QShortcut, QImage, QFont, QPalette
+    QPainter, QKeySequence, QShortcut, QImage, QImageWriter, QFont, QPalette
 )
-from PyQt6.QtSvg import QSvgRenderer
-from PyQt6.QtSvgWidgets import QSvgWidget
 
 try:
     import winreg
 except ImportError:
     winreg = None
 
-try:
-    import qrcode
-    from qrcode.image.pil import PilImage
-    HAS_QRCODE = True
-except ImportError:
-    HAS_QRCODE = False
+# qrcode pulls in PIL; it is only imported when a QR code is first shown
+HAS_QRCODE = (importlib.util.find_spec('qrcode') is not None
+              and importlib.util.find_spec('PIL') is not None)
+
+def lazy_import(name):
+    """
+    Import name now but run its code on first attribute access, so startup
+    doesn't pay for modules the first screen never touches. None if missing.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# asyncio + ssl take tens of ms to import; the fetch engine loads them
+# once it starts, after the window is up
+asyncio = lazy_import('asyncio')
+ssl = lazy_import('ssl')
 
 try:
-    import urllib.request
     import urllib.parse
     import html.parser
-    HAS_URL_FETCH = True
+    HAS_URL_FETCH = asyncio is not None and ssl is not None
 except ImportError:
     HAS_URL_FETCH = False
 
+IMPORT_MS = (time.perf_counter() - _IMPORT_STARTED) * 1000
+
 # ─── Logging ──────────────────────────────────────────────────────────────────
 def get_data_dir():
     """Get platform-specific data directory with robust error handling"""
@@ -84,16 +135,73 @@ def get_data_dir():
         os.makedirs(fallback, exist_ok=True)
         return fallback
 
+class RateLimitFilter(logging.Filter):
+    """Lets each call site log `burst` records per `window` seconds, then counts the rest.
+
+    Keyed on the source line rather than the message, so an f-string error
+    logged once per item is still one site. The first record let through
+    after a quiet spell notes how many were dropped.
+    """
+    def __init__(self, burst, window):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._sites = {}   # (pathname, lineno) -> [window start, passed, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site else 0
+                if len(self._sites) > 1000:
+                    self._sites = {k: v for k, v in self._sites.items()
+                                   if now - v[0] < self.window}
+                self._sites[key] = [now, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                return True
+            else:
+                site[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar message(s) suppressed]"
+        return True
+
+
+def setup_logging():
+    """Log through a queue so file writes and rotation happen off the calling thread."""
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+        encoding='utf-8', delay=True)
+    formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
+    output = [file_handler, logging.StreamHandler()]
+    for handler in output:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(LOG_RATE_BURST, LOG_RATE_WINDOW))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(log_queue, *output, respect_handler_level=True)
+    listener.start()
+    # Drains what is still queued before the interpreter goes away
+    atexit.register(listener.stop)
+    return listener
+
+
 DATA_DIR = get_data_dir()
 LOG_FILE = os.path.join(DATA_DIR, 'dropshelf.log')
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+LOG_MAX_BYTES   = 1024 * 1024   # rotate dropshelf.log at this size
+LOG_BACKUPS     = 3             # dropshelf.log.1 .. .3 are kept
+LOG_RATE_BURST  = 5             # records per call site per window
+LOG_RATE_WINDOW = 60.0          # seconds
+log_listener = setup_logging()
 log = logging.getLogger('DropShelf')
 
 # ─── Constants ────────────────────────────────────────────────────────────────
@@ -101,16 +209,471 @@ APP_ID = "DropShelf"
 SETTINGS_FILE  = os.path.join(DATA_DIR, 'settings.json')
 FAVORITES_FILE = os.path.join(DATA_DIR, 'favorites.json')
 TEMPLATES_FILE = os.path.join(DATA_DIR, 'templates.json')
-HISTORY_FILE   = os.path.join(DATA_DIR, 'history.json')
+HISTORY_FILE   = os.path.join(DATA_DIR, 'history.json')   # pre-SQLite history, imported once
+HISTORY_DB_FILE = os.path.join(DATA_DIR, 'history.db')
+STATS_FILE     = os.path.join(DATA_DIR, 'stats.json')
+ARCHIVE_FILE   = os.path.join(DATA_DIR, 'archive.db')
+TITLE_CACHE_FILE = os.path.join(DATA_DIR, 'title_cache.json')
+BLOB_DIR       = os.path.join(DATA_DIR, 'blobs')
+SQLITE_DAMAGED = (sqlite3.SQLITE_CORRUPT, sqlite3.SQLITE_NOTADB)   # errors that set a file aside
 DEFAULT_HOTKEY  = "ctrl+shift+x"
 ICON_CANDIDATES = ["pic.ico", "icon.ico", "pic.png", "icon.png"]
 MAX_HISTORY     = 200
-MAX_SHELF_ITEMS = 500   # cap on non-favorite shelf items to prevent memory growth
+MAX_HISTORY_LIMIT = 1_000_000   # largest history size Settings accepts
+MAX_SHELF_ITEMS = 500   # non-favorite items kept in memory; older ones go to the archive
+STARTUP_FIRST_ITEMS = 12   # items built before the window is first shown
+STARTUP_STEP_MS     = 30   # target duration of each idle-time build step after that
+LARGE_TEXT_THRESHOLD = 64 * 1024  # text longer than this (chars) is stored out of line
+TEXT_PREVIEW_CHARS   = 2048       # in-memory preview kept for out-of-line text
+TOOLTIP_MAX_CHARS    = 500
 
 class ItemType(str, Enum):
     TEXT = 'text'
     URL  = 'url'
     FILE = 'file'
+    IMAGE = 'image'
+
+# ─── Tracing ──────────────────────────────────────────────────────────────────
+TRACE_MAX_EVENTS = 200_000   # ring buffer; the oldest spans drop off first
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start', 'async_id')
+
+    def __init__(self, tracer, name, args, async_id=None):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.async_id = async_id
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer._events.append((self.name, self.start, end - self.start,
+                                    threading.get_ident(), self.args, self.async_id))
+        return False
+
+class Tracer:
+    """
+    Span recorder for the hot paths. While stopped, span() hands back a shared
+    no-op context manager, so instrumented code costs one attribute check.
+    Spans are exported in the Chrome trace event format, which both
+    chrome://tracing and ui.perfetto.dev load.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._events = deque(maxlen=TRACE_MAX_EVENTS)
+        self._origin = time.perf_counter_ns()
+        self._async_ids = itertools.count(1)
+
+    def start(self):
+        if not self.enabled:
+            self._events.clear()
+            self._origin = time.perf_counter_ns()
+            self.enabled = True
+            log.info("Tracing started")
+
+    def stop(self):
+        if self.enabled:
+            self.enabled = False
+            log.info(f"Tracing stopped ({len(self._events)} spans)")
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def async_span(self, name, **args):
+        """Span for a coroutine; concurrent ones overlap, so they get their own lanes."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args, next(self._async_ids))
+
+    def __len__(self):
+        return len(self._events)
+
+    def export_chrome(self):
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid,
+                   'tid': threading.main_thread().ident, 'args': {'name': 'GUI'}}]
+        for name, start, dur, tid, args, async_id in list(self._events):
+            ts = (start - self._origin) / 1000
+            event = {'name': name, 'cat': APP_ID, 'pid': pid, 'tid': tid, 'ts': ts}
+            if args:
+                event['args'] = {k: v if isinstance(v, (int, float, bool)) else str(v)
+                                 for k, v in args.items()}
+            if async_id is None:
+                event.update(ph='X', dur=dur / 1000)
+                events.append(event)
+            else:
+                event.update(ph='b', id=async_id)
+                events.append(event)
+                events.append({'name': name, 'cat': APP_ID, 'pid': pid, 'tid': tid,
+                               'ts': ts + dur / 1000, 'ph': 'e', 'id': async_id})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.export_chrome(), f)
+        os.replace(tmp, path)
+
+tracer = Tracer()
+if os.environ.get('DROPSHELF_TRACE'):
+    tracer.start()
+
+def traced(name):
+    """Decorator form of tracer.span() for whole functions."""
+    def wrap(func):
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, None):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+# ─── Stall Watchdog ───────────────────────────────────────────────────────────
+STALL_PING_MS      = 50    # how often the watchdog pings the GUI thread
+STALL_THRESHOLD_MS = 250   # an unanswered ping older than this is a stall
+STALL_LATENCY_SAMPLES = 4096
+STALL_RECENT       = 50
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+class StallWatchdog(QObject):
+    """
+    Background thread that pings the GUI thread every STALL_PING_MS through a
+    queued signal. A ping left unanswered past STALL_THRESHOLD_MS means the
+    event loop is blocked: the main thread's Python stack is captured right
+    then, and logged with the stall's full duration once the loop answers.
+    """
+    _ping = Signal(float)   # ping time, emitted from the watchdog thread
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ping.connect(self._pong)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._sent = None        # monotonic time of the unanswered ping
+        self._stack = None       # main-thread stack captured during a stall
+        self.latencies = deque(maxlen=STALL_LATENCY_SAMPLES)   # seconds
+        self.stalls = deque(maxlen=STALL_RECENT)   # (wall time, seconds, stack)
+        self.stall_count = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="StallWatchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        main_id = threading.main_thread().ident
+        while not self._stop.wait(STALL_PING_MS / 1000):
+            now = time.monotonic()
+            with self._lock:
+                sent = self._sent
+                if sent is None:
+                    self._sent = now
+                elif self._stack is None and (now - sent) * 1000 >= STALL_THRESHOLD_MS:
+                    frame = sys._current_frames().get(main_id)
+                    self._stack = ''.join(traceback.format_stack(frame)) if frame else ''
+                    continue
+                else:
+                    continue
+            try:
+                self._ping.emit(now)
+            except RuntimeError:
+                return   # QObject gone at interpreter shutdown
+
+    def _pong(self, sent):
+        latency = time.monotonic() - sent
+        with self._lock:
+            self._sent = None
+            stack, self._stack = self._stack, None
+        self.latencies.append(latency)
+        if stack is not None:
+            self.stall_count += 1
+            self.stalls.append((datetime.now().isoformat(), latency, stack))
+            log.warning(f"GUI thread stalled for {latency * 1000:.0f} ms; "
+                        f"main thread was at:\n{stack.rstrip()}")
+
+    def summary(self):
+        """Counts and percentiles (ms) for the Stats dialog and the STATS command."""
+        latencies = sorted(self.latencies)
+        durations = sorted(d for _, d, _ in self.stalls)
+        return {
+            'running': self._thread is not None and not self._stop.is_set(),
+            'stalls': self.stall_count,
+            'threshold_ms': STALL_THRESHOLD_MS,
+            'latency_p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'latency_p95_ms': round(percentile(latencies, 95) * 1000, 1),
+            'latency_p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            'stall_p50_ms': round(percentile(durations, 50) * 1000, 1),
+            'stall_max_ms': round(durations[-1] * 1000, 1) if durations else 0.0,
+        }
+
+watchdog = StallWatchdog()
+
+# ─── Memory Accounting ────────────────────────────────────────────────────────
+MEMORY_TRACE_FRAMES = 10   # stack depth tracemalloc records per allocation
+MEMORY_TOP_LIMIT    = 25   # allocation sites listed per snapshot or diff
+
+def process_rss():
+    """Resident set size in bytes (peak RSS on macOS), or None if unavailable."""
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                    (name, ctypes.c_size_t) for name in (
+                        'PeakWorkingSetSize', 'WorkingSetSize',
+                        'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                        'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage',
+                        'PagefileUsage', 'PeakPagefileUsage')]
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+            return counters.WorkingSetSize
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return None
+
+def approx_size(obj):
+    """Rough deep size of JSON-like data: dicts, lists, deques, strings and numbers."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, deque)):
+        size += sum(approx_size(v) for v in obj)
+    return size
+
+def pixmap_bytes(pixmap):
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+def process_memory():
+    """Process-wide part of a memory report, shared by the window and the daemon."""
+    report = {'rss': process_rss(), 'threads': threading.active_count()}
+    app = QApplication.instance()
+    if app is not None:
+        report['widgets'] = len(app.allWidgets())
+    if memory_profiler.tracing:
+        report['python_traced'], report['python_peak'] = sys.modules['tracemalloc'].get_traced_memory()
+    return report
+
+class MemoryProfiler:
+    """
+    On-demand tracemalloc. Tracing slows every allocation, so it only runs
+    between start() and stop(); each snapshot() lists the biggest allocation
+    sites and, after the first, what grew since the previous snapshot.
+    """
+    def __init__(self):
+        self._last = None
+
+    @property
+    def tracing(self):
+        module = sys.modules.get('tracemalloc')
+        return module is not None and module.is_tracing()
+
+    def start(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACE_FRAMES)
+            self._last = None
+            log.info("tracemalloc started")
+
+    def stop(self):
+        if self.tracing:
+            sys.modules['tracemalloc'].stop()
+            log.info("tracemalloc stopped")
+        self._last = None
+
+    def snapshot(self, limit=MEMORY_TOP_LIMIT):
+        import tracemalloc
+        self.start()
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        result = {'traced': current, 'peak': peak,
+                  'top': [self._site(stat) for stat in snap.statistics('lineno')[:limit]]}
+        if self._last is not None:
+            result['growth'] = [dict(self._site(stat), size_diff=stat.size_diff,
+                                     count_diff=stat.count_diff)
+                                for stat in snap.compare_to(self._last, 'lineno')[:limit]
+                                if stat.size_diff]
+        self._last = snap
+        return result
+
+    @staticmethod
+    def _site(stat):
+        frame = stat.traceback[0]
+        return {'where': f"{frame.filename}:{frame.lineno}",
+                'size': stat.size, 'count': stat.count}
+
+memory_profiler = MemoryProfiler()
+
+def format_memory_report(report, snapshot=None):
+    """Plain-text rendering of memory_report() (and a snapshot) for the dialog."""
+    lines = []
+    proc = report.get('process', {})
+    lines.append(f"Process RSS        {format_bytes(proc['rss']) if proc.get('rss') else 'n/a'}")
+    lines.append(f"Threads            {proc.get('threads', 0)}")
+    lines.append(f"Widgets (all)      {proc.get('widgets', 0)}")
+    if 'python_traced' in proc:
+        lines.append(f"Python heap        {format_bytes(proc['python_traced'])}"
+                     f" (peak {format_bytes(proc['python_peak'])})")
+    items = report.get('items', {})
+    lines.append(f"Items              {items.get('count', 0)}, "
+                 f"{format_bytes(items.get('content_bytes', 0))} in memory, "
+                 f"{format_bytes(items.get('out_of_line_bytes', 0))} in blobs")
+    for key, label in (('pixmaps', 'Item pixmaps'), ('favicons', 'Favicon cache')):
+        if key in report:
+            lines.append(f"{label:<19}{report[key]['count']}, {format_bytes(report[key]['bytes'])}")
+    history = report.get('history', {})
+    lines.append(f"History            {history.get('entries', 0)} entries on disk "
+                 f"({format_bytes(history.get('file_bytes', 0))}), {history.get('widgets', 0)} rows")
+    undo = report.get('undo', {})
+    lines.append(f"Undo stack         {undo.get('batches', 0)} batches, "
+                 f"{undo.get('entries', 0)} items, {format_bytes(undo.get('bytes', 0))}")
+    if 'archive' in report:
+        archive = report['archive']
+        lines.append(f"Archive            {archive['items']} items on disk "
+                     f"({format_bytes(archive['file_bytes'])}), {archive['paged_in']} paged in")
+    if snapshot:
+        lines.append("")
+        lines.append(f"tracemalloc: {format_bytes(snapshot['traced'])} traced, "
+                     f"peak {format_bytes(snapshot['peak'])}")
+        if 'growth' in snapshot:
+            lines.append("Growth since previous snapshot:")
+            for site in snapshot['growth']:
+                sign = '+' if site['size_diff'] > 0 else '-'
+                lines.append(f"  {sign}{format_bytes(abs(site['size_diff'])):>10}  "
+                             f"{site['count_diff']:+7d}  {site['where']}")
+        lines.append("Largest allocation sites:")
+        for site in snapshot['top']:
+            lines.append(f"  {format_bytes(site['size']):>11}  {site['count']:7d}  {site['where']}")
+    return '\n'.join(lines)
+
+# ─── Clipboard Trace Recorder ─────────────────────────────────────────────────
+TRACE_DIR = os.path.join(DATA_DIR, 'traces')
+
+class ClipboardRecorder:
+    """
+    Opt-in log of clipboard, drop and edit events, one JSON object per line,
+    for reproducing reported slowness with benchmarks/replay.py. Content
+    never reaches the file: each payload is reduced to its type, size and
+    an HMAC under a random key that is discarded when recording stops, so
+    repeats within one trace still match but a hash can't be checked
+    against guessed content.
+    """
+    VERSION = 1
+
+    def __init__(self):
+        self.path = None
+        self.events = 0
+        self._file = None
+        self._key = None
+        self._started = None
+
+    @property
+    def active(self):
+        return self._file is not None
+
+    def start(self, path=None):
+        if self.active:
+            return self.path
+        path = path or os.path.join(TRACE_DIR, f"clipboard-{datetime.now():%Y%m%d-%H%M%S}.jsonl")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', buffering=1)   # line-buffered
+        self._key = os.urandom(32)
+        self._started = time.monotonic()
+        self.path = path
+        self.events = 0
+        self._write({'ev': 'start', 'version': self.VERSION,
+                     'platform': sys.platform, 'wall': datetime.now().isoformat()})
+        log.info(f"Recording clipboard trace to {path}")
+        return path
+
+    def stop(self):
+        if not self.active:
+            return
+        try:
+            self._write({'ev': 'stop'})
+            self._file.close()
+        except Exception as e:
+            log.exception(f"Clipboard trace close error: {e}")
+        self._file = self._key = None
+        log.info(f"Clipboard trace stopped ({self.events} events)")
+
+    def _digest(self, data):
+        return hmac.new(self._key, data, 'sha256').hexdigest()[:16]
+
+    def _describe(self, dtype, content):
+        text = str(content)
+        return {'type': ItemType(dtype).value, 'size': len(text),
+                'hash': self._digest(text.encode('utf-8', errors='surrogatepass'))}
+
+    def _write(self, event):
+        try:
+            self._file.write(json.dumps(dict(t=round(time.monotonic() - self._started, 4), **event)) + '\n')
+            self.events += 1
+        except Exception as e:
+            log.warning(f"Clipboard trace write failed, stopping: {e}")
+            self._file = self._key = None
+
+    def record_clipboard(self, entries):
+        """entries: the (ItemType, content) pairs snapshot_clipboard classified."""
+        if self.active and entries:
+            self._write({'ev': 'clipboard', 'items': [self._describe(d, c) for d, c in entries]})
+
+    def record_image(self, image):
+        if self.active and not image.isNull():
+            # A 16x16 reduction is enough to tell repeats apart, and cheap
+            small = image.scaled(16, 16).convertToFormat(QImage.Format.Format_RGB32)
+            self._write({'ev': 'clipboard', 'items': [{
+                'type': ItemType.IMAGE.value, 'w': image.width(), 'h': image.height(),
+                'hash': self._digest(bytes(small.constBits().asstring(small.sizeInBytes())))}]})
+
+    def record_drop(self, batch):
+        if self.active and batch:
+            self._write({'ev': 'drop', 'items': [self._describe(e['type'], e['content'])
+                                                 for e in batch]})
+
+    def record_edit(self, dtype, old, new):
+        if self.active:
+            self._write({'ev': 'edit', 'old': self._describe(dtype, old),
+                         'item': self._describe(dtype, new)})
+
+clipboard_recorder = ClipboardRecorder()
 
 # ─── Theme System ─────────────────────────────────────────────────────────────
 THEMES = {
@@ -216,43 +779,719 @@ def set_startup(enable):
     except Exception as e:
         log.exception(f"Startup error: {e}")
 
-# ─── URL Title Fetcher (Background Thread) ────────────────────────────────────
-class TitleFetcher(QThread):
-    title_fetched = Signal(str, str)  # url, title
+# ─── URL Title Fetch Service ──────────────────────────────────────────────────
+TITLE_FETCH_WORKERS  = 4   # global cap on concurrent title fetches
+TITLE_FETCH_PER_HOST = 2   # per-host cap so one site isn't hammered
+TITLE_PRIORITY_VISIBLE    = 0
+TITLE_PRIORITY_BACKGROUND = 1
 
-    class _TitleParser(html.parser.HTMLParser):
-        def __init__(self):
-            super().__init__()
+class _TitleParser(html.parser.HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.in_title = False
+        self.title = ""
+    def handle_starttag(self, tag, attrs):
+        if tag.lower() == 'title':
+            self.in_title = True
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+    def handle_endtag(self, tag):
+        if tag.lower() == 'title':
             self.in_title = False
-            self.title = ""
-        def handle_starttag(self, tag, attrs):
-            if tag.lower() == 'title':
-                self.in_title = True
-        def handle_data(self, data):
-            if self.in_title:
-                self.title += data
-        def handle_endtag(self, tag):
-            if tag.lower() == 'title':
-                self.in_title = False
-
-    def __init__(self, url, parent=None):
-        super().__init__(parent)
-        self.url = url
 
-    def run(self):
-        if not HAS_URL_FETCH:
+# ─── HTTP Fetch Engine (asyncio) ──────────────────────────────────────────────
+FETCH_CONNECT_TIMEOUT = 4      # seconds to establish a connection
+FETCH_READ_TIMEOUT    = 4      # seconds to wait for any single read
+FETCH_MAX_REDIRECTS   = 5
+FETCH_IDLE_PER_HOST   = 2      # keep-alive connections parked per host
+FETCH_IDLE_TIMEOUT    = 30     # seconds before a parked connection is dropped
+FETCH_STOP_GRACE      = 0.5    # seconds stop() lets cancelled fetches unwind
+FETCH_DRAIN_LIMIT     = 16384  # unread body we'll still drain to keep a connection
+FETCH_USER_AGENT      = 'Mozilla/5.0'
+
+_CHARSET_HEADER_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_CHARSET_META_RE   = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+class FetchResult:
+    """Outcome of one AsyncFetchEngine.fetch() call."""
+    __slots__ = ('ok', 'status', 'headers', 'body', 'final_url')
+
+    def __init__(self, ok, status=0, headers=None, body=b"", final_url=""):
+        self.ok = ok
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+        self.final_url = final_url
+
+def detect_charset(headers, body):
+    """Charset from the Content-Type header, then <meta> tags, else utf-8."""
+    for candidate in (_CHARSET_HEADER_RE.search(headers.get('content-type', '')),
+                      _CHARSET_META_RE.search(body[:4096])):
+        if candidate:
+            name = candidate.group(1)
+            name = name.decode('ascii', 'ignore') if isinstance(name, bytes) else name
+            try:
+                return codecs.lookup(name).name
+            except LookupError:
+                pass
+    return 'utf-8'
+
+class AsyncFetchEngine:
+    """
+    Minimal HTTP/1.1 client on a private asyncio loop in one daemon thread.
+    Connections are kept alive and pooled per (scheme, host, port), and a
+    response is streamed so callers can stop reading once they have what
+    they need. submit() hands back a concurrent.futures.Future; cancelling
+    it cancels the underlying task.
+    """
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._idle = {}   # (scheme, host, port) -> [(reader, writer, parked_at)]
+        self._ssl_context = ssl.create_default_context()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="FetchEngine", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self):
+        """Close parked connections and stop the loop without blocking the caller."""
+        if self._stopping:
+            return
+        self._stopping = True
+
+        async def _shutdown():
+            tasks = asyncio.all_tasks(self._loop) - {asyncio.current_task()}
+            for task in tasks:
+                task.cancel()
+            for conns in self._idle.values():
+                for _, writer, _ in conns:
+                    writer.close()
+            self._idle.clear()
+            # Let the cancellations unwind, or the tasks are destroyed pending
+            if tasks:
+                await asyncio.wait(tasks, timeout=FETCH_STOP_GRACE)
+            self._loop.stop()
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), self._loop)
+        except RuntimeError:
+            pass  # loop already closed
+
+    # ── Connection pool ──
+    async def _acquire(self, key):
+        parked = self._idle.get(key, [])
+        now = time.monotonic()
+        while parked:
+            reader, writer, parked_at = parked.pop()
+            if (now - parked_at < FETCH_IDLE_TIMEOUT and not writer.is_closing()
+                    and not reader.at_eof()):
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port,
+                                    ssl=self._ssl_context if scheme == 'https' else None,
+                                    server_hostname=host if scheme == 'https' else None),
+            FETCH_CONNECT_TIMEOUT)
+        return reader, writer, False
+
+    def _release(self, key, reader, writer, reusable):
+        parked = self._idle.setdefault(key, [])
+        if reusable and len(parked) < FETCH_IDLE_PER_HOST and not writer.is_closing():
+            parked.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    # ── Requests ──
+    async def fetch(self, url, max_bytes=65536, stop_at=None):
+        """
+        GET url, following redirects. Reading stops after max_bytes or once
+        stop_at (a lowercase bytes marker such as b'</title') has been seen.
+        """
+        try:
+            for _ in range(FETCH_MAX_REDIRECTS + 1):
+                parts = urllib.parse.urlsplit(url)
+                if parts.scheme not in ('http', 'https') or not parts.hostname:
+                    return FetchResult(False, final_url=url)
+                status, headers, body = await self._request(parts, max_bytes, stop_at)
+                location = headers.get('location')
+                if status in (301, 302, 303, 307, 308) and location:
+                    url = urllib.parse.urljoin(url, location)
+                    continue
+                return FetchResult(200 <= status < 300, status, headers, body, url)
+            return FetchResult(False, final_url=url)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return FetchResult(False, final_url=url)
+
+    async def _request(self, parts, max_bytes, stop_at):
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname.lower(), port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request = (f"GET {path} HTTP/1.1\r\nHost: {host_header}\r\n"
+                   f"User-Agent: {FETCH_USER_AGENT}\r\nAccept: text/html,*/*;q=0.8\r\n"
+                   f"Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n").encode('latin-1')
+        for attempt in range(2):
+            reader, writer, reused = await self._acquire(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status_line = await asyncio.wait_for(reader.readline(), FETCH_READ_TIMEOUT)
+                if not status_line:
+                    raise ConnectionResetError("connection closed before response")
+                return await self._read_response(key, reader, writer, status_line,
+                                                 max_bytes, stop_at)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                writer.close()
+                if reused and attempt == 0:
+                    continue  # parked connection went stale; retry on a fresh one
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+    async def _read_response(self, key, reader, writer, status_line, max_bytes, stop_at):
+        fields = status_line.decode('latin-1').split(None, 2)
+        status = int(fields[1])
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), FETCH_READ_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (fields[0] == 'HTTP/1.1'
+                      and headers.get('connection', '').lower() != 'close')
+        chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+        length = headers.get('content-length')
+        remaining = int(length) if length is not None and not chunked else None
+        if remaining is None and not chunked:
+            keep_alive = False   # body runs to EOF
+
+        body = bytearray()
+        complete = False
+        chunk_left = 0
+        while len(body) < max_bytes:
+            if chunked:
+                if chunk_left == 0:
+                    size_line = await asyncio.wait_for(reader.readline(), FETCH_READ_TIMEOUT)
+                    chunk_left = int(size_line.split(b';')[0].strip() or b'0', 16)
+                    if chunk_left == 0:
+                        await self._skip_trailers(reader)
+                        complete = True
+                        break
+                data = await asyncio.wait_for(reader.read(min(chunk_left, 8192)), FETCH_READ_TIMEOUT)
+                if not data:
+                    break
+                chunk_left -= len(data)
+                if chunk_left == 0:
+                    await asyncio.wait_for(reader.readexactly(2), FETCH_READ_TIMEOUT)
+            else:
+                if remaining == 0:
+                    complete = True
+                    break
+                want = 8192 if remaining is None else min(remaining, 8192)
+                data = await asyncio.wait_for(reader.read(want), FETCH_READ_TIMEOUT)
+                if not data:
+                    complete = remaining is None
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+            scan_from = max(0, len(body) - 16)
+            body += data
+            if stop_at and stop_at in bytes(body[scan_from:]).lower():
+                break
+
+        if not complete and keep_alive and not chunked and remaining is not None:
+            # Cheap to finish a short body so the connection can be reused
+            if remaining == 0:
+                complete = True
+            elif remaining <= FETCH_DRAIN_LIMIT:
+                await asyncio.wait_for(reader.readexactly(remaining), FETCH_READ_TIMEOUT)
+                complete = True
+        self._release(key, reader, writer, keep_alive and complete)
+        return status, headers, bytes(body)
+
+    async def _skip_trailers(self, reader):
+        while True:
+            line = await asyncio.wait_for(reader.readline(), FETCH_READ_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                return
+
+    async def fetch_title(self, url):
+        """Returns (ok, title, final_url) for TitleFetchService."""
+        with tracer.async_span('fetch.title', url=url):
+            result = await self.fetch(url, max_bytes=65536, stop_at=b'</title')
+        if not result.ok:
+            return False, "", result.final_url
+        parser = _TitleParser()
+        parser.feed(result.body.decode(detect_charset(result.headers, result.body), errors='replace'))
+        return True, " ".join(parser.title.split()), result.final_url
+
+def _url_host(url):
+    try:
+        return urllib.parse.urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+
+# ─── URL Title Cache ──────────────────────────────────────────────────────────
+TITLE_CACHE_TTL         = 7 * 24 * 3600   # re-check known titles weekly
+TITLE_CACHE_MAX_ENTRIES = 5000
+TITLE_RETRY_BASE        = 15 * 60         # first retry after a failure
+TITLE_RETRY_MAX         = 3 * 24 * 3600   # backoff ceiling
+
+class TitleCache:
+    """
+    Side cache of fetched titles in title_cache.json, so a restart does no
+    network I/O for URLs we already know. Failures are cached as negative
+    entries whose retry delay doubles with each consecutive failure.
+    """
+    def __init__(self, path=TITLE_CACHE_FILE):
+        self.path = path
+        self._entries = {}   # url -> {title, final_url, status, fetched, failures, expires}
+        self._dirty = False
+        self.load()
+
+    def lookup(self, url):
+        """Return (fresh, entry). fresh means no network fetch is needed."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return False, None
+        return time.time() < entry.get('expires', 0), entry
+
+    def store_success(self, url, title, final_url):
+        now = time.time()
+        self._entries[url] = {
+            'title': title, 'final_url': final_url, 'status': 'ok',
+            'fetched': now, 'failures': 0, 'expires': now + TITLE_CACHE_TTL,
+        }
+        self._dirty = True
+
+    def store_failure(self, url):
+        now = time.time()
+        previous = self._entries.get(url) or {}
+        failures = previous.get('failures', 0) + 1
+        delay = min(TITLE_RETRY_BASE * (2 ** (failures - 1)), TITLE_RETRY_MAX)
+        self._entries[url] = {
+            # Keep a previously known title around while the site is unreachable
+            'title': previous.get('title', ""), 'final_url': previous.get('final_url', url),
+            'status': 'error', 'fetched': now, 'failures': failures,
+            'expires': now + delay,
+        }
+        self._dirty = True
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except Exception:
+            log.exception("Title cache load error")
+
+    def save(self):
+        """Save with atomic write; only writes when something changed."""
+        if not self._dirty:
             return
+        temp_file = self.path + '.tmp'
         try:
-            req = urllib.request.Request(self.url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=4) as resp:
-                raw = resp.read(8192).decode('utf-8', errors='ignore')
-            parser = self._TitleParser()
-            parser.feed(raw)
-            title = parser.title.strip()
-            if title:
-                self.title_fetched.emit(self.url, title)
+            if len(self._entries) > TITLE_CACHE_MAX_ENTRIES:
+                newest = sorted(self._entries.items(),
+                                key=lambda kv: kv[1].get('fetched', 0), reverse=True)
+                self._entries = dict(newest[:TITLE_CACHE_MAX_ENTRIES])
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(temp_file, self.path)
+            self._dirty = False
         except Exception:
+            log.exception("Title cache save error")
+            try:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            except OSError:
+                pass
+
+class TitleFetchService(QObject):
+    """
+    One shared, bounded pool for URL title lookups.
+    Requests are deduplicated by URL, dispatched in priority order (visible
+    items first) and limited both globally and per host. The network work
+    itself runs on the shared AsyncFetchEngine thread.
+    """
+    _result_ready = Signal(str, bool, str, str)  # url, ok, title, final_url — from the engine thread
+
+    def __init__(self, engine, cache=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.cache = cache if cache is not None else TitleCache()
+        self._cache_timer = QTimer(self)
+        self._cache_timer.setSingleShot(True)
+        self._cache_timer.timeout.connect(self.cache.save)
+        self._queue = []          # heap of (priority, seq, url)
+        self._queued = {}         # url -> best queued priority
+        self._in_flight = {}      # url -> concurrent Future of the engine task
+        self._host_load = {}      # host -> number of in-flight fetches
+        self._subscribers = {}    # url -> list of callbacks
+        self._seq = 0
+        self._pump_scheduled = False
+        self._closed = False
+        self._result_ready.connect(self._on_result)
+
+    def request(self, url, callback, priority=TITLE_PRIORITY_BACKGROUND):
+        """Ask for the title of url; callback(url, title) runs on the GUI thread."""
+        if self._closed or not HAS_URL_FETCH:
+            return
+        fresh, entry = self.cache.lookup(url)
+        if entry is not None and entry.get('title'):
+            callback(url, entry['title'])
+        if fresh:
+            return  # known title, or a failure still inside its backoff window
+        subs = self._subscribers.setdefault(url, [])
+        if callback not in subs:
+            subs.append(callback)
+        if url not in self._in_flight:
+            self._enqueue(url, priority)
+
+    def prioritize(self, url, priority=TITLE_PRIORITY_VISIBLE):
+        """Move an already-queued url ahead if priority is better."""
+        if url in self._queued:
+            self._enqueue(url, priority)
+
+    def cancel(self, url, callback):
+        """Drop a subscriber; the request is dequeued once nobody wants it."""
+        subs = self._subscribers.get(url)
+        if not subs:
+            return
+        try:
+            subs.remove(callback)
+        except ValueError:
             pass
+        if not subs:
+            del self._subscribers[url]
+            self._queued.pop(url, None)   # stale heap entry is skipped by _pump
+            future = self._in_flight.get(url)
+            if future is not None:
+                future.cancel()           # cancels the engine task mid-read
+
+    def shutdown(self):
+        self._cache_timer.stop()
+        self.cache.save()
+        self._closed = True
+        self._queue.clear()
+        self._queued.clear()
+        self._subscribers.clear()
+        # Cancel in-flight fetches instead of waiting on them, so shutdown
+        # time doesn't depend on how many URL items exist. cancel() runs the
+        # done callback, and so _on_result, before it returns: iterate a copy.
+        for _, future in list(self._in_flight.items()):
+            future.cancel()
+
+    def _enqueue(self, url, priority):
+        current = self._queued.get(url)
+        if current is not None and current <= priority:
+            return
+        self._queued[url] = priority
+        self._seq += 1
+        heapq.heappush(self._queue, (priority, self._seq, url))
+        self._schedule_pump()
+
+    def _schedule_pump(self):
+        # Dispatch on the next event-loop pass so a burst of requests (e.g. from
+        # load_favorites) can be reprioritised before anything starts.
+        if not self._pump_scheduled:
+            self._pump_scheduled = True
+            QTimer.singleShot(0, self._pump)
+
+    def attach_engine(self, engine):
+        """Start dispatching once the (deferred) fetch engine exists."""
+        self.engine = engine
+        self._schedule_pump()
+
+    def _pump(self):
+        self._pump_scheduled = False
+        if self.engine is None:
+            return  # requests wait in the queue until attach_engine()
+        deferred = []
+        while self._queue and len(self._in_flight) < TITLE_FETCH_WORKERS:
+            priority, seq, url = heapq.heappop(self._queue)
+            if self._queued.get(url) != priority:
+                continue  # cancelled, or superseded by a higher-priority entry
+            host = _url_host(url)
+            if self._host_load.get(host, 0) >= TITLE_FETCH_PER_HOST:
+                deferred.append((priority, seq, url))
+                continue
+            del self._queued[url]
+            future = self.engine.submit(self.engine.fetch_title(url))
+            self._in_flight[url] = future
+            self._host_load[host] = self._host_load.get(host, 0) + 1
+            future.add_done_callback(lambda f, u=url: self._emit_result(u, f))
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+
+    def _emit_result(self, url, future):
+        try:
+            ok, title, final_url = (False, "", url) if future.cancelled() else future.result()
+        except Exception:
+            ok, title, final_url = False, "", url
+        try:
+            self._result_ready.emit(url, ok, title, final_url)
+        except RuntimeError:
+            pass  # service already destroyed during shutdown
+
+    def _on_result(self, url, ok, title, final_url):
+        future = self._in_flight.pop(url, None)
+        was_cancelled = future is not None and future.cancelled()
+        host = _url_host(url)
+        load = self._host_load.get(host, 0) - 1
+        if load > 0:
+            self._host_load[host] = load
+        else:
+            self._host_load.pop(host, None)
+        if self._closed:
+            return
+        if was_cancelled:
+            # Nobody wanted the result; re-queue if someone subscribed again
+            if self._subscribers.get(url):
+                self._enqueue(url, TITLE_PRIORITY_BACKGROUND)
+            self._schedule_pump()
+            return
+        callbacks = self._subscribers.pop(url, [])
+        if ok:
+            self.cache.store_success(url, title, final_url)
+        else:
+            self.cache.store_failure(url)
+        self._cache_timer.start(2000)
+        if title:
+            for cb in callbacks:
+                try:
+                    cb(url, title)
+                except Exception as e:
+                    log.exception(f"Title callback error: {e}")
+        self._schedule_pump()
+
+# ─── Favicon Service ──────────────────────────────────────────────────────────
+FAVICON_DIR             = os.path.join(DATA_DIR, 'favicons')
+FAVICON_SIZE            = 32              # stored edge length in pixels
+FAVICON_DISPLAY_SIZE    = 24              # edge length shown on item cards
+FAVICON_MAX_DOWNLOAD    = 256 * 1024      # ignore icons larger than this
+FAVICON_CACHE_MAX_BYTES = 4 * 1024 * 1024 # on-disk budget, oldest evicted first
+FAVICON_RETRY           = 24 * 3600       # re-check hosts without an icon daily
+FAVICON_RETRY_TRANSIENT = 10 * 60         # back off this long after a network failure
+FAVICON_MEMORY_HOSTS    = 512             # pixmaps kept in memory
+
+class FaviconService(QObject):
+    """
+    Per-domain favicons for URL items. Icons are fetched once per host over
+    the shared AsyncFetchEngine (reusing the title fetcher's connections),
+    normalised to small PNGs in an LRU-bounded disk cache, and decoded in the
+    engine loop's executor. The GUI thread only turns the finished QImage into
+    one QPixmap per host, which every item for that host shares.
+    """
+    _icon_ready = Signal(str, object, bool)  # host, QImage or None, transient — from the engine thread
+
+    def __init__(self, engine, cache_dir=FAVICON_DIR, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.cache_dir = cache_dir
+        self._pixmaps = {}      # host -> QPixmap (insertion-ordered for eviction)
+        self._missing = set()   # hosts known to have no icon this session
+        self._retry_at = {}     # host -> monotonic time a failed fetch may be retried
+        self._subscribers = {}  # host -> list of callbacks
+        self._in_flight = {}    # host -> concurrent Future
+        self._origins = {}      # host -> scheme://netloc to fetch from
+        self._closed = False
+        self._icon_ready.connect(self._on_icon_ready)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            log.exception("Favicon cache dir error")
+
+    def request(self, url, callback):
+        """callback(host, pixmap) runs on the GUI thread once the icon is known."""
+        if self._closed or not HAS_URL_FETCH:
+            return
+        parts = urllib.parse.urlsplit(url)
+        host = parts.netloc.lower()
+        if parts.scheme not in ('http', 'https') or not host or host in self._missing:
+            return
+        if self._retry_at.get(host, 0) > time.monotonic():
+            return
+        pixmap = self._pixmaps.get(host)
+        if pixmap is not None:
+            callback(host, pixmap)
+            return
+        subs = self._subscribers.setdefault(host, [])
+        if callback not in subs:
+            subs.append(callback)
+        self._origins[host] = f"{parts.scheme}://{parts.netloc}"
+        if host not in self._in_flight and self.engine is not None:
+            self._start(host)
+
+    def attach_engine(self, engine):
+        """Fetch icons requested before the (deferred) fetch engine existed."""
+        self.engine = engine
+        for host in list(self._subscribers):
+            if host not in self._in_flight:
+                self._start(host)
+
+    def _start(self, host):
+        future = self.engine.submit(self._load_icon(host, self._origins[host]))
+        self._in_flight[host] = future
+        future.add_done_callback(lambda f, h=host: self._emit_icon(h, f))
+
+    def cancel(self, url, callback):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        subs = self._subscribers.get(host)
+        if not subs:
+            return
+        try:
+            subs.remove(callback)
+        except ValueError:
+            pass
+        if not subs:
+            del self._subscribers[host]
+            self._origins.pop(host, None)
+            future = self._in_flight.get(host)
+            if future is not None:
+                future.cancel()
+
+    def shutdown(self):
+        self._closed = True
+        self._subscribers.clear()
+        for _, future in list(self._in_flight.items()):
+            future.cancel()
+
+    def _cache_path(self, host, suffix):
+        digest = hashlib.sha1(host.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + suffix)
+
+    async def _load_icon(self, host, origin):
+        """
+        Engine-thread coroutine: disk cache first, then the network. Returns
+        (image, transient). Disk I/O and decoding go to the loop's executor so
+        they don't hold up other fetches on the shared loop.
+        """
+        loop = asyncio.get_running_loop()
+        image, known_missing = await loop.run_in_executor(None, self._read_cache, host)
+        if image is not None or known_missing:
+            return image, False
+        result = await self.engine.fetch(origin + "/favicon.ico", max_bytes=FAVICON_MAX_DOWNLOAD)
+        if result.ok:
+            # None here means the server answered with something undecodable
+            return await loop.run_in_executor(None, self._store_icon, host, result.body), False
+        if result.status in (404, 410):
+            await loop.run_in_executor(None, self._mark_missing, host)
+            return None, False
+        # Timeouts, resets and server errors say nothing about the icon itself
+        return None, True
+
+    def _read_cache(self, host):
+        """Executor: (cached image or None, whether the host is known to have none)."""
+        icon_path = self._cache_path(host, '.png')
+        if os.path.exists(icon_path):
+            image = QImage(icon_path)
+            if not image.isNull():
+                os.utime(icon_path)   # LRU: mark as recently used
+                return image, False
+        missing_path = self._cache_path(host, '.none')
+        try:
+            return None, time.time() - os.path.getmtime(missing_path) < FAVICON_RETRY
+        except OSError:
+            return None, False
+
+    def _mark_missing(self, host):
+        """Executor: remember a definitive no-icon answer for FAVICON_RETRY."""
+        try:
+            with open(self._cache_path(host, '.none'), 'w'):
+                pass
+        except OSError:
+            log.warning(f"Favicon cache write failed for {host}")
+
+    def _store_icon(self, host, data):
+        """Executor: decode, normalise and cache a downloaded icon."""
+        image = QImage.fromData(data) if data else QImage()
+        if image.isNull():
+            self._mark_missing(host)
+            return None
+        image = image.scaled(FAVICON_SIZE, FAVICON_SIZE,
+                             Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+        icon_path = self._cache_path(host, '.png')
+        temp_file = icon_path + '.tmp'
+        if image.save(temp_file, 'PNG'):
+            os.replace(temp_file, icon_path)
+            self._enforce_disk_budget()
+        return image
+
+    def _enforce_disk_budget(self):
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.png'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        if total <= FAVICON_CACHE_MAX_BYTES:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= FAVICON_CACHE_MAX_BYTES:
+                break
+
+    def _emit_icon(self, host, future):
+        try:
+            image, transient = (None, True) if future.cancelled() else future.result()
+        except Exception:
+            log.warning(f"Favicon load failed for {host}")
+            image, transient = None, True
+        try:
+            self._icon_ready.emit(host, image, transient)
+        except RuntimeError:
+            pass  # service already destroyed during shutdown
+
+    def _on_icon_ready(self, host, image, transient):
+        future = self._in_flight.pop(host, None)
+        if self._closed or (future is not None and future.cancelled()):
+            return
+        callbacks = self._subscribers.pop(host, [])
+        if image is None:
+            if transient:
+                self._retry_at[host] = time.monotonic() + FAVICON_RETRY_TRANSIENT
+            else:
+                self._missing.add(host)
+            return
+        self._retry_at.pop(host, None)
+        pixmap = QPixmap.fromImage(image).scaled(
+            FAVICON_DISPLAY_SIZE, FAVICON_DISPLAY_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        if len(self._pixmaps) >= FAVICON_MEMORY_HOSTS:
+            self._pixmaps.pop(next(iter(self._pixmaps)))
+        self._pixmaps[host] = pixmap
+        for cb in callbacks:
+            try:
+                cb(host, pixmap)
+            except Exception as e:
+                log.exception(f"Favicon callback error: {e}")
 
 # ─── Hotkey Capture Widget ────────────────────────────────────────────────────
 class HotkeyCaptureEdit(QLineEdit):
@@ -436,13 +1675,50 @@ class TemplatesDialog(QDialog):
         layout.addWidget(btn)
         self.setLayout(layout)
 
+class CaptureChart(QWidget):
+    """Bar chart of captures per day, oldest on the left."""
+    def __init__(self, captures, theme, parent=None):
+        super().__init__(parent)
+        self.captures = captures
+        self.theme = theme
+        self.setFixedHeight(64)
+        self.setMouseTracking(True)
+
+    def _bar_at(self, x):
+        if not self.captures:
+            return None
+        index = int(x * len(self.captures) / max(1, self.width()))
+        return min(max(index, 0), len(self.captures) - 1)
+
+    def mouseMoveEvent(self, event):
+        index = self._bar_at(event.position().x())
+        if index is not None:
+            day, count = self.captures[index]
+            self.setToolTip(f"{day}: {count} capture{'s' if count != 1 else ''}")
+
+    def paintEvent(self, event):
+        t = THEMES[self.theme]
+        painter = QPainter(self)
+        painter.setPen(Qt.PenStyle.NoPen)
+        peak = max((count for _, count in self.captures), default=0)
+        slot = self.width() / max(1, len(self.captures))
+        for i, (_, count) in enumerate(self.captures):
+            height = max(1, int((self.height() - 2) * count / peak)) if peak else 1
+            painter.setBrush(QColor(t['accent'] if count else t['border']))
+            painter.drawRect(int(i * slot + 1), self.height() - height,
+                             max(1, int(slot) - 2), height)
+        painter.end()
+
+
 class StatsDialog(QDialog):
-    def __init__(self, items_data, theme, parent=None):
+    def __init__(self, stats, theme, parent=None, memory_source=None):
         super().__init__(parent)
+        self.theme = theme
+        self.memory_source = memory_source
         self.setWindowTitle("DropShelf Statistics")
         self.setWindowIcon(load_app_icon())
         self.setModal(True)
-        self.setFixedSize(520, 480)
+        self.setFixedSize(520, 860)
         t = THEMES[theme]
         self.setStyleSheet(f"""
             QDialog {{ 
@@ -505,15 +1781,11 @@ class StatsDialog(QDialog):
         title.setStyleSheet(f"font-size: 18px; font-weight: bold; padding-bottom: 8px; color: {t['text']};")
         layout.addWidget(title)
         
-        # Calculate statistics
-        total_items = len(items_data)
-        total_uses = sum(i.get('use_count', 0) for i in items_data)
-        favorites_count = sum(1 for i in items_data if i.get('is_favorite', False))
-        
-        type_counts = {}
-        for i in items_data:
-            tp = i.get('type', 'unknown')
-            type_counts[tp] = type_counts.get(tp, 0) + 1
+        # Running totals kept by ShelfStats
+        total_items = stats['total']
+        total_uses = stats['total_uses']
+        favorites_count = stats['favorites']
+        type_counts = stats['by_type']
 
         # Overview section
         overview_group = QGroupBox("Overview")
@@ -552,20 +1824,30 @@ class StatsDialog(QDialog):
         
         overview_group.setLayout(overview_layout)
         layout.addWidget(overview_group)
-        
+
+        # Capture trend section
+        captures = stats['captures']
+        trend_group = QGroupBox(f"Clipboard Captures (Last {len(captures)} Days)")
+        trend_layout = QVBoxLayout()
+        trend_layout.setContentsMargins(12, 12, 12, 12)
+        trend_layout.addWidget(CaptureChart(captures, theme))
+        counts = [count for _, count in captures]
+        trend_text = QLabel(f"Today: {sum(counts[-1:])}  •  Last 7 days: {sum(counts[-7:])}"
+                            f"  •  Last {len(counts)} days: {sum(counts)}")
+        trend_text.setStyleSheet(f"font-weight: normal; font-size: 11px; color: {t['text_dim']};")
+        trend_layout.addWidget(trend_text)
+        trend_group.setLayout(trend_layout)
+        layout.addWidget(trend_group)
+
         # Most used items section
-        most_used_group = QGroupBox("Most Used Items (Top 15)")
+        most_used_group = QGroupBox(f"Most Used Items (Top {STATS_TOP_ITEMS})")
         most_used_layout = QVBoxLayout()
         most_used_layout.setContentsMargins(12, 12, 12, 12)
 
-        sorted_items = sorted(items_data, key=lambda x: x.get('use_count', 0), reverse=True)
-
         lw = QListWidget()
-        lw.setMinimumHeight(200)
-        for item in sorted_items[:15]:
+        lw.setMinimumHeight(180)
+        for item in stats['top']:
             count = item.get('use_count', 0)
-            if count == 0:
-                continue
             content = str(item.get('content', ''))
             item_type = item.get('type', '').upper()
             
@@ -584,6 +1866,72 @@ class StatsDialog(QDialog):
         most_used_group.setLayout(most_used_layout)
         layout.addWidget(most_used_group)
 
+        # Diagnostics section
+        diag_group = QGroupBox("Diagnostics")
+        diag_layout = QVBoxLayout()
+        diag_layout.setContentsMargins(12, 12, 12, 12)
+        trace_row = QHBoxLayout()
+        self.trace_btn = QPushButton()
+        self.trace_btn.setCheckable(True)
+        self.trace_btn.setChecked(tracer.enabled)
+        self.trace_btn.toggled.connect(self._toggle_tracing)
+        self.trace_label = QLabel()
+        self.trace_label.setStyleSheet("font-weight: normal; font-size: 12px;")
+        export_btn = QPushButton("Export Trace…")
+        export_btn.clicked.connect(self._export_trace)
+        trace_row.addWidget(self.trace_btn)
+        trace_row.addWidget(self.trace_label)
+        trace_row.addStretch()
+        trace_row.addWidget(export_btn)
+        diag_layout.addLayout(trace_row)
+        record_row = QHBoxLayout()
+        self.record_btn = QPushButton()
+        self.record_btn.setCheckable(True)
+        self.record_btn.setChecked(clipboard_recorder.active)
+        self.record_btn.toggled.connect(self._toggle_recording)
+        self.record_label = QLabel()
+        self.record_label.setStyleSheet("font-weight: normal; font-size: 12px;")
+        record_row.addWidget(self.record_btn)
+        record_row.addWidget(self.record_label)
+        record_row.addStretch()
+        diag_layout.addLayout(record_row)
+        self._update_record_label()
+        loop = watchdog.summary()
+        if loop['running']:
+            loop_text = (f"p50 {loop['latency_p50_ms']:.0f} ms • p95 {loop['latency_p95_ms']:.0f} ms"
+                         f" • p99 {loop['latency_p99_ms']:.0f} ms")
+            stall_text = f"{loop['stalls']}"
+            if loop['stalls']:
+                stall_text += (f" (median {loop['stall_p50_ms']:.0f} ms,"
+                               f" longest {loop['stall_max_ms']:.0f} ms)")
+        else:
+            loop_text = stall_text = "watchdog off"
+        rss = process_rss()
+        rows = [("Event loop latency:", loop_text),
+                (f"Stalls over {loop['threshold_ms']} ms:", stall_text)]
+        if rss:
+            rows.append(("Process memory:", format_bytes(rss)))
+        for label, value in rows:
+            row = QHBoxLayout()
+            label_widget = QLabel(label)
+            label_widget.setStyleSheet("font-weight: normal; font-size: 12px;")
+            value_widget = QLabel(value)
+            value_widget.setStyleSheet("font-size: 12px;")
+            row.addWidget(label_widget)
+            row.addStretch()
+            row.addWidget(value_widget)
+            diag_layout.addLayout(row)
+        if memory_source is not None:
+            mem_row = QHBoxLayout()
+            mem_row.addStretch()
+            mem_btn = QPushButton("Memory Report…")
+            mem_btn.clicked.connect(lambda: MemoryDialog(self.memory_source, self.theme, self).exec())
+            mem_row.addWidget(mem_btn)
+            diag_layout.addLayout(mem_row)
+        diag_group.setLayout(diag_layout)
+        layout.addWidget(diag_group)
+        self._update_trace_label()
+
         # Close button
         btn_row = QHBoxLayout()
         btn_row.addStretch()
@@ -595,6 +1943,112 @@ class StatsDialog(QDialog):
         
         self.setLayout(layout)
 
+    def _update_trace_label(self):
+        self.trace_btn.setText("Stop Tracing" if tracer.enabled else "Start Tracing")
+        state = "recording" if tracer.enabled else "stopped"
+        self.trace_label.setText(f"{len(tracer)} spans, {state}")
+
+    def _toggle_tracing(self, on):
+        if on:
+            tracer.start()
+        else:
+            tracer.stop()
+        self._update_trace_label()
+
+    def _update_record_label(self):
+        self.record_btn.setText("Stop Recording" if clipboard_recorder.active else "Record Clipboard")
+        if clipboard_recorder.active:
+            self.record_label.setText(f"{clipboard_recorder.events} events, no content stored")
+            self.record_label.setToolTip(clipboard_recorder.path)
+        else:
+            self.record_label.setText("clipboard trace for replay")
+
+    def _toggle_recording(self, on):
+        try:
+            if on:
+                clipboard_recorder.start()
+            else:
+                clipboard_recorder.stop()
+        except Exception as e:
+            log.exception(f"Clipboard recording error: {e}")
+        self._update_record_label()
+
+    def _export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", f"dropshelf-trace-{datetime.now():%Y%m%d-%H%M%S}.json",
+            "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            tracer.save(path)
+            self._update_trace_label()
+        except Exception as e:
+            log.exception(f"Trace export error: {e}")
+            QMessageBox.warning(self, "Export Trace", f"Could not write trace:\n{e}")
+
+class MemoryDialog(QDialog):
+    """Memory breakdown plus on-demand tracemalloc snapshots and diffs."""
+    def __init__(self, report_source, theme, parent=None):
+        super().__init__(parent)
+        self.report_source = report_source
+        self._snapshot = None
+        self.setWindowTitle("DropShelf Memory")
+        self.setModal(True)
+        self.resize(720, 520)
+        t = THEMES[theme]
+        self.setStyleSheet(f"""
+            QDialog {{ background: {t['bg_window']}; color: {t['text']}; }}
+            QTextEdit {{ background: {t['bg_card']}; color: {t['text']};
+                         border: 1px solid {t['border']}; border-radius: 6px;
+                         font-family: monospace; font-size: 11px; }}
+            QPushButton {{ background: {t['bg_btn']}; color: white; border: none;
+                           border-radius: 6px; padding: 8px 16px; font-weight: bold; }}
+            QPushButton:hover {{ background: {t['bg_btn_hover']}; }}
+        """)
+        layout = QVBoxLayout()
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.text)
+        btn_row = QHBoxLayout()
+        for label, slot in (("Refresh", self._refresh), ("Snapshot", self._take_snapshot),
+                            ("Stop tracemalloc", self._stop_tracing)):
+            btn = QPushButton(label)
+            btn.clicked.connect(slot)
+            btn_row.addWidget(btn)
+        btn_row.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+        self.setLayout(layout)
+        self._refresh()
+
+    def _refresh(self):
+        try:
+            text = format_memory_report(self.report_source(), self._snapshot)
+            if not memory_profiler.tracing:
+                text += "\n\nSnapshot starts tracemalloc; take a second one later to see what grew."
+            self.text.setPlainText(text)
+        except Exception as e:
+            log.exception(f"Memory report error: {e}")
+
+    def _take_snapshot(self):
+        try:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                self._snapshot = memory_profiler.snapshot()
+            finally:
+                QApplication.restoreOverrideCursor()
+            self._refresh()
+        except Exception as e:
+            log.exception(f"Memory snapshot error: {e}")
+
+    def _stop_tracing(self):
+        memory_profiler.stop()
+        self._snapshot = None
+        self._refresh()
+
 # ─── Settings Dialog ──────────────────────────────────────────────────────────
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -657,12 +2111,13 @@ class SettingsDialog(QDialog):
         
         self.history_spin = QSpinBox()
         self.history_spin.setMinimum(0)
-        self.history_spin.setMaximum(1000)
+        self.history_spin.setMaximum(MAX_HISTORY_LIMIT)
         # Set the value from parent window
         current_value = self.parent_window.max_history
         self.history_spin.setValue(current_value)
-        self.history_spin.setToolTip("Set to 0 to disable history tracking")
-        self.history_spin.setFixedWidth(70)
+        self.history_spin.setToolTip("Set to 0 to disable history tracking. "
+                                     "Lowering it deletes the oldest entries.")
+        self.history_spin.setFixedWidth(90)
         self.history_spin.setFixedHeight(28)
         # Make it fully editable
         self.history_spin.setKeyboardTracking(True)
@@ -850,16 +2305,14 @@ class SettingsDialog(QDialog):
             
             log.info(f"History size changed from {old_history_size} to {self.parent_window.max_history}")
             
-            # Handle history size change
+            # Handle history size change: the oldest entries past the new
+            # limit are deleted in place in history.db
             if self.parent_window.max_history != old_history_size:
-                if self.parent_window.max_history == 0:
-                    self.parent_window.clipboard_history = deque(maxlen=1)
-                else:
-                    self.parent_window.clipboard_history = deque(
-                        list(self.parent_window.clipboard_history)[:self.parent_window.max_history],
-                        maxlen=self.parent_window.max_history
-                    )
+                if self.parent_window.clipboard_history.trim(self.parent_window.max_history):
+                    self.parent_window.save_history()
                 self.parent_window._update_history_tab_visibility()
+                if self.parent_window.current_tab == "history":
+                    self.parent_window._rebuild_history_display()
 
             if new_hotkey and new_hotkey != old_hotkey:
                 try:
@@ -878,6 +2331,845 @@ class SettingsDialog(QDialog):
 
 
 
+# ─── Blob Store ───────────────────────────────────────────────────────────────
+BLOB_COMPRESS_MIN = 16 * 1024   # zlib-compress payloads at least this big
+BLOB_GC_GRACE     = 3600        # never collect blobs touched within this many seconds
+BLOB_GC_INTERVAL_MS = 10 * 60 * 1000
+BLOB_SEARCH_CACHE_CHARS = 16 * 1024 * 1024   # lowercased blob text kept for search and sort
+_BLOB_RAW, _BLOB_ZLIB = b'\x00', b'\x01'
+
+class BlobStore:
+    """
+    Content-addressed payload files under BLOB_DIR, keyed by the SHA-256 of
+    the raw bytes so identical payloads in the shelf, history and undo stack
+    share one file. Payloads above BLOB_COMPRESS_MIN are zlib-compressed.
+
+    Owners ('shelf', 'history', 'undo') publish the keys they hold with
+    set_references(); a blob whose reference count drops to zero is removed
+    by collect_garbage() once it is older than BLOB_GC_GRACE.
+    """
+    def __init__(self, root=BLOB_DIR):
+        self.root = root
+        self._owners = {}   # owner -> Counter of keys
+        self._search_texts = {}   # key -> lowercased text, least recently used first
+        self._search_chars = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key_for_bytes(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key + '.blob')
+
+    def put_bytes(self, data, compress=True):
+        key = self.key_for_bytes(data)
+        path = self._path(key)
+        if os.path.exists(path):
+            os.utime(path)   # keep it out of the GC grace window
+            return key
+        payload = _BLOB_RAW + data
+        if compress and len(data) >= BLOB_COMPRESS_MIN:
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                payload = _BLOB_ZLIB + packed
+        temp_file = path + '.tmp'
+        with open(temp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_file, path)
+        return key
+
+    def get_bytes(self, key):
+        with open(self._path(key), 'rb') as f:
+            payload = f.read()
+        if payload[:1] == _BLOB_ZLIB:
+            return zlib.decompress(payload[1:])
+        return payload[1:]
+
+    def touch(self, key):
+        """Refresh a blob's GC grace window; False if it no longer exists."""
+        try:
+            os.utime(self._path(key))
+            return True
+        except OSError:
+            return False
+
+    def put_text(self, text):
+        return self.put_bytes(text.encode('utf-8', errors='surrogatepass'))
+
+    def get_text(self, key):
+        return self.get_bytes(key).decode('utf-8', errors='surrogatepass')
+
+    def search_text(self, key):
+        """
+        Lowercased text of a blob for search and name sort. Keys name their
+        content, so cached entries never go stale; the cache is bounded by
+        BLOB_SEARCH_CACHE_CHARS so a query typed key by key reads each blob once.
+        """
+        text = self._search_texts.pop(key, None)
+        if text is None:
+            text = self.get_text(key).lower()
+            self._search_chars += len(text)
+            while self._search_texts and self._search_chars > BLOB_SEARCH_CACHE_CHARS:
+                self._search_chars -= len(self._search_texts.pop(next(iter(self._search_texts))))
+        self._search_texts[key] = text
+        return text
+
+    # ── Reference counting ──
+    def set_references(self, owner, keys):
+        self._owners[owner] = Counter(k for k in keys if k)
+
+    def refcount(self, key):
+        return sum(refs[key] for refs in self._owners.values())
+
+    def collect_garbage(self):
+        """Delete unreferenced blobs past the grace period; returns bytes freed."""
+        live = set()
+        for refs in self._owners.values():
+            live.update(refs)
+        cutoff = time.time() - BLOB_GC_GRACE
+        freed = 0
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith('.blob') or name[:-5] in live:
+                        continue
+                    st = entry.stat()
+                    if st.st_mtime > cutoff:
+                        continue
+                    try:
+                        os.remove(entry.path)
+                        freed += st.st_size
+                    except OSError:
+                        pass
+        except OSError:
+            log.exception("Blob GC error")
+        if freed:
+            log.info(f"Blob GC freed {freed} bytes")
+        return freed
+
+def text_preview(text, limit=TEXT_PREVIEW_CHARS):
+    return text if len(text) <= limit else text[:limit]
+
+def store_out_of_line(blob_store, entry):
+    """
+    Move oversized text into the blob store, leaving a bounded preview.
+    Returns the entry unchanged when it is small or already a blob reference.
+    """
+    dtype = entry['type']
+    content = entry.get('content')
+    if entry.get('data') and not entry.get('blob'):
+        # Exported image: payload travels inline as base64
+        data = base64.b64decode(entry['data'])
+        image = QImage.fromData(data)
+        stored = {k: v for k, v in entry.items() if k != 'data'}
+        stored.update(blob=blob_store.put_bytes(data, compress=False),
+                      thumb=blob_store.put_bytes(image_thumbnail(image), compress=False),
+                      size=len(data))
+        return stored
+    if (entry.get('blob') or not isinstance(content, str)
+            or len(content) <= LARGE_TEXT_THRESHOLD
+            or (ItemType(dtype) if isinstance(dtype, str) else dtype) != ItemType.TEXT):
+        return entry
+    stored = dict(entry)
+    stored.update(blob=blob_store.put_text(content),
+                  content=text_preview(content), size=len(content))
+    return stored
+
+def entry_search_text(blob_store, entry):
+    """Lowercased full text of an item dict, out-of-line text included."""
+    if entry.get('blob') and entry['type'] == ItemType.TEXT:
+        try:
+            return blob_store.search_text(entry['blob'])
+        except OSError:
+            log.warning(f"Search: blob {entry['blob']} unreadable")
+    return str(entry['content']).lower()
+
+def history_record(entry, now):
+    """The history.json form of an item dict captured at time now."""
+    dtype = entry['type']
+    record = {
+        "type": dtype.value if isinstance(dtype, ItemType) else dtype,
+        "content": entry['content'],
+        "time": now
+    }
+    for field in ('blob', 'size', 'thumb'):
+        if entry.get(field) is not None:
+            record[field] = entry[field]
+    return record
+
+def export_entry(blob_store, entry):
+    """The Export form of an item dict: out-of-line payloads inlined, images as base64."""
+    item = {k: v for k, v in entry.items() if k not in ('blob', 'thumb', 'size', 'archive_id')}
+    if entry['type'] == ItemType.IMAGE.value:
+        item['size'] = entry.get('size')
+        item['data'] = base64.b64encode(blob_store.get_bytes(entry['blob'])).decode('ascii')
+    elif entry.get('blob'):
+        item['content'] = blob_store.get_text(entry['blob'])
+    return item
+
+def entry_blob_keys(entries):
+    """Every blob key an item dict holds: the payload and, for images, the thumbnail."""
+    for entry in entries:
+        for field in ('blob', 'thumb'):
+            key = entry.get(field)
+            if key:
+                yield key
+
+def format_bytes(size_bytes):
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    if size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    return f"{size_bytes / (1024 * 1024):.1f} MB"
+
+# ─── Shelf Statistics ─────────────────────────────────────────────────────────
+STATS_TOP_ITEMS  = 15    # most-used items listed by the Statistics dialog
+STATS_TREND_DAYS = 30    # days of captures shown as a trend
+STATS_KEEP_DAYS  = 400   # daily capture counts kept in stats.json
+
+class ShelfStats:
+    """
+    Running totals over the shelf, updated as items are added, removed,
+    favourited and opened, so reading them never walks the shelf. Items are
+    tracked under any hashable key (the widget, or id() of an item dict)
+    with a ref that top() hands back. The most-used ranking is a heap with
+    lazy invalidation: each use pushes a fresh entry, and entries whose
+    count has moved on are dropped as they surface.
+
+    Captures per day are kept separately in stats.json, so the trend
+    survives history trimming and restarts.
+    """
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.by_type = Counter()
+        self.favorites = 0
+        self.total_uses = 0
+        self._items = {}   # key -> [type, favorite, uses, ref]
+        self._heap = []    # (-uses, seq, key), possibly stale
+        self._seq = itertools.count()
+        self.daily = Counter()   # 'YYYY-MM-DD' -> captures
+        self._loaded = False
+        self._dirty = False
+        self._load()
+
+    def __len__(self):
+        return len(self._items)
+
+    # ── Items ──
+    def add(self, key, dtype, favorite=False, uses=0, ref=None):
+        self.discard(key)
+        dtype = dtype.value if isinstance(dtype, ItemType) else dtype
+        self._items[key] = [dtype, favorite, uses, key if ref is None else ref]
+        self.by_type[dtype] += 1
+        self.favorites += bool(favorite)
+        self.total_uses += uses
+        self._push(key, uses)
+
+    def discard(self, key):
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        dtype, favorite, uses, _ = item
+        self.by_type[dtype] -= 1
+        if not self.by_type[dtype]:
+            del self.by_type[dtype]
+        self.favorites -= bool(favorite)
+        self.total_uses -= uses
+
+    def set_favorite(self, key, favorite):
+        item = self._items.get(key)
+        if item is not None and item[1] != favorite:
+            self.favorites += 1 if favorite else -1
+            item[1] = favorite
+
+    def set_uses(self, key, uses):
+        item = self._items.get(key)
+        if item is not None and item[2] != uses:
+            self.total_uses += uses - item[2]
+            item[2] = uses
+            self._push(key, uses)
+
+    def _push(self, key, uses):
+        if uses <= 0:
+            return
+        heapq.heappush(self._heap, (-uses, next(self._seq), key))
+        if len(self._heap) > 2 * len(self._items) + 64:
+            # Mostly stale: rebuild from the live counts
+            self._heap = [(-item[2], next(self._seq), k)
+                          for k, item in self._items.items() if item[2] > 0]
+            heapq.heapify(self._heap)
+
+    def top(self, k=STATS_TOP_ITEMS):
+        """Refs of the k most-used items (uses > 0), most used first."""
+        found, seen = [], set()
+        while self._heap and len(found) < k:
+            entry = heapq.heappop(self._heap)
+            item = self._items.get(entry[2])
+            if item is None or item[2] != -entry[0] or entry[2] in seen:
+                continue   # removed, used again since, or a duplicate
+            seen.add(entry[2])
+            found.append(entry)
+        for entry in found:
+            heapq.heappush(self._heap, entry)
+        return [self._items[key][3] for _, _, key in found]
+
+    # ── Captures ──
+    def record_captures(self, count, when=None):
+        if count:
+            self.daily[(when or datetime.now()).strftime('%Y-%m-%d')] += count
+            self._dirty = True
+
+    def seed(self, history):
+        """Backfill the daily counts from history the first time there is no stats.json."""
+        if self._loaded or self.daily:
+            return
+        for entry in history:
+            if entry.get('time'):
+                self.daily[entry['time'][:10]] += 1
+        self._loaded = self._dirty = True
+
+    def captures(self, days=STATS_TREND_DAYS):
+        """[date, count] for each of the last `days` days, oldest first."""
+        today = datetime.now().date()
+        dates = [(today - timedelta(days=n)).isoformat() for n in range(days - 1, -1, -1)]
+        return [[d, self.daily.get(d, 0)] for d in dates]
+
+    def summary(self, describe, archive=None, top=STATS_TOP_ITEMS, days=STATS_TREND_DAYS):
+        """
+        Everything the dialog and STATS show. describe(ref) turns a top item
+        into a dict; a ShelfArchive's totals and most-used rows are merged in.
+        """
+        by_type = Counter(self.by_type)
+        most_used = [describe(ref) for ref in self.top(top)]
+        total_uses = self.total_uses
+        if archive is not None:
+            by_type.update(archive.by_type)
+            total_uses += archive.total_uses
+            most_used += [{'type': e['type'], 'content': e['content'][:TOOLTIP_MAX_CHARS],
+                           'use_count': e['use_count'], 'is_favorite': False}
+                          for e in archive.most_used(top)]
+            most_used.sort(key=lambda d: d['use_count'], reverse=True)
+        return {'total': sum(by_type.values()), 'favorites': self.favorites,
+                'archived': len(archive) if archive is not None else 0,
+                'by_type': dict(by_type), 'total_uses': total_uses,
+                'top': most_used[:top], 'captures': self.captures(days)}
+
+    # ── Persistence ──
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.daily = Counter(json.load(f).get('daily_captures', {}))
+            self._loaded = True
+        except Exception as e:
+            log.exception(f"Stats load error: {e}")
+
+    def save(self):
+        """Write the daily counts if they changed (atomic)."""
+        if not self._dirty:
+            return
+        temp_file = self.path + '.tmp'
+        try:
+            for day in sorted(self.daily)[:-STATS_KEEP_DAYS]:
+                del self.daily[day]
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'daily_captures': dict(sorted(self.daily.items()))}, f, indent=2)
+            os.replace(temp_file, self.path)
+            self._dirty = False
+        except Exception as e:
+            log.exception(f"Stats save error: {e}")
+
+# ─── Shelf Archive ────────────────────────────────────────────────────────────
+ARCHIVE_PAGE_ITEMS = 50    # archived items paged in per step
+ARCHIVE_MAX_PAGED  = 200   # archived widgets held at once; the oldest page is dropped
+ARCHIVE_PREFETCH_PX = 300  # page in when the shelf is scrolled this close to its end
+_ARCHIVE_COLUMNS = "id, type, content, blob, size, thumb, tags, date_added, use_count"
+
+def open_sqlite(path, init, what):
+    """
+    Connect to the database at path and run init(db) on it. A file SQLite
+    reports as corrupt or not a database is kept beside it as '.corrupt' (or
+    '.corrupt-<time>' if one is already there) and init runs again on a fresh
+    one, so init must reset any state a failed attempt left behind. Anything
+    else, like a lock held past the busy timeout, is raised with the file
+    left as it was.
+    """
+    db = None
+    try:
+        db = sqlite3.connect(path)
+        init(db)
+        return db
+    except sqlite3.DatabaseError as e:
+        if db is not None:
+            db.close()
+        if getattr(e, 'sqlite_errorcode', None) not in SQLITE_DAMAGED:
+            log.error(f"{what} open error: {e}")
+            raise
+        log.exception(f"{what} open error: {e}")
+        if os.path.exists(path):
+            backup, stamp = path + '.corrupt', time.strftime('%Y%m%d-%H%M%S')
+            for n in itertools.count(1):
+                if not os.path.exists(backup):
+                    break
+                backup = f"{path}.corrupt-{stamp}" + (f"-{n}" if n > 1 else "")
+            os.replace(path, backup)
+    db = sqlite3.connect(path)
+    init(db)
+    return db
+
+def archive_key(dtype, ident):
+    """Dedup key for either tier: the item type plus its blob key or content."""
+    dtype = dtype.value if isinstance(dtype, ItemType) else dtype
+    return hashlib.sha1(f"{dtype}\0{ident}".encode('utf-8', errors='surrogatepass')).hexdigest()
+
+class ShelfArchive:
+    """
+    Cold tier of the shelf. Non-favourite items pushed past MAX_SHELF_ITEMS
+    move into this SQLite table instead of being deleted, and are paged
+    back in as widgets when scrolled to or matched by a search. Rows keep
+    the favorites.json item shape; large payloads stay in the blob store.
+
+    Date, type and use count are indexed, and search goes through an FTS5
+    trigram index when the SQLite build has one (LIKE otherwise, and for
+    queries under three characters, which trigrams can't match). Counts by
+    type and total uses are kept in memory for ShelfStats.
+    """
+    def __init__(self, path=ARCHIVE_FILE, blob_store=None):
+        self.path = path
+        self.blob_store = blob_store   # reads out-of-line text for the search column
+        self.by_type = Counter()
+        self.total_uses = 0
+        self.fts = False
+        self.db = open_sqlite(path, self._open, "Archive")
+
+    def _open(self, db):
+        self.db = db
+        self.by_type.clear()
+        self.total_uses = 0
+        self.fts = False
+        with self.db:
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    type TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    blob TEXT,
+                    size INTEGER,
+                    thumb TEXT,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    date_added TEXT NOT NULL,
+                    use_count INTEGER NOT NULL DEFAULT 0,
+                    search TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS items_date ON items(date_added, id);
+                CREATE INDEX IF NOT EXISTS items_type_date ON items(type, date_added, id);
+                CREATE INDEX IF NOT EXISTS items_used ON items(use_count) WHERE use_count > 0;
+            """)
+        try:
+            existed = self.db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'items_fts'").fetchone()
+            with self.db:
+                self.db.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                        search, content='items', content_rowid='id', tokenize='trigram');
+                    CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+                        INSERT INTO items_fts(rowid, search) VALUES (new.id, new.search);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+                        INSERT INTO items_fts(items_fts, rowid, search)
+                            VALUES ('delete', old.id, old.search);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF search ON items BEGIN
+                        INSERT INTO items_fts(items_fts, rowid, search)
+                            VALUES ('delete', old.id, old.search);
+                        INSERT INTO items_fts(rowid, search) VALUES (new.id, new.search);
+                    END;
+                """)
+                if not existed:
+                    # Rows archived by a build without FTS5
+                    self.db.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+            self.fts = True
+        except sqlite3.OperationalError:
+            log.info("SQLite has no FTS5 trigram tokenizer; archive search will scan")
+        for dtype, count, uses in self.db.execute(
+                "SELECT type, count(*), coalesce(sum(use_count), 0) FROM items GROUP BY type"):
+            self.by_type[dtype] = count
+            self.total_uses += uses
+
+    def __len__(self):
+        return sum(self.by_type.values())
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _entry(row):
+        archive_id, dtype, content, blob, size, thumb, tags, date_added, uses = row
+        entry = {'type': dtype, 'content': content, 'is_favorite': False,
+                 'hidden_from_main': False, 'tags': json.loads(tags),
+                 'date_added': date_added, 'use_count': uses, 'archive_id': archive_id}
+        for field, value in (('blob', blob), ('size', size), ('thumb', thumb)):
+            if value is not None:
+                entry[field] = value
+        return entry
+
+    def _row(self, entry):
+        """Column values (key first) for an item dict."""
+        dtype = entry['type']
+        dtype = dtype.value if isinstance(dtype, ItemType) else dtype
+        tags = list(entry.get('tags') or [])
+        content = str(entry['content'])
+        text = entry_search_text(self.blob_store, entry) if self.blob_store else content.lower()
+        search = '\n'.join([text] + [t.lower() for t in tags])
+        return (archive_key(dtype, entry.get('blob') or content), dtype, content,
+                entry.get('blob'), entry.get('size'), entry.get('thumb'), json.dumps(tags),
+                entry.get('date_added') or datetime.now().isoformat(),
+                entry.get('use_count', 0), search)
+
+    def _count(self, dtype, uses, sign):
+        self.by_type[dtype] += sign
+        if self.by_type[dtype] <= 0:
+            del self.by_type[dtype]
+        self.total_uses += sign * uses
+
+    # ── Writes ──
+    def put(self, entries):
+        """Archive item dicts (large text already out of line), replacing rows with the same key."""
+        rows = {}
+        for entry in entries:
+            row = self._row(entry)
+            rows[row[0]] = row
+        if not rows:
+            return
+        with self.db:
+            self._delete_where('key', list(rows))
+            self.db.executemany(
+                "INSERT INTO items (key, type, content, blob, size, thumb, tags, date_added,"
+                " use_count, search) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows.values())
+        for row in rows.values():
+            self._count(row[1], row[8], 1)
+
+    def take(self, keys):
+        """Remove and return the rows with these archive_key()s (re-added items)."""
+        with self.db:
+            return self._delete_where('key', keys)
+
+    def remove(self, ids):
+        with self.db:
+            return self._delete_where('id', ids)
+
+    def _delete_where(self, column, values):
+        taken = []
+        values = list(values)
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            marks = ','.join('?' * len(chunk))
+            rows = self.db.execute(
+                f"SELECT {_ARCHIVE_COLUMNS} FROM items WHERE {column} IN ({marks})", chunk).fetchall()
+            if rows:
+                self.db.execute(f"DELETE FROM items WHERE {column} IN ({marks})", chunk)
+                taken.extend(self._entry(row) for row in rows)
+        for entry in taken:
+            self._count(entry['type'], entry['use_count'], -1)
+        return taken
+
+    def update(self, archive_id, entry):
+        """Write back an archived item that was edited or used while paged in."""
+        row = self._row(entry)
+        with self.db:
+            old = self.db.execute("SELECT use_count FROM items WHERE id = ?",
+                                  (archive_id,)).fetchone()
+            if old is None:
+                return
+            # An edit can make it equal to another archived item
+            dupes = [r[0] for r in self.db.execute(
+                "SELECT id FROM items WHERE key = ? AND id != ?", (row[0], archive_id))]
+            self._delete_where('id', dupes)
+            self.db.execute(
+                "UPDATE items SET key = ?, content = ?, blob = ?, size = ?, thumb = ?, tags = ?,"
+                " use_count = ?, search = ? WHERE id = ?",
+                (row[0], row[2], row[3], row[4], row[5], row[6], row[8], row[9], archive_id))
+        self.total_uses += row[8] - old[0]
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM items")
+        self.by_type.clear()
+        self.total_uses = 0
+
+    # ── Queries ──
+    def _where(self, dtype=None, query=None):
+        clauses, args = [], []
+        if dtype:
+            clauses.append("type = ?")
+            args.append(dtype)
+        if query:
+            query = query.lower()
+            if self.fts and len(query) >= 3:
+                clauses.append("id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)")
+                args.append('"' + query.replace('"', '""') + '"')
+            else:
+                clauses.append("search LIKE ? ESCAPE '\\'")
+                escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                args.append(f"%{escaped}%")
+        return clauses, args
+
+    def page(self, limit=ARCHIVE_PAGE_ITEMS, dtype=None, query=None, after=None, offset=0):
+        """
+        Archived item dicts, newest first, each carrying its archive_id.
+        after is the (date_added, archive_id) of the last row already shown,
+        so paging holds steady while rows are archived or removed.
+        """
+        clauses, args = self._where(dtype, query)
+        if after is not None:
+            clauses.append("(date_added < ? OR (date_added = ? AND id < ?))")
+            args += [after[0], after[0], after[1]]
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        rows = self.db.execute(
+            f"SELECT {_ARCHIVE_COLUMNS} FROM items{where}"
+            f" ORDER BY date_added DESC, id DESC LIMIT ? OFFSET ?", args + [limit, offset])
+        return [self._entry(row) for row in rows]
+
+    def count(self, dtype=None, query=None):
+        if not query:
+            return self.by_type.get(dtype, 0) if dtype else len(self)
+        clauses, args = self._where(dtype, query)
+        return self.db.execute(
+            "SELECT count(*) FROM items WHERE " + " AND ".join(clauses), args).fetchone()[0]
+
+    def most_used(self, k):
+        rows = self.db.execute(
+            f"SELECT {_ARCHIVE_COLUMNS} FROM items WHERE use_count > 0"
+            " ORDER BY use_count DESC LIMIT ?", (k,))
+        return [self._entry(row) for row in rows]
+
+    def images(self):
+        """(date_added, archive_id, blob, size) of every archived image, for the image budget."""
+        return self.db.execute(
+            "SELECT date_added, id, blob, size FROM items WHERE type = ? AND blob IS NOT NULL",
+            (ItemType.IMAGE.value,)).fetchall()
+
+    def blob_keys(self):
+        for blob, thumb in self.db.execute(
+                "SELECT blob, thumb FROM items WHERE blob IS NOT NULL OR thumb IS NOT NULL"):
+            if blob:
+                yield blob
+            if thumb:
+                yield thumb
+
+    def entries(self):
+        """Every archived item dict, newest first."""
+        for row in self.db.execute(
+                f"SELECT {_ARCHIVE_COLUMNS} FROM items ORDER BY date_added DESC, id DESC"):
+            yield self._entry(row)
+
+# ─── Clipboard History ────────────────────────────────────────────────────────
+HISTORY_PAGE_ROWS   = 50    # history rows built per page
+HISTORY_MAX_ROWS    = 500   # rows held at once; the oldest-loaded page is dropped
+HISTORY_PREFETCH_PX = 300   # page in when the history is scrolled this close to its end
+_HISTORY_COLUMNS = "id, time, type, content, blob, size, thumb"
+
+def history_ranges(now=None):
+    """(label, since, until) for the History view's date ranges, as ISO bounds."""
+    today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    day = lambda n: (today - timedelta(days=n)).isoformat()
+    return [("All time", None, None),
+            ("Today", day(0), None),
+            ("Yesterday", day(1), day(0)),
+            ("Last 7 days", day(6), None),
+            ("Last 30 days", day(29), None),
+            ("Older", None, day(29))]
+
+class ClipboardHistory:
+    """
+    Clipboard history in SQLite, so it can grow far past what would fit in
+    memory. Each capture is one insert, the size limit is enforced by
+    deleting the oldest rows in place, and the History view pages rows in
+    newest first through the (time, id) index, which also serves its date
+    ranges. Only the row count and the blob keys held are kept in memory.
+    A history.json from an earlier version is imported on first open.
+    """
+    def __init__(self, blob_store, path=HISTORY_DB_FILE, legacy=HISTORY_FILE):
+        self.path = path
+        self.blobs = Counter()   # blob/thumb key -> rows holding it
+        self._count = 0
+        self.db = open_sqlite(path, self._open, "History")
+        if legacy and os.path.exists(legacy):
+            self._import_json(legacy, blob_store)
+
+    def _open(self, db):
+        self.db = db
+        self.blobs.clear()
+        self._count = 0
+        # Lets a big trim hand its pages back; only takes effect on a new file
+        self.db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        with self.db:
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    time TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    blob TEXT,
+                    size INTEGER,
+                    thumb TEXT);
+                CREATE INDEX IF NOT EXISTS history_time ON history(time, id);
+                CREATE INDEX IF NOT EXISTS history_images ON history(time) WHERE type = 'image';
+                CREATE INDEX IF NOT EXISTS history_blobs ON history(blob, thumb)
+                    WHERE blob IS NOT NULL OR thumb IS NOT NULL;
+            """)
+        self._count = self.db.execute("SELECT count(*) FROM history").fetchone()[0]
+        for blob, thumb in self.db.execute(
+                "SELECT blob, thumb FROM history WHERE blob IS NOT NULL OR thumb IS NOT NULL"):
+            self._hold(blob, thumb, 1)
+
+    def _import_json(self, path, blob_store):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.append([store_out_of_line(blob_store, e) for e in data if e.get('time')])
+            os.replace(path, path + '.migrated')
+            log.info(f"Imported {len(data)} history entries from {path}")
+        except Exception as e:
+            log.exception(f"History import error: {e}")
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _entry(row):
+        history_id, time_, dtype, content, blob, size, thumb = row
+        entry = {'type': dtype, 'content': content, 'time': time_, 'history_id': history_id}
+        for field, value in (('blob', blob), ('size', size), ('thumb', thumb)):
+            if value is not None:
+                entry[field] = value
+        return entry
+
+    def _hold(self, blob, thumb, sign):
+        for key in (blob, thumb):
+            if key:
+                self.blobs[key] += sign
+                if self.blobs[key] <= 0:
+                    del self.blobs[key]
+
+    # ── Writes ──
+    def append(self, records, limit=None):
+        """Insert history_record() dicts, then keep only the newest `limit`.
+        Returns the records with their history_id."""
+        added = []
+        with self.db:
+            for record in records:
+                dtype = record['type']
+                dtype = dtype.value if isinstance(dtype, ItemType) else dtype
+                cursor = self.db.execute(
+                    "INSERT INTO history (time, type, content, blob, size, thumb)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (record['time'], dtype, str(record['content']), record.get('blob'),
+                     record.get('size'), record.get('thumb')))
+                self._count += 1
+                self._hold(record.get('blob'), record.get('thumb'), 1)
+                added.append(dict(record, type=dtype, history_id=cursor.lastrowid))
+            if limit is not None:
+                self._trim(limit)
+        return added
+
+    def trim(self, limit):
+        """Delete all but the newest `limit` entries; returns how many went."""
+        with self.db:
+            trimmed = self._trim(limit)
+        if trimmed:
+            # executescript runs it to completion; execute() frees a single page
+            self.db.executescript("PRAGMA incremental_vacuum;")
+        return trimmed
+
+    def _trim(self, limit):
+        excess = self._count - max(0, limit)
+        if excess <= 0:
+            return 0
+        # The newest row to go; it and everything older is deleted in one range
+        cutoff = self.db.execute("SELECT time, id FROM history ORDER BY time, id LIMIT 1 OFFSET ?",
+                                 (excess - 1,)).fetchone()
+        return self._delete("time < ? OR (time = ? AND id <= ?)", [cutoff[0], cutoff[0], cutoff[1]])
+
+    def remove(self, ids):
+        ids = list(ids)
+        removed = 0
+        with self.db:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                removed += self._delete(f"id IN ({','.join('?' * len(chunk))})", chunk)
+        return removed
+
+    def _delete(self, where, args):
+        for blob, thumb in self.db.execute(
+                f"SELECT blob, thumb FROM history WHERE ({where})"
+                " AND (blob IS NOT NULL OR thumb IS NOT NULL)", args).fetchall():
+            self._hold(blob, thumb, -1)
+        deleted = self.db.execute(f"DELETE FROM history WHERE {where}", args).rowcount
+        self._count -= deleted
+        return deleted
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM history")
+        self.blobs.clear()
+        self._count = 0
+
+    # ── Queries ──
+    @staticmethod
+    def _where(since=None, until=None):
+        clauses, args = [], []
+        if since:
+            clauses.append("time >= ?")
+            args.append(since)
+        if until:
+            clauses.append("time < ?")
+            args.append(until)
+        return clauses, args
+
+    def page(self, limit=HISTORY_PAGE_ROWS, since=None, until=None, after=None):
+        """
+        Entries newest first, each carrying its history_id, optionally within
+        [since, until). after is the (time, history_id) of the last row
+        already shown, so pages hold steady while captures come in.
+        """
+        clauses, args = self._where(since, until)
+        if after is not None:
+            clauses.append("(time < ? OR (time = ? AND id < ?))")
+            args += [after[0], after[0], after[1]]
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        rows = self.db.execute(
+            f"SELECT {_HISTORY_COLUMNS} FROM history{where}"
+            " ORDER BY time DESC, id DESC LIMIT ?", args + [limit])
+        return [self._entry(row) for row in rows]
+
+    def count(self, since=None, until=None):
+        if not (since or until):
+            return self._count
+        clauses, args = self._where(since, until)
+        return self.db.execute(
+            "SELECT count(*) FROM history WHERE " + " AND ".join(clauses), args).fetchone()[0]
+
+    def images(self):
+        """(time, history_id, blob, size) of every image entry, for the image budget."""
+        return self.db.execute(
+            "SELECT time, id, blob, size FROM history WHERE type = 'image' AND blob IS NOT NULL"
+        ).fetchall()
+
+    def blob_keys(self):
+        return list(self.blobs)
+
+    def entries(self):
+        """Every entry, oldest first."""
+        for row in self.db.execute(f"SELECT {_HISTORY_COLUMNS} FROM history ORDER BY time, id"):
+            yield self._entry(row)
+
 # ─── Clickable Label (for icons) ──────────────────────────────────────────────
 class ClickableLabel(QLabel):
     clicked = Signal()
@@ -890,9 +3182,20 @@ class ClickableLabel(QLabel):
             log.exception(f"Label click error: {e}")
 
 # ─── Draggable Item ───────────────────────────────────────────────────────────
+def compare_names(a, b):
+    """
+    Name-sort order of two items by full lowercased text. Previews decide
+    unless one is a prefix of the other and out-of-line text is involved.
+    """
+    ka, kb = a.search_text(), b.search_text()
+    if (a.out_of_line or b.out_of_line) and (ka.startswith(kb) or kb.startswith(ka)):
+        ka, kb = a.full_search_text(), b.full_search_text()
+    return (ka > kb) - (ka < kb)
+
 class DraggableItem(QFrame):
     def __init__(self, dtype, content, shelf, is_favorite=False, hidden_from_main=False,
-                 tags=None, date_added=None, use_count=0):
+                 tags=None, date_added=None, use_count=0, blob=None, size=None,
+                 thumb=None, archive_id=None):
         super().__init__()
         # Convert dtype to ItemType if it's a string
         if isinstance(dtype, str):
@@ -900,16 +3203,99 @@ class DraggableItem(QFrame):
         else:
             self.data_type = dtype
         
-        self.content = content
+        # Large text lives in the shelf's BlobStore; only a bounded preview is
+        # kept here and the full string is read back when actually needed.
         self.shelf = shelf
+        self.blob_key = blob
+        self.thumb_key = thumb   # images only: small PNG shown as the icon
+        self._content = content
+        self.content_size = size if size is not None else len(str(content))
+        self._search_text = None
         self.is_favorite = is_favorite
         self.hidden_from_main = hidden_from_main
         self.tags = tags or []
         self.date_added = date_added or datetime.now().isoformat()
         self.use_count = use_count
+        self.archive_id = archive_id   # set while paged in from the ShelfArchive
         self.is_selected = False
         self._init_ui()
 
+    @property
+    def content(self):
+        """Full content; out-of-line text is loaded from the blob store.
+        Images have no text content; this is their label (see image())."""
+        if self.blob_key and self.data_type == ItemType.TEXT:
+            return self.shelf.blob_store.get_text(self.blob_key)
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        if self.data_type == ItemType.TEXT and len(value) > LARGE_TEXT_THRESHOLD:
+            self.blob_key = self.shelf.blob_store.put_text(value)
+            self._content = text_preview(value)
+        else:
+            self.blob_key = None
+            self._content = value
+        self.content_size = len(value)
+        self._search_text = None
+
+    @property
+    def preview(self):
+        """Bounded text for labels and tooltips."""
+        return str(self._content)
+
+    @property
+    def out_of_line(self):
+        """True for text whose full content lives in the blob store."""
+        return bool(self.blob_key) and self.data_type == ItemType.TEXT
+
+    @property
+    def dedup_key(self):
+        return (self.data_type, self.blob_key or self._content)
+
+    def image(self):
+        """Decode an image item's full-resolution picture from the blob store."""
+        return QImage.fromData(self.shelf.blob_store.get_bytes(self.blob_key))
+
+    def search_text(self):
+        """Lowercased preview; enough to decide most searches and comparisons."""
+        if self._search_text is None:
+            self._search_text = self.preview.lower()
+        return self._search_text
+
+    def full_search_text(self):
+        if self.out_of_line:
+            return self.shelf.blob_store.search_text(self.blob_key)
+        return self.search_text()
+
+    def matches(self, query):
+        """Whether the lowercase query occurs anywhere in the full text."""
+        if query in self.search_text():
+            return True
+        try:
+            return self.out_of_line and query in self.full_search_text()
+        except OSError:
+            log.warning(f"Search: blob {self.blob_key} unreadable")
+            return False
+
+    def to_dict(self, full=False):
+        """Serialisable form; full=True inlines out-of-line payloads (for export)."""
+        data = {'type': self.data_type.value,
+                'is_favorite': self.is_favorite, 'hidden_from_main': self.hidden_from_main,
+                'tags': self.tags, 'date_added': self.date_added, 'use_count': self.use_count}
+        if self.data_type == ItemType.IMAGE:
+            data.update(content=self._content, size=self.content_size)
+            if full:
+                data['data'] = base64.b64encode(
+                    self.shelf.blob_store.get_bytes(self.blob_key)).decode('ascii')
+            else:
+                data.update(blob=self.blob_key, thumb=self.thumb_key)
+        elif self.blob_key and not full:
+            data.update(blob=self.blob_key, content=self._content, size=self.content_size)
+        else:
+            data['content'] = self.content
+        return data
+
     def _init_ui(self):
         try:
             self.setFrameShape(QFrame.Shape.StyledPanel)
@@ -932,12 +3318,13 @@ class DraggableItem(QFrame):
 
             self.text_label = QLabel()
             self.text_label.setStyleSheet("font-size: 12px; font-weight: bold; background: transparent; border: none;")
-            display_text = str(self.content)
+            display_text = self.preview
             if self.data_type == ItemType.FILE:
                 display_text = os.path.basename(self.content)
             fm = self.text_label.fontMetrics()
-            self.text_label.setText(fm.elidedText(display_text, Qt.TextElideMode.ElideRight, 160))
-            self.text_label.setToolTip(str(self.content))
+            self.text_label.setText(fm.elidedText(display_text[:TOOLTIP_MAX_CHARS],
+                                                  Qt.TextElideMode.ElideRight, 160))
+            self.text_label.setToolTip(self.preview[:TOOLTIP_MAX_CHARS])
             text_block.addWidget(self.text_label)
 
             # Info sub-label (size / char count / domain)
@@ -1015,7 +3402,10 @@ class DraggableItem(QFrame):
                     size_str = f"{size_bytes/(1024*1024):.1f} MB"
                 tooltip_parts.append(f"Size: {size_str}")
 
-            tooltip_parts.append(f"Content: {self.content}")
+            content = self.preview
+            if len(content) > TOOLTIP_MAX_CHARS:
+                content = content[:TOOLTIP_MAX_CHARS] + "…"
+            tooltip_parts.append(f"Content: {content}")
             if self.tags:
                 tooltip_parts.append(f"Tags: {', '.join(self.tags)}")
             tooltip_parts.append(f"Used: {self.use_count}x")
@@ -1064,6 +3454,8 @@ class DraggableItem(QFrame):
                         info = f"{size_bytes / (1024 * 1024):.1f} MB"
                 else:
                     info = "file not found"
+            elif self.data_type == ItemType.IMAGE:
+                info = format_bytes(self.content_size)
             elif self.data_type == ItemType.URL:
                 try:
                     from urllib.parse import urlparse
@@ -1072,8 +3464,7 @@ class DraggableItem(QFrame):
                 except Exception:
                     info = str(self.content)[:40]
             else:
-                char_count = len(str(self.content))
-                info = f"{char_count} chars"
+                info = f"{self.content_size} chars"
             if hasattr(self, 'info_label'):
                 self.info_label.setText(info)
         except Exception as e:
@@ -1086,6 +3477,7 @@ class DraggableItem(QFrame):
         self._update_info_label()
 
 
+    @traced('item.preview')
     def _set_preview(self):
         try:
             t = THEMES[self.shelf.current_theme]
@@ -1108,48 +3500,101 @@ class DraggableItem(QFrame):
                 else:
                     self.icon_label.setText("📄")
                     self.icon_label.setStyleSheet(f"font-size: 24px; border: 1px solid {t['border']}; background: {t['bg_btn']}; border-radius: 6px;")
+            elif self.data_type == ItemType.IMAGE:
+                pixmap = QPixmap()
+                try:
+                    if self.thumb_key:
+                        pixmap.loadFromData(self.shelf.blob_store.get_bytes(self.thumb_key))
+                except OSError:
+                    pass
+                if not pixmap.isNull():
+                    self.icon_label.setPixmap(pixmap.scaled(36, 36,
+                        Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation))
+                    self.icon_label.setStyleSheet(f"border: 1px solid {t['border']}; background: transparent; border-radius: 4px;")
+                else:
+                    self.icon_label.setText("🖼")
+                    self.icon_label.setStyleSheet(f"font-size: 24px; border: 1px solid {t['border']}; background: {t['bg_btn']}; border-radius: 6px;")
+                self.icon_label.setToolTip("Click to copy image")
             elif self.data_type == ItemType.URL:
                 self.icon_label.setText("🔗")
                 self.icon_label.setStyleSheet(f"font-size: 24px; border: 1px solid {t['border']}; background: {t['bg_btn']}; border-radius: 6px;")
                 self.icon_label.setToolTip("Click to open link")
+                self._request_favicon()
             else:
                 self.icon_label.setText("T")
                 self.icon_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {t['accent']}; border: 1px solid {t['border']}; background: {t['bg_btn']}; border-radius: 6px;")
         except Exception as e:
             log.exception(f"Preview set error: {e}")
 
+    def _request_favicon(self):
+        try:
+            service = getattr(self.shelf, 'favicon_service', None)
+            if service is None:
+                return
+            self._stop_favicon_request()
+            self._favicon_request = (service, str(self.content))
+            service.request(str(self.content), self._on_favicon_ready)
+        except Exception as e:
+            log.exception(f"Favicon request error: {e}")
+
+    def _stop_favicon_request(self):
+        pending = getattr(self, '_favicon_request', None)
+        if pending is not None:
+            service, url = pending
+            try:
+                service.cancel(url, self._on_favicon_ready)
+            except Exception:
+                pass
+            self._favicon_request = None
+
+    def _on_favicon_ready(self, host, pixmap):
+        try:
+            if getattr(self, '_favicon_request', None) is None:
+                return
+            t = THEMES[self.shelf.current_theme]
+            self.icon_label.setText("")
+            self.icon_label.setPixmap(pixmap)
+            self.icon_label.setStyleSheet(f"border: 1px solid {t['border']}; background: {t['bg_btn']}; border-radius: 6px;")
+        except Exception as e:
+            log.exception(f"Favicon update error: {e}")
+
+    def _release_requests(self):
+        """Drop pending title and favicon requests before the widget goes away."""
+        self._stop_title_fetcher()
+        self._stop_favicon_request()
+
     def _fetch_url_title(self):
         try:
-            # Stop any previously running fetcher for this item before starting a new one
+            # Drop any earlier request for this item before queuing a new one
             self._stop_title_fetcher()
-            fetcher = TitleFetcher(str(self.content))
-            fetcher.title_fetched.connect(self._on_title_fetched)
-            fetcher.finished.connect(fetcher.deleteLater)
-            fetcher.start()
-            self._title_fetcher = fetcher
+            service = getattr(self.shelf, 'title_service', None)
+            if service is None:
+                return
+            url = str(self.content)
+            priority = (TITLE_PRIORITY_BACKGROUND if self.shelf._loading
+                        else TITLE_PRIORITY_VISIBLE)
+            # Set before requesting: cached titles are delivered synchronously
+            self._title_fetcher = (service, url)
+            service.request(url, self._on_title_fetched, priority)
         except Exception as e:
             log.exception(f"URL title fetch error: {e}")
 
     def _stop_title_fetcher(self):
-        """Safely disconnect and stop any running title fetcher thread."""
-        fetcher = getattr(self, '_title_fetcher', None)
-        if fetcher is not None:
+        """Unsubscribe from the shared title service (never blocks)."""
+        pending = getattr(self, '_title_fetcher', None)
+        if pending is not None:
+            service, url = pending
             try:
-                fetcher.title_fetched.disconnect()
-            except Exception:
-                pass
-            try:
-                if fetcher.isRunning():
-                    fetcher.quit()
-                    fetcher.wait(500)
+                service.cancel(url, self._on_title_fetched)
             except Exception:
                 pass
             self._title_fetcher = None
 
     def _on_title_fetched(self, url, title):
         try:
-            # Guard: if this widget has been scheduled for deletion, ignore the signal
-            if not hasattr(self, '_title_fetcher'):
+            # Guard: ignore results for requests this item no longer wants
+            if getattr(self, '_title_fetcher', None) is None:
                 return
             if str(self.content) == url:
                 fm = self.text_label.fontMetrics()
@@ -1203,6 +3648,8 @@ class DraggableItem(QFrame):
             self.update_style()
             self._update_star_style()
             if self.shelf:
+                self.shelf.stats.set_favorite(self, self.is_favorite)
+                self.shelf._sync_archived(self)
                 self.shelf.save_favorites()
                 self.shelf.refresh_visibility()
         except Exception as e:
@@ -1230,13 +3677,19 @@ class DraggableItem(QFrame):
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 new_content = dialog.get_content()
                 if new_content is not None and self.data_type == ItemType.TEXT:
+                    if clipboard_recorder.active:
+                        clipboard_recorder.record_edit(self.data_type, self.content, new_content)
                     self.content = new_content
                     fm = self.text_label.fontMetrics()
-                    self.text_label.setText(fm.elidedText(new_content, Qt.TextElideMode.ElideRight, 180))
+                    self.text_label.setText(fm.elidedText(self.preview[:TOOLTIP_MAX_CHARS],
+                                                          Qt.TextElideMode.ElideRight, 180))
+                    self.text_label.setToolTip(self.preview[:TOOLTIP_MAX_CHARS])
+                    self._update_info_label()
                 self.tags = dialog.get_tags()
                 self._update_tags_display()
                 self._refresh_tooltip()
                 if self.shelf:
+                    self.shelf._sync_archived(self)
                     self.shelf.save_favorites()
         except Exception as e:
             log.exception(f"Edit item error: {e}")
@@ -1246,6 +3699,8 @@ class DraggableItem(QFrame):
             self.use_count += 1
             self._refresh_tooltip()
             if self.shelf:
+                self.shelf.stats.set_uses(self, self.use_count)
+                self.shelf._sync_archived(self)
                 self.shelf.save_favorites()
 
             if self.data_type == ItemType.URL:
@@ -1265,18 +3720,26 @@ class DraggableItem(QFrame):
                 else:  # Linux and other Unix-like systems
                     subprocess.run(['xdg-open', file_path], check=False)
             else:
-                # Guard clipboard write so it doesn't re-trigger _on_clipboard_change
-                if self.shelf:
-                    self.shelf._clipboard_guard = True
-                try:
-                    QApplication.clipboard().setText(str(self.content))
-                finally:
-                    if self.shelf:
-                        self.shelf._clipboard_guard = False
+                self._copy_to_clipboard()
         except Exception as e:
             log.exception(f"Handle open error: {e}")
             QMessageBox.warning(self, "Error", f"Failed to open: {e}")
 
+    def _copy_to_clipboard(self):
+        # Guard clipboard write so it doesn't re-trigger _on_clipboard_change
+        if self.shelf:
+            self.shelf._clipboard_guard = True
+        try:
+            if self.data_type == ItemType.IMAGE:
+                QApplication.clipboard().setImage(self.image())
+            else:
+                QApplication.clipboard().setText(str(self.content))
+        except Exception as e:
+            log.exception(f"Copy to clipboard error: {e}")
+        finally:
+            if self.shelf:
+                self.shelf._clipboard_guard = False
+
     def _request_removal(self):
         try:
             if self.shelf:
@@ -1313,15 +3776,7 @@ class DraggableItem(QFrame):
             """)
 
             copy_action = QAction("Copy to Clipboard", self)
-            def _safe_copy():
-                if self.shelf:
-                    self.shelf._clipboard_guard = True
-                try:
-                    QApplication.clipboard().setText(str(self.content))
-                finally:
-                    if self.shelf:
-                        self.shelf._clipboard_guard = False
-            copy_action.triggered.connect(_safe_copy)
+            copy_action.triggered.connect(self._copy_to_clipboard)
             menu.addAction(copy_action)
 
             if self.data_type == ItemType.URL:
@@ -1366,6 +3821,7 @@ class DraggableItem(QFrame):
             return
         try:
             import io
+            import qrcode
             qr = qrcode.QRCode(box_size=6, border=2)
             qr.add_data(str(self.content))
             qr.make(fit=True)
@@ -1445,10 +3901,518 @@ class DraggableItem(QFrame):
             log.exception(f"Theme refresh error: {e}")
 
 
+# ─── Content Classifier ───────────────────────────────────────────────────────
+CLASSIFY_SCAN_CHARS = 16 * 1024   # longer text is never split or treated as a link
+CLASSIFY_MAX_ITEMS  = 200         # most lines a pasted list may split into
+STAT_CACHE_TTL      = 5.0         # seconds a path's existence check is reused
+STAT_CACHE_SIZE     = 512
+
+_URL_RE      = re.compile(r'(?:https?|ftp)://[^\s/$.?#][^\s]*\Z|www\.[^\s/]+\.[^\s]+\Z', re.IGNORECASE)
+_FILE_URI_RE = re.compile(r'file://\S+\Z', re.IGNORECASE)
+_PATH_RE     = re.compile(r'(?:[A-Za-z]:[\\/]|/|~[\\/])[^\x00\r\n]*\Z')
+_UNC_RE      = re.compile(r'\\\\[^\\/\s]+[\\/][^\x00\r\n]+\Z')
+
+class ContentClassifier:
+    """
+    Decides what clipboard or dropped text is: URL, path to an existing file,
+    a list of those (one item each), or plain text. Only text up to
+    CLASSIFY_SCAN_CHARS is examined, patterns are precompiled and path
+    existence checks are cached, so it is cheap enough for every clipboard
+    event.
+    """
+    def __init__(self):
+        self._stat_cache = {}   # path -> (exists, monotonic time)
+
+    def classify(self, text):
+        """Return a list of (ItemType, content); empty for blank text."""
+        text = text.strip()
+        if not text:
+            return []
+        if len(text) > CLASSIFY_SCAN_CHARS:
+            return [(ItemType.TEXT, text)]
+        if '\n' not in text:
+            return [self._classify_line(text) or (ItemType.TEXT, text)]
+        lines = [line.strip() for line in text.splitlines()]
+        lines = [line for line in lines if line]
+        if len(lines) > CLASSIFY_MAX_ITEMS:
+            return [(ItemType.TEXT, text)]
+        entries = []
+        for line in lines:
+            entry = self._classify_line(line)
+            if entry is None:
+                # One ordinary line makes the whole paste plain text
+                return [(ItemType.TEXT, text)]
+            entries.append(entry)
+        return entries
+
+    def _classify_line(self, line):
+        if len(line) > 2 and line[0] == line[-1] and line[0] in '"\'':
+            line = line[1:-1].strip()
+        if _URL_RE.match(line):
+            return (ItemType.URL, line)
+        if _FILE_URI_RE.match(line):
+            path = QUrl(line).toLocalFile()
+            if path and self._exists(path):
+                return (ItemType.FILE, path)
+            return None
+        if _UNC_RE.match(line):
+            # Not stat'ed: an unreachable share can block for seconds
+            return (ItemType.FILE, line)
+        if _PATH_RE.match(line):
+            path = os.path.expanduser(line)
+            if self._exists(path):
+                return (ItemType.FILE, os.path.normpath(path))
+        return None
+
+    def _exists(self, path):
+        now = time.monotonic()
+        cached = self._stat_cache.get(path)
+        if cached is not None and now - cached[1] < STAT_CACHE_TTL:
+            return cached[0]
+        try:
+            exists = os.path.exists(path)
+        except (OSError, ValueError):
+            exists = False
+        if len(self._stat_cache) >= STAT_CACHE_SIZE:
+            self._stat_cache.pop(next(iter(self._stat_cache)))
+        self._stat_cache.pop(path, None)
+        self._stat_cache[path] = (exists, now)
+        return exists
+
+def snapshot_clipboard(clipboard, classifier, ingest, image_capture):
+    """Hand the current clipboard to the ingest queue (or the image worker)."""
+    mime = clipboard.mimeData()
+    entries = []
+    if mime.hasUrls():
+        for url in mime.urls():
+            if url.isLocalFile():
+                entries.append((ItemType.FILE, url.toLocalFile()))
+    elif mime.hasText():
+        entries = classifier.classify(mime.text())
+    elif mime.hasImage():
+        # Encoding and dedup run on the capture worker
+        image = clipboard.image()
+        clipboard_recorder.record_image(image)
+        image_capture.submit(image)
+    clipboard_recorder.record_clipboard(entries)
+    ingest.submit(entries)
+
+# ─── Clipboard Ingest ─────────────────────────────────────────────────────────
+CLIPBOARD_COALESCE_MS  = 150   # quiet period that ends a burst
+CLIPBOARD_MAX_DELAY_MS = 600   # flush a continuous burst at least this often
+
+class ClipboardIngest(QObject):
+    """
+    Collects clipboard snapshots and releases them in batches.
+    Apps and clipboard managers often set the clipboard several times for a
+    single copy; snapshots arriving within CLIPBOARD_COALESCE_MS of each other
+    form one burst, identical payloads in a burst are collapsed by content
+    hash, and the survivors are emitted once, in arrival order.
+    """
+    batch_ready = Signal(list)  # list of (ItemType, content) tuples
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = {}        # payload hash -> list of (ItemType, content)
+        self._burst_started = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    @staticmethod
+    def payload_hash(entries):
+        h = hashlib.sha1()
+        for dtype, content in entries:
+            h.update(dtype.value.encode('utf-8'))
+            h.update(b'\0')
+            h.update(str(content).encode('utf-8', errors='surrogatepass'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def submit(self, entries):
+        if not entries:
+            return
+        key = self.payload_hash(entries)
+        # Re-inserting moves a repeated payload to the end of the burst
+        self._pending.pop(key, None)
+        self._pending[key] = entries
+        now = time.monotonic()
+        if self._burst_started is None:
+            self._burst_started = now
+        # QTimer.start() only takes whole milliseconds
+        waited_ms = int((now - self._burst_started) * 1000)
+        self._timer.start(max(0, min(CLIPBOARD_COALESCE_MS, CLIPBOARD_MAX_DELAY_MS - waited_ms)))
+
+    def flush(self):
+        self._timer.stop()
+        self._burst_started = None
+        if not self._pending:
+            return
+        batch = [entry for entries in self._pending.values() for entry in entries]
+        self._pending.clear()
+        self.batch_ready.emit(batch)
+
+# ─── Image Capture ────────────────────────────────────────────────────────────
+IMAGE_MAX_PENDING  = 2                   # full-size frames allowed to wait for the encoder
+IMAGE_MAX_BYTES    = 16 * 1024 * 1024    # re-encode lossy when a PNG is larger than this
+IMAGE_STORE_BUDGET = 256 * 1024 * 1024   # image bytes kept across shelf + history
+IMAGE_THUMB_SIZE   = 72
+IMAGE_RECENT       = 32                  # pixel hashes remembered for dedup
+
+def encode_image(image, fmt, quality=-1):
+    """QImage -> bytes via an in-memory QBuffer (safe off the GUI thread)."""
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.OpenModeFlag.WriteOnly)
+    ok = image.save(buf, fmt, quality)
+    buf.close()
+    return bytes(data) if ok else b''
+
+def image_thumbnail(image):
+    return encode_image(image.scaled(IMAGE_THUMB_SIZE, IMAGE_THUMB_SIZE,
+                                     Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation), 'PNG')
+
+class ImageCaptureService(QObject):
+    """
+    Turns clipboard images into blob-backed item dicts on a worker thread.
+    The GUI thread only grabs the QImage and queues it; hashing, PNG encoding
+    (lossy WebP/JPEG when the PNG exceeds IMAGE_MAX_BYTES), thumbnailing and
+    the blob writes happen here. An image whose pixels match a recent capture
+    is not encoded again. At most IMAGE_MAX_PENDING frames wait at a time —
+    older ones are dropped — so a run of screenshots can't pile up in memory.
+    """
+    image_ready = Signal(dict)   # item dict — emitted from the worker thread
+
+    def __init__(self, blob_store, parent=None):
+        super().__init__(parent)
+        self._store = blob_store
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._recent = {}            # pixel hash -> (item dict, monotonic time)
+        self._stopping = False
+        formats = {bytes(f).lower() for f in QImageWriter.supportedImageFormats()}
+        self._lossy = 'WEBP' if b'webp' in formats else 'JPG'
+        self._thread = threading.Thread(target=self._run, name="ImageCapture", daemon=True)
+        self._thread.start()
+
+    def submit(self, image):
+        if image.isNull():
+            return
+        with self._cond:
+            self._queue.append(image)
+            while len(self._queue) > IMAGE_MAX_PENDING:
+                self._queue.popleft()
+                log.warning("Image capture backlog full; dropped a pending image")
+            self._cond.notify()
+
+    def shutdown(self):
+        with self._cond:
+            self._stopping = True
+            self._queue.clear()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                image = self._queue.popleft()
+            try:
+                entry = self._capture(image)
+            except Exception as e:
+                log.exception(f"Image capture error: {e}")
+                entry = None
+            del image
+            if entry is not None:
+                self.image_ready.emit(entry)
+
+    def _capture(self, image):
+        if image.hasAlphaChannel():
+            image = image.convertToFormat(QImage.Format.Format_ARGB32)
+        else:
+            image = image.convertToFormat(QImage.Format.Format_RGB32)
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        h = hashlib.sha256()
+        h.update(f"{image.width()}x{image.height()}:".encode('ascii'))
+        h.update(bits)
+        pixel_hash = h.hexdigest()
+
+        now = time.monotonic()
+        cached = self._recent.pop(pixel_hash, None)
+        if cached is not None:
+            entry, seen = cached
+            if self._store.touch(entry['blob']) and self._store.touch(entry['thumb']):
+                self._recent[pixel_hash] = (entry, now)
+                # Clipboard managers often re-set the same image; only a
+                # deliberate re-copy should move the item back to the top
+                if (now - seen) * 1000 < CLIPBOARD_MAX_DELAY_MS:
+                    return None
+                return dict(entry)
+
+        data = encode_image(image, 'PNG')
+        if len(data) > IMAGE_MAX_BYTES:
+            data = encode_image(image, self._lossy, 85) or data
+        if not data or len(data) > IMAGE_MAX_BYTES:
+            log.warning(f"Skipping clipboard image {image.width()}x{image.height()}: "
+                        f"{len(data)} bytes after encoding")
+            return None
+        entry = {'type': ItemType.IMAGE,
+                 'content': f"Image {image.width()}×{image.height()}",
+                 'blob': self._store.put_bytes(data, compress=False),
+                 'thumb': self._store.put_bytes(image_thumbnail(image), compress=False),
+                 'size': len(data)}
+        self._recent[pixel_hash] = (entry, now)
+        while len(self._recent) > IMAGE_RECENT:
+            self._recent.pop(next(iter(self._recent)))
+        return dict(entry)
+
+# ─── Command Server ───────────────────────────────────────────────────────────
+# Frames are a 4-byte big-endian length followed by a UTF-8 JSON object.
+# Requests look like {"cmd": "SEARCH", "query": "foo"}; each gets exactly one
+# response frame, {"ok": true, ...} or {"ok": false, "error": "..."}, echoing
+# the request's "id" if it had one. A bare "SHOW" (no frame) is still accepted
+# from older launchers.
+IPC_MAX_FRAME     = 16 * 1024 * 1024
+IPC_DEFAULT_LIMIT = 50
+IPC_PROBE_MS      = 500   # how long a connect may take before a socket counts as dead
+_IPC_HEADER = struct.Struct('>I')
+
+def encode_frame(obj):
+    body = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    return _IPC_HEADER.pack(len(body)) + body
+
+class CommandServer(QObject):
+    """
+    Single-instance socket that also serves the JSON command protocol.
+    Reads are driven by readyRead, so a slow or silent client never blocks
+    the GUI thread, and every connected client keeps its own buffer.
+
+    The backend is the DropShelfWindow, or the DropShelfDaemon in --daemon
+    mode; both provide show_window(), add_items(), item_dicts(),
+    export_dicts(), memory_report(), classifier and clipboard_history.
+    """
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self._buffers = {}    # QLocalSocket -> bytearray
+        self.server = QLocalServer(self)
+        # Other local users must not be able to drive this instance
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        # With socket options set, listen() replaces an existing socket file
+        # rather than failing, so first make sure no live instance answers on it
+        if self._server_alive(APP_ID):
+            log.warning(f"Command server not started, another instance owns {APP_ID}")
+        elif not self.server.listen(APP_ID):
+            # A crashed instance can leave its socket file behind
+            QLocalServer.removeServer(APP_ID)
+            if not self.server.listen(APP_ID):
+                log.warning(f"Command server listen failed: {self.server.errorString()}")
+        self.server.newConnection.connect(self._on_new_connection)
+        self._commands = {
+            'SHOW': self._cmd_show, 'ADD': self._cmd_add, 'ADD_BATCH': self._cmd_add_batch,
+            'LIST': self._cmd_list, 'SEARCH': self._cmd_search,
+            'EXPORT': self._cmd_export, 'STATS': self._cmd_stats,
+            'TRACE': self._cmd_trace, 'MEMORY': self._cmd_memory,
+            'RECORD': self._cmd_record,
+        }
+
+    @staticmethod
+    def _server_alive(name):
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        alive = probe.waitForConnected(IPC_PROBE_MS)
+        probe.abort()
+        return alive
+
+    def close(self):
+        for client in list(self._buffers):
+            client.abort()
+        self._buffers.clear()
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            client = self.server.nextPendingConnection()
+            self._buffers[client] = bytearray()
+            client.readyRead.connect(lambda c=client: self._on_ready_read(c))
+            client.disconnected.connect(lambda c=client: self._on_disconnected(c))
+            if client.bytesAvailable():
+                self._on_ready_read(client)
+
+    def _on_disconnected(self, client):
+        self._buffers.pop(client, None)
+        client.deleteLater()
+
+    def _on_ready_read(self, client):
+        try:
+            buf = self._buffers.get(client)
+            if buf is None:
+                return
+            buf += client.readAll().data()
+            if buf[:4] == b'SHOW':
+                # Legacy unframed request from an older second instance
+                buf.clear()
+                self.backend.show_window()
+                return
+            while len(buf) >= _IPC_HEADER.size:
+                (length,) = _IPC_HEADER.unpack_from(buf)
+                if length > IPC_MAX_FRAME:
+                    log.warning(f"Dropping command client: {length}-byte frame")
+                    self._buffers.pop(client, None)
+                    client.abort()
+                    return
+                if len(buf) < _IPC_HEADER.size + length:
+                    return   # wait for the rest of the frame
+                body = bytes(buf[_IPC_HEADER.size:_IPC_HEADER.size + length])
+                del buf[:_IPC_HEADER.size + length]
+                client.write(encode_frame(self._dispatch(body)))
+        except Exception as e:
+            log.exception(f"Command client error: {e}")
+
+    def _dispatch(self, body):
+        request_id = None
+        try:
+            request = json.loads(body.decode('utf-8'))
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            request_id = request.get('id')
+            handler = self._commands.get(str(request.get('cmd', '')).upper())
+            if handler is None:
+                raise ValueError(f"unknown command: {request.get('cmd')!r}")
+            response = {'ok': True}
+            response.update(handler(request))
+        except Exception as e:
+            log.warning(f"Command failed: {e}")
+            response = {'ok': False, 'error': str(e)}
+        if request_id is not None:
+            response['id'] = request_id
+        return response
+
+    def _item_entries(self, request):
+        """Normalise one ADD payload into item dicts; untyped content is classified."""
+        content = request.get('content')
+        if not isinstance(content, str) or not content.strip():
+            raise ValueError("content must be a non-empty string")
+        extra = {'tags': list(request.get('tags') or []),
+                 'is_favorite': bool(request.get('favorite', False))}
+        if request.get('type'):
+            dtype = ItemType(request['type'])
+            if dtype == ItemType.IMAGE:
+                # An image item needs its pixels in the blob store, not a string
+                raise ValueError("type must be text, url or file; images can't be added as text")
+            return [dict(extra, type=dtype, content=content)]
+        return [dict(extra, type=dtype, content=value)
+                for dtype, value in self.backend.classifier.classify(content)]
+
+    @staticmethod
+    def _page(request, items):
+        limit = int(request.get('limit', IPC_DEFAULT_LIMIT))
+        offset = int(request.get('offset', 0))
+        return {'total': len(items), 'items': items[offset:offset + limit]}
+
+    def _cmd_show(self, request):
+        self.backend.show_window()
+        return {}
+
+    def _cmd_add(self, request):
+        return {'added': len(self.backend.add_items(self._item_entries(request)))}
+
+    def _cmd_add_batch(self, request):
+        items = request.get('items')
+        if not isinstance(items, list):
+            raise ValueError("items must be a list")
+        batch = [entry for item in items for entry in self._item_entries(item)]
+        return {'added': len(self.backend.add_items(batch))}
+
+    def _page_tiers(self, request, items, dtype=None, query=None):
+        """_page over the in-memory matches followed by the archived ones."""
+        reply = self._page(request, items)
+        archive = self.backend.archive
+        reply['total'] += archive.count(dtype, query)
+        wanted = int(request.get('limit', IPC_DEFAULT_LIMIT)) - len(reply['items'])
+        if wanted > 0:
+            skip = max(0, int(request.get('offset', 0)) - len(items))
+            for entry in archive.page(wanted, dtype, query, offset=skip):
+                del entry['archive_id']
+                entry['archived'] = True
+                reply['items'].append(entry)
+        return reply
+
+    def _cmd_list(self, request):
+        items = self.backend.item_dicts()
+        dtype = None
+        if request.get('type'):
+            dtype = ItemType(request['type']).value
+            items = [d for d in items if d['type'] == dtype]
+        if request.get('favorites'):
+            # Archived items are never favorites
+            return self._page(request, [d for d in items if d.get('is_favorite')])
+        return self._page_tiers(request, items, dtype)
+
+    def _cmd_search(self, request):
+        query = str(request.get('query', '')).lower()
+        if not query:
+            raise ValueError("query must be a non-empty string")
+        blob_store = self.backend.blob_store
+        items = [d for d in self.backend.item_dicts()
+                 if query in entry_search_text(blob_store, d)
+                 or any(query in t.lower() for t in d.get('tags') or [])]
+        return self._page_tiers(request, items, query=query)
+
+    def _cmd_export(self, request):
+        return {'items': self.backend.export_dicts()}
+
+    def _cmd_stats(self, request):
+        return dict(self.backend.usage_stats(),
+                    history=len(self.backend.clipboard_history),
+                    event_loop=watchdog.summary())
+
+    def _cmd_trace(self, request):
+        action = str(request.get('action', 'status')).lower()
+        if action == 'start':
+            tracer.start()
+        elif action == 'stop':
+            tracer.stop()
+        elif action == 'export':
+            return {'trace': tracer.export_chrome()}
+        elif action != 'status':
+            raise ValueError(f"unknown trace action: {action!r}")
+        return {'enabled': tracer.enabled, 'spans': len(tracer)}
+
+    def _cmd_record(self, request):
+        action = str(request.get('action', 'status')).lower()
+        if action == 'start':
+            clipboard_recorder.start(request.get('path') or None)
+        elif action == 'stop':
+            clipboard_recorder.stop()
+        elif action != 'status':
+            raise ValueError(f"unknown record action: {action!r}")
+        return {'recording': clipboard_recorder.active, 'path': clipboard_recorder.path,
+                'events': clipboard_recorder.events}
+
+    def _cmd_memory(self, request):
+        action = str(request.get('action', 'report')).lower()
+        if action == 'start':
+            memory_profiler.start()
+        elif action == 'stop':
+            memory_profiler.stop()
+        elif action == 'snapshot':
+            return {'snapshot': memory_profiler.snapshot(int(request.get('limit', MEMORY_TOP_LIMIT)))}
+        elif action != 'report':
+            raise ValueError(f"unknown memory action: {action!r}")
+        return {'report': self.backend.memory_report(), 'tracing': memory_profiler.tracing}
+
 # ─── Main Window ──────────────────────────────────────────────────────────────
 class DropShelfWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, host=None):
         super().__init__()
+        # In --daemon mode the DropShelfDaemon owns the socket, hotkey and
+        # blob store, and destroys this window again when it is hidden.
+        self.host = host
         self.setWindowTitle("DropShelf")
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint |
                             Qt.WindowType.WindowStaysOnTopHint)
@@ -1468,29 +4432,169 @@ class DropShelfWindow(QMainWindow):
         self.current_theme       = "dark"
         self.close_to_tray       = True
         self.max_history         = MAX_HISTORY
-        self.clipboard_history   = deque(maxlen=MAX_HISTORY)
         self.window_geometry     = None
         self._templates_dialog   = None
         # Guards & timers to prevent crashes during extended use
         self._clipboard_guard    = False   # prevents clipboard feedback loops
         self._loading            = False   # suppresses saves during load_favorites
         self._save_timer         = None    # debounce timer for save_favorites
-
+        self.fetch_engine        = None    # created in _start_fetch_engine, after first paint
+        self._pending_load       = []      # favorites still to be built by _load_next_chunk
+        self._load_index         = None    # dedup index kept across those chunks
+        self._load_tail          = None    # lowest widget built so far by the staged load
+        self._chunk_size         = STARTUP_FIRST_ITEMS
+        self._save_after_load    = False   # a save was requested while _pending_load was non-empty
+        self._startup_steps      = deque()
+        self._startup_phases     = []      # (phase, ms) for the startup report
+        self._phase_started      = time.perf_counter()
+        self.blob_store          = host.blob_store if host else BlobStore()
+        self.classifier          = host.classifier if host else ContentClassifier()
+        self.stats               = ShelfStats()
+        self.archive             = host.archive if host else ShelfArchive(blob_store=self.blob_store)
+        self.clipboard_history   = host.history if host else ClipboardHistory(self.blob_store)
+        self._archived_widgets   = deque()   # paged-in archive rows, in load order
+        self._archive_view       = None      # (tab, filter, query) they were paged in for
+        self._archive_hidden     = 0         # newer archive rows dropped to bound memory
+        self._archive_done       = True      # no more rows for the current view
+        self._history_rows       = deque()   # History view rows, newest first
+        self._history_view       = None      # (since, until) they were paged in for
+        self._history_hidden     = 0         # newer rows dropped to bound memory
+        self._history_done       = True      # no more rows for the current range
+        self.command_server      = None
+        self._released           = False   # release() has run
+        self.title_service       = TitleFetchService(self.fetch_engine, parent=self)
+        self.favicon_service     = FaviconService(self.fetch_engine, parent=self)
+
+        # Only what the first frame needs is built here; everything else is
+        # queued and run one step per event-loop pass once the window is up.
         try:
             self.load_settings()
-            self.clipboard_history   = deque(maxlen=max(1, self.max_history))  # Minimum 1 to avoid issues
-            self.load_history()
+            self._mark_phase("settings")
             self._init_ui()
-            self.setup_tray_icon()
-            self.setup_hotkey()
+            self._mark_phase("ui")
             self.setup_local_server()
             self.load_favorites()
-            self.setup_clipboard_monitor()
+            self._mark_phase("first items")
             self.setup_shortcuts()
             self.restore_window_geometry()
             self._update_history_tab_visibility()
         except Exception as e:
             log.exception(f"Initialization error: {e}")
+        self._startup_steps.extend([
+            (None, self._load_next_chunk),
+            ("history", self.load_history),
+            ("clipboard monitor", self.setup_clipboard_monitor),
+        ])
+        if host is None:
+            self._startup_steps.extend([("tray", self.setup_tray_icon),
+                                        ("hotkey", self.setup_hotkey)])
+        self._startup_steps.extend([
+            ("fetch engine", self._start_fetch_engine),
+            (None, self._start_blob_gc),
+        ])
+        QTimer.singleShot(0, self._run_startup_step)
+
+    # ── Staged startup ────────────────────────────────────────────────────────
+    def _mark_phase(self, name):
+        now = time.perf_counter()
+        self._add_phase(name, (now - self._phase_started) * 1000)
+        self._phase_started = now
+
+    def _add_phase(self, name, ms):
+        if self._startup_phases and self._startup_phases[-1][0] == name:
+            ms += self._startup_phases.pop()[1]
+        self._startup_phases.append((name, ms))
+
+    def _run_startup_step(self):
+        """Run one deferred startup step, then yield to the event loop."""
+        if not self._startup_steps:
+            phases = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self._startup_phases)
+            log.info(f"Startup: imports {IMPORT_MS:.0f} ms; {phases}")
+            return
+        name, step = self._startup_steps.popleft()
+        self._phase_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            log.exception(f"Startup step error: {e}")
+        if name:
+            self._mark_phase(name)
+        QTimer.singleShot(0, self._run_startup_step)
+
+    def _load_next_chunk(self):
+        """
+        Build the next slice of favorites below the ones already shown. Each
+        chunk costs only its own items: the dedup index lives across chunks,
+        and pruning and the visibility pass run once after the last one.
+        """
+        started = time.perf_counter()
+        chunk = self._pending_load[:self._chunk_size]
+        del self._pending_load[:self._chunk_size]
+        self._loading = True
+        try:
+            if self._load_index is None:
+                self._load_index = {w.dedup_key: w for w in self._get_all_items()}
+            batch = [self._store_out_of_line(e) for e in reversed(chunk)]
+            self.archive.take({archive_key(e['type'], e.get('blob') or e['content'])
+                               for e in batch})
+            # Showing a widget activates its parent layout, which lays out
+            # every item on the shelf; disabled, the layout runs once per chunk
+            self.scroll_layout.setEnabled(False)
+            try:
+                added, _ = self._insert_entries(batch, self._load_position(), self._load_index)
+                for item in added:
+                    item.setVisible(self._should_show_item(item))
+            finally:
+                self.scroll_layout.setEnabled(True)
+                self.scroll_layout.activate()
+            if added:
+                self._load_tail = added[0]   # inserted first, so lowest
+        except Exception as e:
+            log.exception(f"Staged load error: {e}")
+        finally:
+            self._loading = False
+        elapsed = (time.perf_counter() - started) * 1000
+        self._add_phase("remaining items", elapsed)
+        if chunk:
+            # Size the next step so each one stays around STARTUP_STEP_MS
+            self._chunk_size = max(1, int(STARTUP_STEP_MS * len(chunk) / max(elapsed, 1)))
+        if self._pending_load:
+            self._startup_steps.appendleft((None, self._load_next_chunk))
+        else:
+            self._load_index = self._load_tail = None
+            self._prune_shelf()
+            self.refresh_visibility()
+            self._prioritize_visible_titles()
+            self._maybe_page_archive()
+            if self._save_after_load:
+                self._save_after_load = False
+                self._schedule_save()
+
+    def _load_position(self):
+        """Layout index just below the favorites the staged load has built."""
+        at = self.scroll_layout.indexOf(self._load_tail) if self._load_tail is not None else -1
+        return at + 1 if at >= 0 else len(self._get_all_items())
+
+    def _finish_staged_load(self):
+        """Build any favorites still pending (before a save or quit)."""
+        while self._pending_load:
+            self._load_next_chunk()
+
+    def _start_fetch_engine(self):
+        if not HAS_URL_FETCH:
+            return
+        try:
+            self.fetch_engine = AsyncFetchEngine()
+        except ImportError:
+            log.warning("asyncio/ssl unavailable; URL titles and favicons disabled")
+            return
+        self.title_service.attach_engine(self.fetch_engine)
+        self.favicon_service.attach_engine(self.fetch_engine)
+
+    def _start_blob_gc(self):
+        self._blob_gc_timer = QTimer(self)
+        self._blob_gc_timer.timeout.connect(self._collect_blobs)
+        self._blob_gc_timer.start(BLOB_GC_INTERVAL_MS)
 
     # ── UI Construction ───────────────────────────────────────────────────────
     def _init_ui(self):
@@ -1552,7 +4656,7 @@ class DropShelfWindow(QMainWindow):
             ctrl_row.setAlignment(Qt.AlignmentFlag.AlignVCenter)
             
             self.filter_combo = QComboBox()
-            self.filter_combo.addItems(["All Types", "Files", "URLs", "Text"])
+            self.filter_combo.addItems(["All Types", "Files", "URLs", "Text", "Images"])
             self.filter_combo.setFixedHeight(32)
             self.filter_combo.currentIndexChanged.connect(self._on_filter_changed)
             ctrl_row.addWidget(QLabel("Filter:"))
@@ -1636,12 +4740,40 @@ class DropShelfWindow(QMainWindow):
             self.scroll_layout.setContentsMargins(2, 4, 2, 4)
             self.scroll_content.setLayout(self.scroll_layout)
             self.scroll_area.setWidget(self.scroll_content)
+            self.scroll_area.verticalScrollBar().valueChanged.connect(
+                lambda _: self._prioritize_visible_titles())
+            self.scroll_area.verticalScrollBar().valueChanged.connect(
+                lambda _: self._maybe_page_archive())
+            self.scroll_area.verticalScrollBar().rangeChanged.connect(
+                lambda *_: self._maybe_page_archive())
             self.empty_label = QLabel("Drop files, text, or URLs here\nor use clipboard monitoring")
             self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.scroll_layout.addWidget(self.empty_label)
+            self.archive_label = QLabel()
+            self.archive_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.archive_label.linkActivated.connect(lambda _: self._reset_archive_view())
+            self.archive_label.setVisible(False)
+            self.scroll_layout.addWidget(self.archive_label)
             self.scroll_layout.addStretch()
             main_layout.addWidget(self.scroll_area)
 
+            # History date range
+            self.history_bar = QWidget()
+            history_bar_row = QHBoxLayout()
+            history_bar_row.setContentsMargins(0, 0, 0, 0)
+            history_bar_row.setSpacing(6)
+            self.history_range_combo = QComboBox()
+            self.history_range_combo.addItems([label for label, _, _ in history_ranges()])
+            self.history_range_combo.setFixedHeight(32)
+            self.history_range_combo.currentIndexChanged.connect(
+                lambda _: self._rebuild_history_display())
+            history_bar_row.addWidget(QLabel("Show:"))
+            history_bar_row.addWidget(self.history_range_combo)
+            history_bar_row.addStretch()
+            self.history_bar.setLayout(history_bar_row)
+            self.history_bar.setVisible(False)
+            main_layout.addWidget(self.history_bar)
+
             # History scroll area
             self.history_area = QScrollArea()
             self.history_area.setWidgetResizable(True)
@@ -1655,9 +4787,18 @@ class DropShelfWindow(QMainWindow):
             self.history_layout.setContentsMargins(0, 0, 0, 0)
             self.history_content.setLayout(self.history_layout)
             self.history_area.setWidget(self.history_content)
+            self.history_area.verticalScrollBar().valueChanged.connect(
+                lambda _: self._maybe_page_history())
+            self.history_area.verticalScrollBar().rangeChanged.connect(
+                lambda *_: self._maybe_page_history())
             self.history_empty_label = QLabel("No clipboard history yet.")
             self.history_empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.history_layout.addWidget(self.history_empty_label)
+            self.history_label = QLabel()
+            self.history_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.history_label.linkActivated.connect(lambda _: self._rebuild_history_display())
+            self.history_label.setVisible(False)
+            self.history_layout.addWidget(self.history_label)
             self.history_layout.addStretch()
             self.history_area.setVisible(False)
             main_layout.addWidget(self.history_area)
@@ -1746,7 +4887,10 @@ class DropShelfWindow(QMainWindow):
 
             self.title_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {t['text_label']};")
             self.empty_label.setStyleSheet(f"color: {t['text_dim']}; font-size: 14px; padding: 40px;")
+            self.archive_label.setStyleSheet(f"color: {t['text_dim']}; font-size: 11px; padding: 8px;")
+            self._update_archive_label()
             self.history_empty_label.setStyleSheet(f"color: {t['text_dim']}; font-size: 13px; padding: 40px;")
+            self.history_label.setStyleSheet(f"color: {t['text_dim']}; font-size: 11px; padding: 8px;")
 
             self.clear_btn.setStyleSheet(f"""
                 QPushButton {{ background: {t['danger']}; color: white; border: none;
@@ -1771,7 +4915,8 @@ class DropShelfWindow(QMainWindow):
             # Refresh all item widgets
             for item in self._get_all_items():
                 item.refresh_theme()
-            self._rebuild_history_display()
+            if self.current_tab == "history":
+                self._rebuild_history_display()
         except Exception as e:
             log.exception(f"Apply theme error: {e}")
 
@@ -1785,6 +4930,7 @@ class DropShelfWindow(QMainWindow):
             self.current_tab = tab
             self._update_tab_styles()
             self.scroll_area.setVisible(tab != "history")
+            self.history_bar.setVisible(tab == "history")
             self.history_area.setVisible(tab == "history")
             if tab == "history":
                 self._rebuild_history_display()
@@ -1811,6 +4957,7 @@ class DropShelfWindow(QMainWindow):
             log.exception(f"Update tab styles error: {e}")
 
     # ── Visibility & Filtering ────────────────────────────────────────────────
+    @traced('shelf.refresh_visibility')
     def refresh_visibility(self):
         try:
             has_items = False
@@ -1820,6 +4967,7 @@ class DropShelfWindow(QMainWindow):
                 if visible:
                     has_items = True
             self.empty_label.setVisible(not has_items)
+            self._sync_archive_view()
         except Exception as e:
             log.exception(f"Refresh visibility error: {e}")
 
@@ -1838,10 +4986,12 @@ class DropShelfWindow(QMainWindow):
                 return False
             if self.current_filter == "text" and item.data_type != ItemType.TEXT:
                 return False
+            if self.current_filter == "image" and item.data_type != ItemType.IMAGE:
+                return False
 
             # Search
             if self.search_query:
-                content_match = self.search_query.lower() in str(item.content).lower()
+                content_match = item.matches(self.search_query.lower())
                 tag_match = any(self.search_query.lower() in tag.lower() for tag in item.tags)
                 if not (content_match or tag_match):
                     return False
@@ -1853,7 +5003,7 @@ class DropShelfWindow(QMainWindow):
 
     def _on_filter_changed(self, index):
         try:
-            filters = ["all", "file", "url", "text"]
+            filters = ["all", "file", "url", "text", "image"]
             self.current_filter = filters[index]
             self.refresh_visibility()
         except Exception as e:
@@ -1867,10 +5017,11 @@ class DropShelfWindow(QMainWindow):
         except Exception as e:
             log.exception(f"Sort changed error: {e}")
 
+    @traced('shelf.sort')
     def _sort_items(self):
         try:
-            # Get all items
-            items = self._get_all_items()
+            # Shelf items only; archived rows stay below them, newest first
+            items = [w for w in self._get_all_items() if w.archive_id is None]
             
             # Remove them from layout (but don't delete them!)
             for item in items:
@@ -1882,13 +5033,15 @@ class DropShelfWindow(QMainWindow):
             elif self.current_sort == "oldest":
                 items.sort(key=lambda x: x.date_added, reverse=self.sort_ascending)
             elif self.current_sort == "name":
-                items.sort(key=lambda x: str(x.content).lower(), reverse=self.sort_ascending)
+                items.sort(key=functools.cmp_to_key(compare_names), reverse=self.sort_ascending)
             elif self.current_sort == "type":
                 items.sort(key=lambda x: x.data_type.value, reverse=self.sort_ascending)
             elif self.current_sort == "size":
                 def get_size(item):
                     if item.data_type == ItemType.FILE and os.path.exists(item.content):
                         return os.path.getsize(item.content)
+                    if item.data_type == ItemType.IMAGE:
+                        return item.content_size
                     return 0
                 items.sort(key=get_size, reverse=not self.sort_ascending)
             elif self.current_sort == "used":
@@ -1901,9 +5054,28 @@ class DropShelfWindow(QMainWindow):
             
             # Now apply filters to hide items that don't match
             self.refresh_visibility()
+            self._prioritize_visible_titles()
         except Exception as e:
             log.exception(f"Sort items error: {e}")
 
+    def _prioritize_visible_titles(self):
+        """Move title fetches for the rows currently on screen to the front of the queue."""
+        try:
+            # Geometry is stale until the layout has run after a refilter or sort
+            self.scroll_layout.activate()
+            viewport = self.scroll_area.viewport()
+            visible = QRect(self.scroll_content.mapFrom(viewport, QPoint(0, 0)), viewport.size())
+            for item in self._get_all_items():
+                if item.isHidden():
+                    continue
+                geometry = item.geometry()
+                if geometry.top() > visible.bottom():
+                    break   # the layout is in order, so nothing further down is on screen
+                if item.data_type == ItemType.URL and geometry.intersects(visible):
+                    self.title_service.prioritize(str(item.content))
+        except Exception as e:
+            log.exception(f"Prioritize titles error: {e}")
+
     def _toggle_sort_direction(self):
         """Toggle sort direction between ascending and descending"""
         try:
@@ -1917,100 +5089,176 @@ class DropShelfWindow(QMainWindow):
         try:
             self.search_query = text.strip()
             self.refresh_visibility()
+            self._prioritize_visible_titles()
         except Exception as e:
             log.exception(f"Search changed error: {e}")
 
     # ── History ───────────────────────────────────────────────────────────────
+    def _history_row(self, entry, t):
+        """A History view row for one entry; history_key is its paging position."""
+        row = QFrame()
+        row.setStyleSheet(f"""
+            QFrame {{ background: {t['bg_card']}; border: 1px solid {t['border']}; border-radius: 6px; }}
+            QFrame:hover {{ background: {t['bg_input']}; }}
+        """)
+        row_layout = QHBoxLayout()
+        row_layout.setContentsMargins(8, 4, 8, 4)
+
+        type_lbl = QLabel(entry["type"].upper())
+        type_lbl.setFixedWidth(50)
+        type_lbl.setStyleSheet(f"color: {t['accent']}; font-size: 10px; font-weight: bold;")
+        row_layout.addWidget(type_lbl)
+
+        content_str = str(entry["content"])
+        if entry["type"] == "file":
+            content_str = os.path.basename(content_str)
+        content_lbl = QLabel(content_str[:60] + ("…" if len(content_str) > 60 else ""))
+        content_lbl.setStyleSheet(f"color: {t['text']}; font-size: 11px;")
+        row_layout.addWidget(content_lbl, 1)
+
+        time_str = entry.get("time", "")[:16].replace("T", " ")
+        time_lbl = QLabel(time_str)
+        time_lbl.setStyleSheet(f"color: {t['text_dim']}; font-size: 10px;")
+        row_layout.addWidget(time_lbl)
+
+        add_btn = QPushButton("+")
+        add_btn.setFixedSize(22, 22)
+        add_btn.setToolTip("Add to shelf")
+        add_btn.setStyleSheet(f"background: {t['accent']}; color: white; border: none; border-radius: 11px; font-size: 14px;")
+        add_btn.clicked.connect(lambda _, e=entry: self.add_items(
+            [{k: e[k] for k in ("type", "content", "blob", "size", "thumb") if k in e}]))
+        row_layout.addWidget(add_btn)
+
+        row.setLayout(row_layout)
+        row.setFixedHeight(40)
+        row.history_key = (entry['time'], entry['history_id'])
+        return row
+
+    @traced('history.rebuild')
     def _rebuild_history_display(self):
+        """Start the History view over from the newest entry in the chosen date range."""
         try:
-            # Clear history display
-            while self.history_layout.count() > 0:
-                item = self.history_layout.takeAt(0)
-                if item.widget():
-                    item.widget().deleteLater()
+            self._drop_history_rows(len(self._history_rows))
+            self._history_hidden = 0
+            _, since, until = history_ranges()[max(0, self.history_range_combo.currentIndex())]
+            self._history_view = (since, until)
+            self._history_done = self.max_history == 0 or not len(self.clipboard_history)
+            if not self._history_done:
+                self._page_history()
+            self._update_history_label()
+            self.history_area.verticalScrollBar().setValue(0)
+        except Exception as e:
+            log.exception(f"Rebuild history error: {e}")
 
-            if not self.clipboard_history or self.max_history == 0:
-                self.history_empty_label = QLabel("No clipboard history yet." if self.max_history > 0 else "History is disabled.")
-                self.history_empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                t = THEMES[self.current_theme]
-                self.history_empty_label.setStyleSheet(f"color: {t['text_dim']}; font-size: 13px; padding: 40px;")
-                self.history_layout.addWidget(self.history_empty_label)
-                self.history_layout.addStretch()
-                return
+    def _drop_history_rows(self, count, newest=True):
+        """Destroy `count` rows from the top (or the bottom) of the History view."""
+        for _ in range(count):
+            row = self._history_rows.popleft() if newest else self._history_rows.pop()
+            self.history_layout.removeWidget(row)
+            row.deleteLater()
 
-            t = THEMES[self.current_theme]
-            for entry in reversed(list(self.clipboard_history)):
-                row = QFrame()
-                row.setStyleSheet(f"""
-                    QFrame {{ background: {t['bg_card']}; border: 1px solid {t['border']}; border-radius: 6px; }}
-                    QFrame:hover {{ background: {t['bg_input']}; }}
-                """)
-                row_layout = QHBoxLayout()
-                row_layout.setContentsMargins(8, 4, 8, 4)
-
-                type_lbl = QLabel(entry["type"].upper())
-                type_lbl.setFixedWidth(50)
-                type_lbl.setStyleSheet(f"color: {t['accent']}; font-size: 10px; font-weight: bold;")
-                row_layout.addWidget(type_lbl)
-
-                content_str = str(entry["content"])
-                if entry["type"] == "file":
-                    content_str = os.path.basename(content_str)
-                content_lbl = QLabel(content_str[:60] + ("…" if len(content_str) > 60 else ""))
-                content_lbl.setStyleSheet(f"color: {t['text']}; font-size: 11px;")
-                row_layout.addWidget(content_lbl, 1)
-
-                time_str = entry.get("time", "")[:16].replace("T", " ")
-                time_lbl = QLabel(time_str)
-                time_lbl.setStyleSheet(f"color: {t['text_dim']}; font-size: 10px;")
-                row_layout.addWidget(time_lbl)
-
-                add_btn = QPushButton("+")
-                add_btn.setFixedSize(22, 22)
-                add_btn.setToolTip("Add to shelf")
-                add_btn.setStyleSheet(f"background: {t['accent']}; color: white; border: none; border-radius: 11px; font-size: 14px;")
-                add_btn.clicked.connect(lambda _, e=entry: self.add_item(e["type"], e["content"]))
-                row_layout.addWidget(add_btn)
-
-                row.setLayout(row_layout)
-                row.setFixedHeight(40)
-                self.history_layout.addWidget(row)
+    def _maybe_page_history(self):
+        """Page in the next history rows once the view is scrolled near its end."""
+        try:
+            if self._history_done or self._history_view is None or self.current_tab != "history":
+                return
+            bar = self.history_area.verticalScrollBar()
+            if bar.value() >= bar.maximum() - HISTORY_PREFETCH_PX:
+                self._page_history()
+        except Exception as e:
+            log.exception(f"History paging error: {e}")
+
+    @traced('history.page')
+    def _page_history(self):
+        since, until = self._history_view
+        last = self._history_rows[-1] if self._history_rows else None
+        entries = self.clipboard_history.page(HISTORY_PAGE_ROWS, since, until,
+                                              after=last.history_key if last else None)
+        self._history_done = len(entries) < HISTORY_PAGE_ROWS
+        t = THEMES[self.current_theme]
+        bar = self.history_area.verticalScrollBar()
+        self.history_content.setUpdatesEnabled(False)
+        try:
+            position = self.history_layout.indexOf(self.history_label)
+            for entry in entries:
+                row = self._history_row(entry, t)
+                self.history_layout.insertWidget(position, row)
+                position += 1
+                self._history_rows.append(row)
+            overflow = len(self._history_rows) - HISTORY_MAX_ROWS
+            if overflow > 0:
+                # Keep the rows on screen where they are while the top page goes
+                shift = overflow * (self._history_rows[0].height() + self.history_layout.spacing())
+                self._drop_history_rows(overflow)
+                self._history_hidden += overflow
+                self.history_layout.activate()
+                bar.setValue(bar.value() - shift)
+        finally:
+            self.history_content.setUpdatesEnabled(True)
+        self._update_history_label()
 
-            self.history_layout.addStretch()
+    def _show_new_history(self, added):
+        """Put fresh captures at the top of the History view if it is showing the newest rows."""
+        try:
+            since, until = self._history_view or (None, None)
+            if self._history_view is not None and not self._history_hidden and until is None:
+                t = THEMES[self.current_theme]
+                position = self.history_layout.indexOf(self.history_empty_label) + 1
+                for entry in added:   # oldest first, so each lands above the previous one
+                    row = self._history_row(entry, t)
+                    self.history_layout.insertWidget(position, row)
+                    self._history_rows.appendleft(row)
+                # The size limit may have trimmed rows still on screen
+                surplus = len(self._history_rows) - len(self.clipboard_history)
+                if surplus > 0:
+                    self._drop_history_rows(surplus, newest=False)
+                overflow = len(self._history_rows) - HISTORY_MAX_ROWS
+                if overflow > 0:
+                    self._drop_history_rows(overflow, newest=False)
+                    self._history_done = False
+            self._update_history_label()
         except Exception as e:
-            log.exception(f"Rebuild history error: {e}")
+            log.exception(f"History update error: {e}")
+
+    def _update_history_label(self):
+        shown = len(self._history_rows)
+        self.history_empty_label.setVisible(not shown)
+        if not shown:
+            self.history_empty_label.setText(
+                "History is disabled." if self.max_history == 0 else
+                "No clipboard history yet." if not len(self.clipboard_history) else
+                "Nothing was copied in this range.")
+            self.history_label.setVisible(False)
+            return
+        since, until = self._history_view or (None, None)
+        accent = THEMES[self.current_theme]['accent']
+        parts = []
+        if self._history_hidden:
+            parts.append(f'<a href="top" style="color: {accent};">↑ Back to newest</a>')
+        parts.append(f"{shown} of {self.clipboard_history.count(since, until)} entries loaded")
+        if not self._history_done:
+            parts.append("scroll for more")
+        self.history_label.setText(" • ".join(parts))
+        self.history_label.setVisible(True)
 
     def load_history(self):
-        if os.path.exists(HISTORY_FILE):
-            try:
-                with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                for entry in data:
-                    self.clipboard_history.append(entry)
-            except Exception:
-                log.exception("History load error")
+        """Apply the size limit, which may have changed while closed, and seed the stats."""
+        try:
+            self.clipboard_history.trim(self.max_history)
+            self.stats.seed(self.clipboard_history.entries())
+            self.blob_store.set_references('history', self.clipboard_history.blob_keys())
+        except Exception:
+            log.exception("History load error")
 
+    @traced('history.save')
     def save_history(self):
-        """Save history with atomic write to prevent corruption"""
+        """Publish the history's blob references and save the capture counts.
+        Entries themselves are written to history.db as they are added."""
         try:
-            if self.max_history == 0:
-                return
-            
-            # Atomic write
-            temp_file = HISTORY_FILE + '.tmp'
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(list(self.clipboard_history), f, indent=2)
-            
-            if os.path.exists(HISTORY_FILE):
-                os.remove(HISTORY_FILE)
-            os.rename(temp_file, HISTORY_FILE)
+            self.blob_store.set_references('history', self.clipboard_history.blob_keys())
+            self.stats.save()
         except Exception as e:
-            log.exception("History save error")
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except:
-                pass
+            log.exception(f"History save error: {e}")
 
     # ── Persistence (debounced) ───────────────────────────────────────────────
     def _schedule_save(self):
@@ -2034,6 +5282,10 @@ class DropShelfWindow(QMainWindow):
     # ── Clipboard Monitor ─────────────────────────────────────────────────────
     def setup_clipboard_monitor(self):
         try:
+            self.ingest = ClipboardIngest(self)
+            self.ingest.batch_ready.connect(self._apply_clipboard_batch)
+            self.image_capture = ImageCaptureService(self.blob_store, self)
+            self.image_capture.image_ready.connect(self._apply_clipboard_image)
             self.clipboard = QApplication.clipboard()
             self.clipboard.dataChanged.connect(self._on_clipboard_change)
         except Exception as e:
@@ -2047,40 +5299,103 @@ class DropShelfWindow(QMainWindow):
             return
         self._clipboard_guard = True
         try:
-            mime = self.clipboard.mimeData()
-            if mime.hasUrls():
-                for url in mime.urls():
-                    if url.isLocalFile():
-                        path = url.toLocalFile()
-                        if self.max_history > 0:
-                            self._add_to_history("file", path)
-                        self.add_item(ItemType.FILE, path)
-                return
-            if mime.hasText():
-                text = mime.text().strip()
-                if text:
-                    is_url = text.startswith(('http://', 'https://', 'www.'))
-                    t = ItemType.URL if is_url else ItemType.TEXT
-                    if self.max_history > 0:
-                        self._add_to_history(t.value, text)
-                    self.add_item(t, text)
+            # Only snapshot here; the ingest queue coalesces bursts and hands
+            # the survivors to _apply_clipboard_batch in one go.
+            snapshot_clipboard(self.clipboard, self.classifier,
+                               self.ingest, self.image_capture)
         except Exception as e:
             log.exception(f"Clipboard change error: {e}")
         finally:
             self._clipboard_guard = False
 
-    def _add_to_history(self, dtype, content):
+    def _apply_clipboard_batch(self, entries):
         try:
-            if self.max_history == 0:
+            # Externalise large text once, so history and shelf share the blob
+            stored = [self._store_out_of_line({'type': dtype, 'content': content})
+                      for dtype, content in entries]
+            if self.max_history > 0:
+                self._add_to_history_batch(stored)
+            self.add_items(stored)
+        except Exception as e:
+            log.exception(f"Clipboard batch error: {e}")
+
+    def _apply_clipboard_image(self, entry):
+        try:
+            if self.max_history > 0:
+                self._add_to_history_batch([entry])
+            self.add_items([entry])
+            self._enforce_image_budget()
+        except Exception as e:
+            log.exception(f"Clipboard image error: {e}")
+
+    def _enforce_image_budget(self):
+        """Drop the oldest non-favourite images once shelf + history exceed IMAGE_STORE_BUDGET."""
+        try:
+            sizes = {}
+            candidates = []   # (timestamp, kind, ref, blob key)
+            for w in self._get_all_items():
+                if w.data_type == ItemType.IMAGE and w.archive_id is None:
+                    sizes[w.blob_key] = w.content_size
+                    if not w.is_favorite:
+                        candidates.append((w.date_added, 'shelf', w, w.blob_key))
+            for captured, history_id, blob, size in self.clipboard_history.images():
+                sizes[blob] = size or 0
+                candidates.append((captured, 'history', history_id, blob))
+            for date_added, archive_id, blob, size in self.archive.images():
+                sizes[blob] = size or 0
+                candidates.append((date_added, 'archive', archive_id, blob))
+            total = sum(sizes.values())
+            if total <= IMAGE_STORE_BUDGET:
+                return
+            holders = Counter(key for _, _, _, key in candidates)
+            pinned = {w.blob_key for w in self._get_all_items()
+                      if w.data_type == ItemType.IMAGE and w.is_favorite}
+
+            shelf_changed = False
+            archived, history_ids = [], []
+            for _, kind, ref, key in sorted(candidates, key=lambda c: c[0]):
+                if total <= IMAGE_STORE_BUDGET:
+                    break
+                if kind == 'shelf':
+                    self._discard_item(ref)
+                    shelf_changed = True
+                elif kind == 'archive':
+                    archived.append(ref)
+                else:
+                    history_ids.append(ref)
+                holders[key] -= 1
+                if holders[key] == 0 and key not in pinned:
+                    total -= sizes.get(key, 0)
+            if archived:
+                self.archive.remove(archived)
+                gone = set(archived)
+                for w in [w for w in self._archived_widgets if w.archive_id in gone]:
+                    self._discard_item(w)
+                self.blob_store.set_references('archive', self.archive.blob_keys())
+                shelf_changed = True
+            if shelf_changed:
+                self.refresh_visibility()
+                self._schedule_save()
+            if history_ids:
+                self.clipboard_history.remove(history_ids)
+                self.save_history()
+                if self.current_tab == "history":
+                    self._rebuild_history_display()
+        except Exception as e:
+            log.exception(f"Image budget error: {e}")
+
+    def _add_to_history_batch(self, entries):
+        """Append several history entries (item dicts) with a single save and rebuild."""
+        try:
+            if self.max_history == 0 or not entries:
                 return
-            self.clipboard_history.append({
-                "type": dtype,
-                "content": content,
-                "time": datetime.now().isoformat()
-            })
+            now = datetime.now().isoformat()
+            added = self.clipboard_history.append(
+                [history_record(entry, now) for entry in entries], limit=self.max_history)
+            self.stats.record_captures(len(entries))
             self.save_history()
             if self.current_tab == "history":
-                self._rebuild_history_display()
+                self._show_new_history(added)
         except Exception as e:
             log.exception(f"Add to history error: {e}")
 
@@ -2091,63 +5406,322 @@ class DropShelfWindow(QMainWindow):
                 for i in range(self.scroll_layout.count())
                 if isinstance(self.scroll_layout.itemAt(i).widget(), DraggableItem)]
     
+    def item_dicts(self):
+        """The in-memory shelf; archived items are queried from self.archive."""
+        return [w.to_dict() for w in self._get_all_items() if w.archive_id is None]
+
+    def export_dicts(self):
+        return ([w.to_dict(full=True) for w in self._get_all_items() if w.archive_id is None] +
+                [export_entry(self.blob_store, e) for e in self.archive.entries()])
+
+    def usage_stats(self):
+        return self.stats.summary(lambda w: {
+            'type': w.data_type.value, 'content': w.preview[:TOOLTIP_MAX_CHARS],
+            'use_count': w.use_count, 'is_favorite': w.is_favorite}, archive=self.archive)
+
+    def memory_report(self):
+        """What this window holds in memory, for the Stats dialog and MEMORY."""
+        items = self._get_all_items()
+        pixmaps = [p for p in (w.icon_label.pixmap() for w in items) if not p.isNull()]
+        favicons = list(self.favicon_service._pixmaps.values())
+        return {
+            'process': process_memory(),
+            'items': {'count': len(items),
+                      'content_bytes': sum(approx_size(w._content) + approx_size(w.tags)
+                                           for w in items),
+                      'out_of_line_bytes': sum(w.content_size for w in items if w.blob_key)},
+            'pixmaps': {'count': len(pixmaps), 'bytes': sum(map(pixmap_bytes, pixmaps))},
+            'favicons': {'count': len(favicons), 'bytes': sum(map(pixmap_bytes, favicons))},
+            'history': {'entries': len(self.clipboard_history), 'widgets': len(self._history_rows),
+                        'file_bytes': os.path.getsize(self.clipboard_history.path)},
+            'undo': {'batches': len(self.undo_stack),
+                     'entries': sum(len(batch) for batch in self.undo_stack),
+                     'bytes': approx_size(self.undo_stack)},
+            'archive': {'items': len(self.archive), 'paged_in': len(self._archived_widgets),
+                        'file_bytes': os.path.getsize(self.archive.path)},
+        }
+
     def add_item(self, dtype, content, is_favorite=False, hidden_from_main=False,
                  tags=None, date_added=None, use_count=0):
+        self.add_items([{'type': dtype, 'content': content,
+                         'is_favorite': is_favorite, 'hidden_from_main': hidden_from_main,
+                         'tags': tags, 'date_added': date_added, 'use_count': use_count}])
+
+    @traced('shelf.add_items')
+    def add_items(self, batch, position=0):
+        """
+        Add several items (dicts in the favorites.json shape) in one pass.
+        Later entries end up on top, exactly as if add_item had been called
+        for each in order, but dedup uses one index built up front, pruning
+        and refresh_visibility run once, the shelf relayouts once with
+        updates disabled, and a single save is scheduled. position is the
+        layout index the batch goes in at (0 = top of the shelf).
+        """
+        added = []
+        if not batch:
+            return added
         try:
-            if not is_favorite and self.current_tab == "fav":
+            if self.current_tab == "fav" and any(not e.get('is_favorite', False) for e in batch):
                 self.current_tab = "all"
                 self._update_tab_styles()
 
-            # Properly handle dtype comparison
-            dtype_enum = ItemType(dtype) if isinstance(dtype, str) else dtype
-
-            # Deduplication
-            for w in self._get_all_items():
-                if w.content == content and w.data_type == dtype_enum:
-                    if not is_favorite and w.is_favorite:
-                        is_favorite = True
-                    hidden_from_main = False
-                    # Stop background thread before destroying the old widget
-                    if hasattr(w, '_stop_title_fetcher'):
-                        w._stop_title_fetcher()
-                    self.scroll_layout.removeWidget(w)
-                    w.deleteLater()
-                    break
-
-            item = DraggableItem(dtype, content, self,
+            batch = [self._store_out_of_line(e) for e in batch]
+            # Re-adding an archived item brings it back to the shelf
+            self.archive.take({archive_key(e['type'], e.get('blob') or e['content'])
+                               for e in batch})
+            index = {w.dedup_key: w for w in self._get_all_items()}
+
+            # Don't build widgets that the cap would archive straight away
+            non_fav = [i for i, e in enumerate(batch) if not e.get('is_favorite', False)]
+            if len(non_fav) > MAX_SHELF_ITEMS:
+                now = datetime.now().isoformat()
+                newest_first = sorted(non_fav, reverse=True,
+                                      key=lambda i: (batch[i].get('date_added') or now, i))
+                dropped = set(newest_first[MAX_SHELF_ITEMS:])
+                shelf_keys = {k for k, w in index.items() if w.archive_id is None}
+                self._archive_entries([e for i, e in enumerate(batch) if i in dropped
+                                       and self._dedup_key(e) not in shelf_keys])
+                batch = [e for i, e in enumerate(batch) if i not in dropped]
+
+            self.scroll_content.setUpdatesEnabled(False)
+            try:
+                added, needs_save = self._insert_entries(batch, position, index)
+                if self._load_index is not None:
+                    # Keep the staged load's dedup index aware of these
+                    self._load_index.update((w.dedup_key, w) for w in added)
+                self._prune_shelf()
+                self.refresh_visibility()
+            finally:
+                self.scroll_content.setUpdatesEnabled(True)
+            if needs_save:
+                self._schedule_save()
+        except Exception as e:
+            log.exception(f"Add item error: {e}")
+        return added
+
+    def _insert_entries(self, batch, position, index):
+        """
+        Build widgets for prepared item dicts at layout index position,
+        deduplicating against (and updating) index. Returns (added, needs_save).
+        """
+        added = []
+        needs_save = False
+        for entry in batch:
+            dtype_enum = ItemType(entry['type'])
+            key = self._dedup_key(entry)
+            is_favorite = entry.get('is_favorite', False)
+            hidden_from_main = entry.get('hidden_from_main', False)
+
+            # Deduplication: re-adding moves the item to the top. An index
+            # kept across calls may hold widgets edited since.
+            old = index.pop(key, None)
+            if old is not None and old.dedup_key == key:
+                if not is_favorite and old.is_favorite:
+                    is_favorite = True
+                hidden_from_main = False
+                if self.scroll_layout.indexOf(old) < position:
+                    position -= 1
+                self._discard_item(old)
+                if old in added:
+                    added.remove(old)
+
+            item = DraggableItem(dtype_enum, entry['content'], self,
                                  is_favorite=is_favorite,
                                  hidden_from_main=hidden_from_main,
-                                 tags=tags or [],
-                                 date_added=date_added,
-                                 use_count=use_count)
-            self.scroll_layout.insertWidget(0, item)
-
-            # Enforce item cap: prune oldest non-favorite items beyond the limit
-            all_items = self._get_all_items()
-            non_favs = [w for w in reversed(all_items) if not w.is_favorite]
-            if len(non_favs) > MAX_SHELF_ITEMS:
-                for old in non_favs[MAX_SHELF_ITEMS:]:
-                    if hasattr(old, '_stop_title_fetcher'):
-                        old._stop_title_fetcher()
-                    self.scroll_layout.removeWidget(old)
-                    old.deleteLater()
-
+                                 tags=entry.get('tags') or [],
+                                 date_added=entry.get('date_added'),
+                                 use_count=entry.get('use_count', 0),
+                                 blob=entry.get('blob'), size=entry.get('size'),
+                                 thumb=entry.get('thumb'))
+            self.scroll_layout.insertWidget(position, item)
+            self.stats.add(item, dtype_enum, is_favorite, item.use_count)
             if self.selection_mode:
                 item.set_selection_mode(True)
-
-            self.refresh_visibility()
+            index[key] = item
+            added.append(item)
             if not (is_favorite and hidden_from_main):
-                self._schedule_save()
+                needs_save = True
+        return added, needs_save
+
+    def _store_out_of_line(self, entry):
+        return store_out_of_line(self.blob_store, entry)
+
+    @staticmethod
+    def _dedup_key(entry):
+        """DraggableItem.dedup_key for an item dict."""
+        return (ItemType(entry['type']), entry.get('blob') or entry['content'])
+
+    def _publish_undo_refs(self):
+        self.blob_store.set_references(
+            'undo', entry_blob_keys(e for batch in self.undo_stack for e in batch))
+
+    def _collect_blobs(self):
+        """Refresh every owner's references from live state, then sweep the blob store."""
+        try:
+            self.blob_store.set_references(
+                'shelf', entry_blob_keys(w.to_dict() for w in self._get_all_items()))
+            self.blob_store.set_references('history', self.clipboard_history.blob_keys())
+            self._publish_undo_refs()
+            self.blob_store.set_references('archive', self.archive.blob_keys())
+            self.blob_store.collect_garbage()
         except Exception as e:
-            log.exception(f"Add item error: {e}")
+            log.exception(f"Blob GC error: {e}")
+
+    def _prune_shelf(self):
+        """Enforce MAX_SHELF_ITEMS by moving the oldest non-favorite items to the archive."""
+        non_favs = [w for w in self._get_all_items()
+                    if not w.is_favorite and w.archive_id is None]
+        if len(non_favs) <= MAX_SHELF_ITEMS:
+            return
+        non_favs.sort(key=lambda w: w.date_added, reverse=True)
+        overflow = non_favs[MAX_SHELF_ITEMS:]
+        self._archive_entries([w.to_dict() for w in overflow])
+        for old in overflow:
+            self._discard_item(old)
+
+    def _discard_item(self, item_widget):
+        """Take a widget off the shelf and out of the stats, then destroy it."""
+        # Stop any background thread BEFORE scheduling widget for deletion
+        if hasattr(item_widget, '_release_requests'):
+            item_widget._release_requests()
+        self.scroll_layout.removeWidget(item_widget)
+        self.stats.discard(item_widget)
+        if self._load_index is not None:
+            if self._load_index.get(item_widget.dedup_key) is item_widget:
+                del self._load_index[item_widget.dedup_key]
+            if item_widget is self._load_tail:
+                self._load_tail = None
+        if item_widget.archive_id is not None:
+            self._archived_widgets.remove(item_widget)
+        item_widget.deleteLater()
+
+    # ── Archive tier ──────────────────────────────────────────────────────────
+    def _archive_entries(self, entries):
+        """Move item dicts into the ShelfArchive and keep their blobs referenced."""
+        if not entries:
+            return
+        self.archive.put(entries)
+        self.blob_store.set_references('archive', self.archive.blob_keys())
+
+    def _sync_archived(self, item):
+        """Write a paged-in item's changes back; favoriting brings it back to the shelf."""
+        if item.archive_id is None:
+            return
+        try:
+            if item.is_favorite:
+                self.archive.remove([item.archive_id])
+                self._archived_widgets.remove(item)
+                item.archive_id = None
+                self.stats.add(item, item.data_type, item.is_favorite, item.use_count)
+            else:
+                self.archive.update(item.archive_id, item.to_dict())
+        except Exception as e:
+            log.exception(f"Archive sync error: {e}")
+
+    def _archive_filter(self):
+        tab, type_filter, query = self._archive_view
+        return (None if type_filter == "all" else type_filter), query
+
+    def _sync_archive_view(self):
+        """Drop the paged-in rows when the tab, filter or search changes."""
+        view = (self.current_tab, self.current_filter, self.search_query.lower())
+        if view != self._archive_view:
+            self._archive_view = view
+            self._evict_archived()
+            self._archive_done = self.current_tab != "all" or not len(self.archive)
+            # Page in straight away if the shelf no longer fills the view
+            QTimer.singleShot(0, self._maybe_page_archive)
+        self._update_archive_label()
+
+    def _evict_archived(self, count=None):
+        """Destroy the first `count` (default all) paged-in widgets; their rows stay archived."""
+        count = len(self._archived_widgets) if count is None else count
+        for _ in range(count):
+            self._discard_item(self._archived_widgets[0])
+        if self._archived_widgets:
+            self._archive_hidden += count
+        else:
+            self._archive_hidden = 0
+
+    def _reset_archive_view(self):
+        self._archive_view = None
+        self.refresh_visibility()
+        self.scroll_area.verticalScrollBar().setValue(0)
+
+    def _maybe_page_archive(self):
+        """Page in the next archived rows once the shelf is scrolled near its end."""
+        try:
+            if (self._archive_done or self._archive_view is None
+                    or self._loading or self._pending_load):
+                return
+            bar = self.scroll_area.verticalScrollBar()
+            if bar.value() >= bar.maximum() - ARCHIVE_PREFETCH_PX:
+                self._page_archive()
+        except Exception as e:
+            log.exception(f"Archive paging error: {e}")
+
+    @traced('shelf.page_archive')
+    def _page_archive(self):
+        dtype, query = self._archive_filter()
+        last = self._archived_widgets[-1] if self._archived_widgets else None
+        rows = self.archive.page(ARCHIVE_PAGE_ITEMS, dtype, query,
+                                 after=(last.date_added, last.archive_id) if last else None)
+        self._archive_done = len(rows) < ARCHIVE_PAGE_ITEMS
+        bar = self.scroll_area.verticalScrollBar()
+        self.scroll_content.setUpdatesEnabled(False)
+        try:
+            position = len(self._get_all_items())
+            for entry in rows:
+                item = DraggableItem(ItemType(entry['type']), entry['content'], self,
+                                     tags=entry['tags'], date_added=entry['date_added'],
+                                     use_count=entry['use_count'], blob=entry.get('blob'),
+                                     size=entry.get('size'), thumb=entry.get('thumb'),
+                                     archive_id=entry['archive_id'])
+                self.scroll_layout.insertWidget(position, item)
+                position += 1
+                if self.selection_mode:
+                    item.set_selection_mode(True)
+                item.setVisible(self._should_show_item(item))
+                self._archived_widgets.append(item)
+            overflow = len(self._archived_widgets) - ARCHIVE_MAX_PAGED
+            if overflow > 0:
+                # Keep the rows on screen where they are while the top page goes
+                dropped = list(itertools.islice(self._archived_widgets, overflow))
+                shift = sum(w.height() + self.scroll_layout.spacing()
+                            for w in dropped if not w.isHidden())
+                self._evict_archived(overflow)
+                self.scroll_layout.activate()
+                bar.setValue(bar.value() - shift)
+            if rows:
+                self.empty_label.setVisible(False)
+        finally:
+            self.scroll_content.setUpdatesEnabled(True)
+        self._update_archive_label()
+
+    def _update_archive_label(self):
+        archived = len(self.archive)
+        if self.current_tab != "all" or not archived:
+            self.archive_label.setVisible(False)
+            return
+        accent = THEMES[self.current_theme]['accent']
+        shown = len(self._archived_widgets)
+        parts = []
+        if self._archive_hidden:
+            parts.append(f'<a href="top" style="color: {accent};">↑ Back to newer archived items</a>')
+        if shown:
+            parts.append(f"{shown} of {archived} archived items loaded")
+        else:
+            parts.append(f"{archived} older items archived")
+        if not self._archive_done:
+            parts.append("scroll for more")
+        self.archive_label.setText(" • ".join(parts))
+        self.archive_label.setVisible(True)
 
     def remove_item(self, item_widget):
         try:
-            # Stop any background thread BEFORE scheduling widget for deletion
-            if hasattr(item_widget, '_stop_title_fetcher'):
-                item_widget._stop_title_fetcher()
-            self.scroll_layout.removeWidget(item_widget)
-            item_widget.deleteLater()
+            if item_widget.archive_id is not None:
+                self.archive.remove([item_widget.archive_id])
+            self._discard_item(item_widget)
             self.refresh_visibility()
             self._schedule_save()
         except Exception as e:
@@ -2159,6 +5733,7 @@ class DropShelfWindow(QMainWindow):
                 # In Favorites tab: X removes from favorites but keeps item in All Items
                 item_widget.is_favorite = False
                 item_widget.hidden_from_main = False
+                self.stats.set_favorite(item_widget, False)
                 item_widget.update_style()
                 item_widget._update_star_style()
                 self.save_favorites()
@@ -2172,15 +5747,8 @@ class DropShelfWindow(QMainWindow):
                     self.refresh_visibility()
                 else:
                     # Non-favorite items are deleted permanently with undo support
-                    self.undo_stack.append([{
-                        'type': item_widget.data_type.value,
-                        'content': item_widget.content,
-                        'is_favorite': item_widget.is_favorite,
-                        'hidden_from_main': item_widget.hidden_from_main,
-                        'tags': item_widget.tags,
-                        'date_added': item_widget.date_added,
-                        'use_count': item_widget.use_count,
-                    }])
+                    self.undo_stack.append([item_widget.to_dict()])
+                    self._publish_undo_refs()
                     self.undo_btn.setEnabled(True)
                     self.remove_item(item_widget)
         except Exception as e:
@@ -2190,13 +5758,8 @@ class DropShelfWindow(QMainWindow):
         try:
             if not self.undo_stack:
                 return
-            for entry in self.undo_stack.pop():
-                self.add_item(entry['type'], entry['content'],
-                              is_favorite=entry['is_favorite'],
-                              hidden_from_main=entry['hidden_from_main'],
-                              tags=entry.get('tags', []),
-                              date_added=entry.get('date_added'),
-                              use_count=entry.get('use_count', 0))
+            self.add_items(self.undo_stack.pop())
+            self._publish_undo_refs()
             self.undo_btn.setEnabled(len(self.undo_stack) > 0)
         except Exception as e:
             log.exception(f"Undo error: {e}")
@@ -2242,11 +5805,8 @@ class DropShelfWindow(QMainWindow):
                                     QMessageBox.StandardButton.Yes |
                                     QMessageBox.StandardButton.No) != QMessageBox.StandardButton.Yes:
                 return
-            batch = [{'type': w.data_type.value, 'content': w.content,
-                      'is_favorite': w.is_favorite, 'hidden_from_main': w.hidden_from_main,
-                      'tags': w.tags, 'date_added': w.date_added, 'use_count': w.use_count}
-                     for w in selected]
-            self.undo_stack.append(batch)
+            self.undo_stack.append([w.to_dict() for w in selected])
+            self._publish_undo_refs()
             self.undo_btn.setEnabled(True)
             for w in selected:
                 self.remove_item(w)
@@ -2276,20 +5836,27 @@ class DropShelfWindow(QMainWindow):
                 else:
                     to_remove.append(item)
             for item in to_remove:
-                self.remove_item(item)
+                if item.archive_id is None:
+                    self.remove_item(item)
+            self._archive_view = None
+            self.archive.clear()
+            self.blob_store.set_references('archive', ())
             self.save_favorites()
             self.refresh_visibility()
         except Exception as e:
             log.exception(f"Clear shelf error: {e}")
 
     # ── Persistence ───────────────────────────────────────────────────────────
+    @traced('shelf.save_favorites')
     def save_favorites(self):
         """Save favorites with atomic write to prevent corruption"""
+        if self._pending_load:
+            # Writing now would drop the favorites that haven't been built yet
+            self._save_after_load = True
+            return
         try:
-            data = [{'type': w.data_type.value, 'content': w.content,
-                     'is_favorite': w.is_favorite, 'hidden_from_main': w.hidden_from_main,
-                     'tags': w.tags, 'date_added': w.date_added, 'use_count': w.use_count}
-                    for w in self._get_all_items()]
+            data = [w.to_dict() for w in self._get_all_items() if w.archive_id is None]
+            self.blob_store.set_references('shelf', entry_blob_keys(data))
             
             # Atomic write: write to temp file then rename
             temp_file = FAVORITES_FILE + '.tmp'
@@ -2319,13 +5886,10 @@ class DropShelfWindow(QMainWindow):
             self._loading = True  # suppress debounced saves during initial load
             with open(FAVORITES_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            for entry in reversed(data):
-                self.add_item(entry['type'], entry['content'],
-                              is_favorite=entry.get('is_favorite', False),
-                              hidden_from_main=entry.get('hidden_from_main', False),
-                              tags=entry.get('tags', []),
-                              date_added=entry.get('date_added'),
-                              use_count=entry.get('use_count', 0))
+            # Build the first screenful now; the rest follows in idle-time chunks
+            self._pending_load = data[STARTUP_FIRST_ITEMS:]
+            added = self.add_items(list(reversed(data[:STARTUP_FIRST_ITEMS])))
+            self._load_tail = added[0] if added else None
         except Exception:
             log.exception("Load favorites error")
         finally:
@@ -2398,10 +5962,7 @@ class DropShelfWindow(QMainWindow):
                                                       "JSON Files (*.json)")
             if not filename:
                 return
-            items = [{'type': w.data_type.value, 'content': w.content,
-                      'is_favorite': w.is_favorite, 'hidden_from_main': w.hidden_from_main,
-                      'tags': w.tags, 'date_added': w.date_added, 'use_count': w.use_count}
-                     for w in self._get_all_items()]
+            items = self.export_dicts()
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(items, f, indent=2)
             QMessageBox.information(self, "Success", f"Exported {len(items)} items.")
@@ -2416,16 +5977,8 @@ class DropShelfWindow(QMainWindow):
                 return
             with open(filename, 'r', encoding='utf-8') as f:
                 items = json.load(f)
-            count = 0
-            for item in items:
-                self.add_item(item['type'], item['content'],
-                              is_favorite=item.get('is_favorite', False),
-                              hidden_from_main=item.get('hidden_from_main', False),
-                              tags=item.get('tags', []),
-                              date_added=item.get('date_added'),
-                              use_count=item.get('use_count', 0))
-                count += 1
-            QMessageBox.information(self, "Success", f"Imported {count} items.")
+            self.add_items(items)
+            QMessageBox.information(self, "Success", f"Imported {len(items)} items.")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Import failed: {e}")
 
@@ -2449,10 +6002,8 @@ class DropShelfWindow(QMainWindow):
 
     def open_stats(self):
         try:
-            items_data = [{'type': w.data_type.value, 'content': w.content,
-                          'use_count': w.use_count, 'is_favorite': w.is_favorite}
-                         for w in self._get_all_items()]
-            StatsDialog(items_data, self.current_theme, self).exec()
+            StatsDialog(self.usage_stats(), self.current_theme, self,
+                        memory_source=self.memory_report).exec()
         except Exception as e:
             log.exception(f"Open stats error: {e}")
 
@@ -2522,6 +6073,9 @@ class DropShelfWindow(QMainWindow):
 
     def setup_hotkey(self):
         """Setup global hotkey with platform-specific handling"""
+        if self.host is not None:
+            self.host.set_hotkey(self.hotkey)
+            return
         try:
             keyboard.add_hotkey(self.hotkey, self.toggle_window)
             log.info(f"Hotkey registered: {self.hotkey}")
@@ -2548,6 +6102,9 @@ class DropShelfWindow(QMainWindow):
             log.exception(f"Show window error: {e}")
 
     def minimize_to_tray(self):
+        if self.host is not None:
+            self.host.hide_window()
+            return
         try:
             self.hide()
             self.tray_icon.showMessage("DropShelf",
@@ -2565,15 +6122,40 @@ class DropShelfWindow(QMainWindow):
         except Exception as e:
             log.exception(f"Close app error: {e}")
 
+    def release(self):
+        """
+        Save everything and stop background work, leaving the window inert.
+        Safe to call twice: quitting from a daemon-hosted window releases it,
+        then the daemon's shutdown hides and releases it again.
+        """
+        if self._released:
+            return
+        self._released = True
+        self._startup_steps.clear()
+        self._finish_staged_load()
+        if hasattr(self, 'ingest'):
+            self.clipboard.dataChanged.disconnect(self._on_clipboard_change)
+            self.ingest.flush()   # don't lose a burst that's still coalescing
+        self.save_favorites()
+        self.save_settings()
+        # Drop queued title fetches and cancel in-flight ones
+        self.title_service.shutdown()
+        self.favicon_service.shutdown()
+        if hasattr(self, 'image_capture'):
+            self.image_capture.shutdown()
+        if self.fetch_engine is not None:
+            self.fetch_engine.stop()
+        if hasattr(self, '_blob_gc_timer'):
+            self._blob_gc_timer.stop()
+
     def _force_quit(self):
         try:
-            self.save_favorites()
-            self.save_settings()
+            self.release()
             keyboard.unhook_all()
-            # Stop all running title fetcher threads before exit
-            for item in self._get_all_items():
-                if hasattr(item, '_stop_title_fetcher'):
-                    item._stop_title_fetcher()
+            if self.command_server is not None:
+                self.command_server.close()
+            elif self.host is not None:
+                self.host.command_server.close()
             try:
                 self.tray_icon.hide()
             except Exception:
@@ -2586,26 +6168,15 @@ class DropShelfWindow(QMainWindow):
     def close_app(self):
         self._force_quit()
 
-    # ── Single-instance server ────────────────────────────────────────────────
+    # ── Single-instance / command server ──────────────────────────────────────
     def setup_local_server(self):
+        if self.host is not None:
+            return   # the daemon's server forwards to this window while it exists
         try:
-            self.server = QLocalServer(self)
-            self.server.listen(APP_ID)
-            self.server.newConnection.connect(self._handle_new_connection)
+            self.command_server = CommandServer(self, self)
         except Exception as e:
             log.exception(f"Local server setup error: {e}")
 
-    def _handle_new_connection(self):
-        try:
-            client = self.server.nextPendingConnection()
-            if client:
-                client.waitForReadyRead(1000)
-                data = client.readAll().data().decode('utf-8')
-                if data == "SHOW":
-                    self.show_window()
-        except Exception as e:
-            log.exception(f"Handle connection error: {e}")
-
     # ── Drag & Drop ───────────────────────────────────────────────────────────
     def dragEnterEvent(self, event):
         try:
@@ -2655,21 +6226,24 @@ class DropShelfWindow(QMainWindow):
                     
             # External files/URLs
             if mime.hasUrls():
+                batch = []
                 for url in mime.urls():
                     fp = url.toLocalFile()
                     if fp:
-                        self.add_item(ItemType.FILE, fp)
+                        batch.append({'type': ItemType.FILE, 'content': fp})
                     else:
                         # Non-local URL (e.g. dragged from browser)
                         url_str = url.toString()
                         if url_str:
-                            self.add_item(ItemType.URL, url_str)
+                            batch.append({'type': ItemType.URL, 'content': url_str})
+                clipboard_recorder.record_drop(batch)
+                self.add_items(batch)
                 event.acceptProposedAction()
             elif mime.hasText():
-                text = mime.text().strip()
-                if text:
-                    t = ItemType.URL if text.startswith(('http://', 'https://', 'www.')) else ItemType.TEXT
-                    self.add_item(t, text)
+                batch = [{'type': dtype, 'content': content}
+                         for dtype, content in self.classifier.classify(mime.text())]
+                clipboard_recorder.record_drop(batch)
+                self.add_items(batch)
                 event.acceptProposedAction()
         except Exception as e:
             log.exception(f"Drop event error: {e}")
@@ -2720,6 +6294,10 @@ class DropShelfWindow(QMainWindow):
 
     def closeEvent(self, event):
         try:
+            if self.host is not None:
+                event.ignore()
+                self.host.hide_window()
+                return
             self.save_settings()
             event.accept()
         except Exception as e:
@@ -2727,6 +6305,382 @@ class DropShelfWindow(QMainWindow):
             event.accept()
 
 
+# ─── Headless Shelf (daemon mode) ─────────────────────────────────────────────
+class ShelfStore(QObject):
+    """
+    favorites.json as plain item dicts, plus the ClipboardHistory, for --daemon mode.
+    Applies the same rules as the window: re-adding moves an item to the top
+    (keeping its favourite flag), non-favourites past MAX_SHELF_ITEMS move to
+    the ShelfArchive, large payloads live in the blob store, and writes are
+    debounced and atomic.
+    """
+    def __init__(self, blob_store, archive, history, parent=None):
+        super().__init__(parent)
+        self.blob_store = blob_store
+        self.archive = archive
+        self.clipboard_history = history
+        self.entries = []    # newest first, in the favorites.json shape
+        self.stats = None    # ShelfStats keyed by id() of each entry
+        self.monitor_clipboard = True
+        self.hotkey = DEFAULT_HOTKEY
+        self.max_history = MAX_HISTORY
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self.save_favorites)
+        self.reload()
+
+    def reload(self):
+        """Re-read settings and favorites (after the window wrote them)."""
+        settings = self._read_json(SETTINGS_FILE) or {}
+        self.monitor_clipboard = settings.get('monitor_clipboard', True)
+        self.hotkey = settings.get('hotkey', DEFAULT_HOTKEY)
+        self.max_history = settings.get('max_history', MAX_HISTORY)
+        self.entries = [self._normalize(store_out_of_line(self.blob_store, e))
+                        for e in self._read_json(FAVORITES_FILE) or []]
+        self.clipboard_history.trim(self.max_history)
+        self.stats = ShelfStats()
+        for e in self.entries:
+            self._track(e)
+        self.stats.seed(self.clipboard_history.entries())
+        self.blob_store.set_references('shelf', entry_blob_keys(self.entries))
+        self.blob_store.set_references('history', self.clipboard_history.blob_keys())
+        self.blob_store.set_references('undo', ())
+        self.blob_store.set_references('archive', self.archive.blob_keys())
+
+    @staticmethod
+    def _read_json(path):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            log.exception(f"Read error: {path}")
+            return None
+
+    @staticmethod
+    def _normalize(entry):
+        dtype = entry['type']
+        item = {'type': dtype.value if isinstance(dtype, ItemType) else ItemType(dtype).value,
+                'is_favorite': entry.get('is_favorite', False),
+                'hidden_from_main': entry.get('hidden_from_main', False),
+                'tags': entry.get('tags') or [],
+                'date_added': entry.get('date_added') or datetime.now().isoformat(),
+                'use_count': entry.get('use_count', 0),
+                'content': entry['content']}
+        for field in ('blob', 'size', 'thumb'):
+            if entry.get(field) is not None:
+                item[field] = entry[field]
+        return item
+
+    # ── Shelf ─────────────────────────────────────────────────────────────────
+    def _track(self, entry):
+        self.stats.add(id(entry), entry['type'], entry['is_favorite'],
+                       entry['use_count'], ref=entry)
+
+    def item_dicts(self):
+        return [dict(e) for e in self.entries]
+
+    def usage_stats(self):
+        return self.stats.summary(lambda e: {
+            'type': e['type'], 'content': str(e['content'])[:TOOLTIP_MAX_CHARS],
+            'use_count': e['use_count'], 'is_favorite': e['is_favorite']}, archive=self.archive)
+
+    def export_dicts(self):
+        return [export_entry(self.blob_store, e)
+                for e in itertools.chain(self.entries, self.archive.entries())]
+
+    def add_items(self, batch):
+        """Same contract as DropShelfWindow.add_items; returns the added dicts."""
+        added = []
+        batch = [self._normalize(store_out_of_line(self.blob_store, e)) for e in batch]
+        self.archive.take({archive_key(e['type'], e.get('blob') or e['content']) for e in batch})
+        index = {(e['type'], e.get('blob') or e['content']): e for e in self.entries}
+        for item in batch:
+            key = (item['type'], item.get('blob') or item['content'])
+            old = index.pop(key, None)
+            if old is not None:
+                item['is_favorite'] = item['is_favorite'] or old['is_favorite']
+                item['hidden_from_main'] = False
+                self.entries.remove(old)
+                self.stats.discard(id(old))
+                if old in added:
+                    added.remove(old)
+            self.entries.insert(0, item)
+            self._track(item)
+            index[key] = item
+            added.append(item)
+        non_favs = [e for e in self.entries if not e['is_favorite']]
+        if len(non_favs) > MAX_SHELF_ITEMS:
+            non_favs.sort(key=lambda e: e['date_added'], reverse=True)
+            self.archive.put(non_favs[MAX_SHELF_ITEMS:])
+            self.blob_store.set_references('archive', self.archive.blob_keys())
+            dropped = {id(e) for e in non_favs[MAX_SHELF_ITEMS:]}
+            self.entries = [e for e in self.entries if id(e) not in dropped]
+            for key in dropped:
+                self.stats.discard(key)
+            added = [e for e in added if id(e) not in dropped]
+        if batch:
+            self._save_timer.start(250)
+        return added
+
+    def add_to_history(self, entries):
+        if self.max_history == 0 or not entries:
+            return
+        now = datetime.now().isoformat()
+        self.clipboard_history.append([history_record(entry, now) for entry in entries],
+                                      limit=self.max_history)
+        self.stats.record_captures(len(entries))
+        self.save_history()
+
+    def enforce_image_budget(self):
+        """Dict counterpart of DropShelfWindow._enforce_image_budget."""
+        image = ItemType.IMAGE.value
+        sizes = {}
+        archived = [{'date_added': date_added, 'archive_id': archive_id, 'blob': blob, 'size': size}
+                    for date_added, archive_id, blob, size in self.archive.images()]
+        history = [{'time': captured, 'history_id': history_id, 'blob': blob, 'size': size}
+                   for captured, history_id, blob, size in self.clipboard_history.images()]
+        for e in self.entries + history + archived:
+            if e.get('type', image) == image and e.get('blob'):
+                sizes[e['blob']] = e.get('size') or 0
+        total = sum(sizes.values())
+        if total <= IMAGE_STORE_BUDGET:
+            return
+        pinned = {e['blob'] for e in self.entries if e['type'] == image and e['is_favorite']}
+        candidates = sorted(
+            [(e['date_added'], 'shelf', e) for e in self.entries
+             if e['type'] == image and not e['is_favorite']] +
+            [(e['time'], 'history', e) for e in history] +
+            [(e['date_added'], 'archive', e) for e in archived],
+            key=lambda c: c[0])
+        holders = Counter(e['blob'] for _, _, e in candidates)
+        removed, history_ids = [], []
+        for _, kind, e in candidates:
+            if total <= IMAGE_STORE_BUDGET:
+                break
+            if kind == 'archive':
+                removed.append(e['archive_id'])
+            elif kind == 'history':
+                history_ids.append(e['history_id'])
+            else:
+                self.entries.remove(e)
+                self.stats.discard(id(e))
+            holders[e['blob']] -= 1
+            if holders[e['blob']] == 0 and e['blob'] not in pinned:
+                total -= sizes.get(e['blob'], 0)
+        if removed:
+            self.archive.remove(removed)
+            self.blob_store.set_references('archive', self.archive.blob_keys())
+        self.clipboard_history.remove(history_ids)
+        self._save_timer.start(250)
+        self.save_history()
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+    def flush(self):
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_favorites()
+
+    def save_favorites(self):
+        self.blob_store.set_references('shelf', entry_blob_keys(self.entries))
+        self._write_json(FAVORITES_FILE, self.entries, backup=True)
+
+    def save_history(self):
+        self.blob_store.set_references('history', self.clipboard_history.blob_keys())
+        self.stats.save()
+
+    @staticmethod
+    def _write_json(path, data, backup=False):
+        """Atomic write (temp file → rename), keeping a .bak like save_favorites."""
+        temp_file = path + '.tmp'
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            if os.path.exists(path):
+                if backup:
+                    os.replace(path, path + '.bak')
+                else:
+                    os.remove(path)
+            os.rename(temp_file, path)
+        except Exception:
+            log.exception(f"Save error: {path}")
+            try:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+            except OSError:
+                pass
+
+
+class DropShelfDaemon(QObject):
+    """
+    --daemon mode: clipboard capture, persistence, the command socket and
+    the hotkey, with no widgets. SHOW or the hotkey builds a DropShelfWindow
+    on demand, which takes over capture while it exists; hiding it saves
+    and destroys it again so its widget memory is released.
+    """
+    _hotkey_pressed = Signal()   # emitted from the keyboard hook thread
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.window = None
+        self._hotkey = None
+        self.blob_store = BlobStore()
+        self.classifier = ContentClassifier()
+        self.archive = ShelfArchive(blob_store=self.blob_store)
+        self.history = ClipboardHistory(self.blob_store)
+        self.store = ShelfStore(self.blob_store, self.archive, self.history, self)
+        self.command_server = CommandServer(self, self)
+
+        self._clipboard_guard = False
+        self.ingest = ClipboardIngest(self)
+        self.ingest.batch_ready.connect(self._apply_clipboard_batch)
+        self.image_capture = ImageCaptureService(self.blob_store, self)
+        self.image_capture.image_ready.connect(self._apply_clipboard_image)
+        self.clipboard = QApplication.clipboard()
+        self.clipboard.dataChanged.connect(self._on_clipboard_change)
+
+        self._hotkey_pressed.connect(self.toggle_window)
+        self.set_hotkey(self.store.hotkey)
+
+        self._blob_gc_timer = QTimer(self)
+        self._blob_gc_timer.timeout.connect(self._collect_blobs)
+        self._blob_gc_timer.start(BLOB_GC_INTERVAL_MS)
+        log.info(f"Daemon started: {len(self.store.entries)} items")
+
+    # ── CommandServer backend ─────────────────────────────────────────────────
+    @property
+    def clipboard_history(self):
+        return self.history
+
+    def item_dicts(self):
+        return self.window.item_dicts() if self.window else self.store.item_dicts()
+
+    def export_dicts(self):
+        return self.window.export_dicts() if self.window else self.store.export_dicts()
+
+    def usage_stats(self):
+        return self.window.usage_stats() if self.window else self.store.usage_stats()
+
+    def add_items(self, batch):
+        return self.window.add_items(batch) if self.window else self.store.add_items(batch)
+
+    def memory_report(self):
+        if self.window is not None:
+            return self.window.memory_report()
+        entries = self.store.entries
+        return {
+            'process': process_memory(),
+            'items': {'count': len(entries), 'content_bytes': approx_size(entries),
+                      'out_of_line_bytes': sum(e.get('size') or 0 for e in entries if e.get('blob'))},
+            'history': {'entries': len(self.history), 'widgets': 0,
+                        'file_bytes': os.path.getsize(self.history.path)},
+            'undo': {'batches': 0, 'entries': 0, 'bytes': 0},
+            'archive': {'items': len(self.archive), 'paged_in': 0,
+                        'file_bytes': os.path.getsize(self.archive.path)},
+        }
+
+    # ── Window lifecycle ──────────────────────────────────────────────────────
+    def show_window(self):
+        try:
+            if self.window is None:
+                # Hand the files over: the window reads them back on construction
+                self.ingest.flush()
+                self.store.flush()
+                self.window = DropShelfWindow(host=self)
+            self.window.show_window()
+        except Exception as e:
+            log.exception(f"Daemon show error: {e}")
+
+    def hide_window(self):
+        try:
+            window, self.window = self.window, None
+            if window is None:
+                return
+            window.hide()
+            window.release()
+            window.save_history()
+            window.deleteLater()
+            self.store.reload()
+            if self.store.hotkey != self._hotkey:
+                self.set_hotkey(self.store.hotkey)
+        except Exception as e:
+            log.exception(f"Daemon hide error: {e}")
+
+    def toggle_window(self):
+        if self.window is not None and self.window.isVisible():
+            self.hide_window()
+        else:
+            self.show_window()
+
+    def set_hotkey(self, hotkey):
+        try:
+            if self._hotkey:
+                try:
+                    keyboard.remove_hotkey(self._hotkey)
+                except Exception:
+                    pass
+            self._hotkey = hotkey
+            keyboard.add_hotkey(hotkey, self._hotkey_pressed.emit)
+            log.info(f"Hotkey registered: {hotkey}")
+        except Exception as e:
+            log.warning(f"Hotkey setup error (this may require elevated permissions on some systems): {e}")
+
+    # ── Capture ───────────────────────────────────────────────────────────────
+    def _on_clipboard_change(self):
+        # The window runs its own monitor while it exists
+        if self.window is not None or not self.store.monitor_clipboard or self._clipboard_guard:
+            return
+        self._clipboard_guard = True
+        try:
+            snapshot_clipboard(self.clipboard, self.classifier,
+                               self.ingest, self.image_capture)
+        except Exception as e:
+            log.exception(f"Clipboard change error: {e}")
+        finally:
+            self._clipboard_guard = False
+
+    def _apply_clipboard_batch(self, entries):
+        self._ingest([{'type': dtype, 'content': content} for dtype, content in entries])
+
+    def _apply_clipboard_image(self, entry):
+        self._ingest([entry])
+
+    def _ingest(self, entries):
+        try:
+            if self.window is not None:
+                # Captured just before the window opened; let it take them
+                self.window.add_items(entries)
+                return
+            stored = [store_out_of_line(self.blob_store, e) for e in entries]
+            self.store.add_to_history(stored)
+            self.store.add_items(stored)
+            if any(e['type'] == ItemType.IMAGE for e in stored):
+                self.store.enforce_image_budget()
+        except Exception as e:
+            log.exception(f"Daemon ingest error: {e}")
+
+    def _collect_blobs(self):
+        if self.window is not None:
+            return   # the window sweeps the shared store while it is open
+        try:
+            self.blob_store.collect_garbage()
+        except Exception as e:
+            log.exception(f"Blob GC error: {e}")
+
+    def shutdown(self):
+        self.ingest.flush()
+        if self.window is not None:
+            self.hide_window()
+        self.store.flush()
+        self.image_capture.shutdown()
+        self.command_server.close()
+        try:
+            keyboard.unhook_all()
+        except Exception:
+            pass
+
+
 # ─── Entry point ──────────────────────────────────────────────────────────────
 if __name__ == '__main__':
     try:
@@ -2792,15 +6746,37 @@ if __name__ == '__main__':
             QScrollArea {{ padding: 0px; margin: 0px; }}
         ''')
 
+        daemon_mode = '--daemon' in sys.argv[1:]
+
         # Single instance check
         socket = QLocalSocket()
         socket.connectToServer(APP_ID)
-        if socket.waitForConnected(500):
-            socket.write("SHOW".encode('utf-8'))
+        if socket.waitForConnected(IPC_PROBE_MS):
+            if daemon_mode:
+                log.info("Another instance already running, not starting a daemon")
+                sys.exit(0)
+            socket.write(encode_frame({'cmd': 'SHOW'}))
             socket.waitForBytesWritten(1000)
             log.info("Another instance already running, showing existing window")
             sys.exit(0)
 
+        watchdog.start()
+        app.aboutToQuit.connect(watchdog.stop)
+        app.aboutToQuit.connect(clipboard_recorder.stop)
+
+        if daemon_mode:
+            import signal
+            log.info(f"Starting DropShelf daemon on {system}")
+            daemon = DropShelfDaemon()
+            app.aboutToQuit.connect(daemon.shutdown)
+            signal.signal(signal.SIGINT, lambda *_: app.quit())
+            signal.signal(signal.SIGTERM, lambda *_: app.quit())
+            # Give the interpreter a chance to run signal handlers
+            wakeup = QTimer()
+            wakeup.timeout.connect(lambda: None)
+            wakeup.start(500)
+            sys.exit(app.exec())
+
         log.info(f"Starting DropShelf on {system}")
         window = DropShelfWindow()
         window.show()
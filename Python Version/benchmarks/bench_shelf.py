@@ -0,0 +1,226 @@
+"""
+Headless benchmarks for DropShelf's shelf operations.
+
+    python benchmarks/bench_shelf.py [-o results.json] [--only NAME ...]
+                                     [--sizes 100,1000,10000] [--ui-sizes 100,500]
+                                     [--baseline old.json] [--tolerance 1.25]
+
+Drives DropShelfWindow on Qt's offscreen platform against a throwaway data
+directory and emits one JSON document of timings (to stdout, or to -o).
+--sizes applies to adding, save/load and history size; --ui-sizes to the interactive
+search, sort and favorite benchmarks, whose cost is per keystroke or click. With
+--baseline, any benchmark whose median is more than --tolerance times the
+baseline's is reported and the exit status is 1, so a release build can gate
+on it.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+from datetime import datetime, timedelta
+
+from harness import (SCRATCH, ds, BenchHost, pump, fresh_window, close_window,
+                     synthetic_items, summarize, run_metadata)
+from PyQt6.QtWidgets import QApplication
+
+DEFAULT_SIZES    = (100, 1000, 10000)
+DEFAULT_UI_SIZES = (100, ds.MAX_SHELF_ITEMS)
+SEARCH_QUERY     = "report 2024"
+HISTORY_EVENTS   = 500
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    pump()
+    return time.perf_counter() - started
+
+
+# ─── Benchmarks ──────────────────────────────────────────────────────────────
+def bench_add_items(host, sizes):
+    """add_items with a text/URL/file mix: one batch, then one item at a time."""
+    results = {}
+    for n in sizes:
+        batch = synthetic_items(n, favorite=True)
+        window = fresh_window(host)
+        elapsed = timed(window.add_items, batch)
+        results[f'add_batch_{n}'] = summarize([elapsed], per_item_ms=elapsed * 1000 / n)
+        close_window(window)
+    window = fresh_window(host)
+    samples = [timed(window.add_items, [entry]) for entry in synthetic_items(200, seed=1)]
+    results['add_single_200'] = summarize(samples)
+    close_window(window)
+    return results
+
+
+def bench_search(host, sizes):
+    """Per-keystroke latency typing a query into the search box, then clearing it."""
+    results = {}
+    for n in sizes:
+        window = fresh_window(host)
+        window.add_items(synthetic_items(n, favorite=True))
+        pump()
+        samples = []
+        for _ in range(3):
+            for i in range(1, len(SEARCH_QUERY) + 1):
+                samples.append(timed(window.search_input.setText, SEARCH_QUERY[:i]))
+            samples.append(timed(window.search_input.clear))
+        results[f'search_keystroke_{n}'] = summarize(samples)
+        close_window(window)
+    return results
+
+
+def bench_sort(host, sizes):
+    """Switching through every sort order, both directions."""
+    results = {}
+    for n in sizes:
+        window = fresh_window(host)
+        window.add_items(synthetic_items(n, favorite=True))
+        pump()
+        samples = []
+        for ascending in (False, True):
+            window.sort_ascending = ascending
+            for index in range(window.sort_combo.count()):
+                samples.append(timed(window.sort_combo.setCurrentIndex, index))
+        results[f'sort_switch_{n}'] = summarize(samples)
+        close_window(window)
+    return results
+
+
+def bench_favorites(host, sizes):
+    """toggle_favorite on a sample of items; each toggle saves synchronously."""
+    results = {}
+    for n in sizes:
+        window = fresh_window(host)
+        window.add_items(synthetic_items(n, favorite=True))
+        pump()
+        items = window._get_all_items()
+        sample = random.Random(2).sample(items, min(50, len(items)))
+        samples = [timed(item.toggle_favorite) for item in sample]
+        samples += [timed(item.toggle_favorite) for item in sample]
+        results[f'favorite_toggle_{n}'] = summarize(samples)
+        close_window(window)
+    return results
+
+
+def bench_persistence(host, sizes):
+    """save_favorites, then a cold start: first screen and the full staged load."""
+    results = {}
+    for n in sizes:
+        window = fresh_window(host)
+        window.add_items(synthetic_items(n, favorite=True))
+        pump()
+        saves = [timed(window.save_favorites) for _ in range(5)]
+        size = os.path.getsize(ds.FAVORITES_FILE)
+        close_window(window)
+        results[f'save_favorites_{n}'] = summarize(saves, file_bytes=size)
+
+        started = time.perf_counter()
+        window = fresh_window(host, keep_data=True)
+        first_screen = time.perf_counter() - started
+        window._finish_staged_load()
+        full = time.perf_counter() - started
+        loaded = len(window._get_all_items())
+        close_window(window)
+        results[f'load_favorites_{n}'] = summarize(
+            [full], first_screen_ms=first_screen * 1000, items=loaded)
+    return results
+
+
+def bench_history(host, sizes):
+    """Clipboard capture throughput through the batch path the ingest queue feeds,
+    with the history already holding n entries (so every capture also trims)."""
+    results = {}
+    events = [(ds.ItemType(e['type']), e['content'])
+              for e in synthetic_items(HISTORY_EVENTS, seed=3)]
+    for n in sizes:
+        window = fresh_window(host)
+        window.max_history = n
+        # ISO-8601 times like real captures, one a minute up to now
+        start = datetime.now() - timedelta(minutes=n)
+        host.history.append([ds.history_record(e, (start + timedelta(minutes=i)).isoformat())
+                             for i, e in enumerate(synthetic_items(n, seed=4))])
+        samples = []
+        started = time.perf_counter()
+        for event in events:
+            samples.append(timed(window._apply_clipboard_batch, [event]))
+        total = time.perf_counter() - started
+        close_window(window)
+        results[f'history_capture_{n}'] = summarize(
+            samples, events_per_s=HISTORY_EVENTS / total)
+    return results
+
+
+BENCHMARKS = {   # name -> (function, which size list it runs over)
+    'add':         (bench_add_items, 'sizes'),
+    'search':      (bench_search, 'ui_sizes'),
+    'sort':        (bench_sort, 'ui_sizes'),
+    'favorites':   (bench_favorites, 'ui_sizes'),
+    'persistence': (bench_persistence, 'sizes'),
+    'history':     (bench_history, 'sizes'),
+}
+
+
+def compare(results, baseline, tolerance):
+    """Names of benchmarks whose median regressed beyond tolerance."""
+    regressions = []
+    for name, current in results.items():
+        old = baseline.get('results', {}).get(name)
+        if old and old.get('median') and current['median'] > old['median'] * tolerance:
+            regressions.append(f"{name}: {old['median']:.2f} -> {current['median']:.2f} {current['unit']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DropShelf headless benchmarks")
+    parser.add_argument('-o', '--output', help="write JSON here instead of stdout")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="item counts for add, save/load and history size (default %(default)s)")
+    parser.add_argument('--ui-sizes', default=','.join(map(str, DEFAULT_UI_SIZES)),
+                        help="item counts for search, sort and favorites (default %(default)s)")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS),
+                        help="run just these groups")
+    parser.add_argument('--baseline', help="earlier results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="allowed slowdown factor against --baseline")
+    args = parser.parse_args(argv)
+    sizes = {'sizes': [int(s) for s in args.sizes.split(',') if s],
+             'ui_sizes': [int(s) for s in args.ui_sizes.split(',') if s]}
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    host = BenchHost()
+    results = {}
+    try:
+        for name in args.only or BENCHMARKS:
+            print(f"running {name}...", file=sys.stderr)
+            func, size_list = BENCHMARKS[name]
+            results.update(func(host, sizes[size_list]))
+    finally:
+        shutil.rmtree(SCRATCH, ignore_errors=True)
+
+    report = {
+        'meta': run_metadata(sizes=sizes['sizes'], ui_sizes=sizes['ui_sizes']),
+        'results': results,
+    }
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+    else:
+        print(data)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
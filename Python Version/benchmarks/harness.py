@@ -0,0 +1,123 @@
+"""
+Shared scaffolding for the benchmark and soak scripts.
+
+Importing this module points DropShelf at a throwaway data directory and
+Qt at the offscreen platform before DropShelf itself is imported, so the
+scripts never touch a real profile or need a display.
+"""
+import os
+import sys
+import random
+import statistics
+import time
+import logging
+import platform
+import tempfile
+
+# Everything DropShelf reads or writes goes to a scratch directory
+SCRATCH = tempfile.mkdtemp(prefix='dropshelf-bench-')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+for var in ('XDG_DATA_HOME', 'APPDATA', 'HOME'):
+    os.environ[var] = SCRATCH
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DropShelf as ds
+from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+logging.getLogger('DropShelf').setLevel(logging.WARNING)
+
+
+class BenchHost:
+    """Stands in for DropShelfDaemon, so the window skips the tray, hotkey and socket."""
+    def __init__(self):
+        self.blob_store = ds.BlobStore()
+        self.classifier = ds.ContentClassifier()
+        self.archive = ds.ShelfArchive(blob_store=self.blob_store)
+        self.history = ds.ClipboardHistory(self.blob_store)
+
+    def set_hotkey(self, hotkey):
+        pass
+
+    def hide_window(self):
+        pass
+
+
+def pump():
+    QApplication.processEvents()
+
+
+def fresh_window(host, keep_data=False):
+    if not keep_data:
+        for name in os.listdir(ds.DATA_DIR):
+            if name.endswith('.json'):
+                os.remove(os.path.join(ds.DATA_DIR, name))
+        host.archive.clear()
+        host.history.clear()
+    window = ds.DropShelfWindow(host=host)
+    window.resize(360, 800)
+    window.show()
+    pump()
+    return window
+
+
+def close_window(window):
+    window._startup_steps.clear()
+    window.release()
+    window.deleteLater()
+    pump()
+
+
+def synthetic_items(n, favorite=False, seed=0):
+    """Mixed shelf entries: about half text, a third URLs, the rest file paths."""
+    rng = random.Random(seed)
+    words = ["report", "invoice", "draft", "notes", "2024", "meeting", "budget",
+             "final", "scan", "photo", "readme", "config", "todo", "backup"]
+    items = []
+    for i in range(n):
+        phrase = " ".join(rng.choice(words) for _ in range(rng.randint(2, 8)))
+        roll = rng.random()
+        if roll < 0.5:
+            entry = {'type': ds.ItemType.TEXT.value, 'content': f"{phrase} #{i}"}
+        elif roll < 0.83:
+            # .invalid never resolves, so title fetches fail fast and offline
+            entry = {'type': ds.ItemType.URL.value,
+                     'content': f"https://site{i % 97}.invalid/{phrase.replace(' ', '-')}/{i}"}
+        else:
+            entry = {'type': ds.ItemType.FILE.value,
+                     'content': os.path.join(SCRATCH, 'files', f"{phrase.replace(' ', '_')}_{i}.txt")}
+        entry['is_favorite'] = favorite
+        entry['use_count'] = rng.randint(0, 50)
+        entry['tags'] = [rng.choice(words)] if rng.random() < 0.2 else []
+        items.append(entry)
+    return items
+
+
+def run_metadata(**extra):
+    """Environment header for a results file."""
+    meta = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'qpa': os.environ['QT_QPA_PLATFORM'],
+    }
+    meta.update(extra)
+    return meta
+
+
+def summarize(samples, unit='ms', **extra):
+    """Timing summary for a list of per-operation durations in seconds."""
+    ordered = sorted(samples)
+    scale = 1000.0 if unit == 'ms' else 1.0
+    result = {
+        'unit': unit,
+        'n': len(ordered),
+        'median': statistics.median(ordered) * scale,
+        'mean': statistics.fmean(ordered) * scale,
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * scale,
+        'max': ordered[-1] * scale,
+    }
+    result.update(extra)
+    return result
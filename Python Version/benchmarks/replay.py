@@ -0,0 +1,261 @@
+"""
+Replay a clipboard trace recorded by DropShelf against a fresh shelf.
+
+    python benchmarks/replay.py TRACE.jsonl [--speed 1] [--max-gap 5]
+                                            [--top 10] [-o report.json]
+
+Traces hold only types, sizes and keyed hashes, so every payload is replaced
+by synthetic content of the same type and size. Equal hashes get equal
+content, which keeps dedup and coalescing behaving as they did. Clipboard
+events go through the real QClipboard, _on_clipboard_change and the ingest
+queue; drops call add_items as dropEvent does; edits rewrite the matching
+item. The report gives each event's latency (injection until the shelf has
+applied it) and the GUI-thread time spent applying it.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from collections import deque
+
+from harness import SCRATCH, ds, BenchHost, pump, fresh_window, close_window, summarize, run_metadata
+from PyQt6.QtCore import QTimer, QEventLoop, QUrl, QMimeData
+from PyQt6.QtGui import QImage, QColor
+from PyQt6.QtWidgets import QApplication
+
+SETTLE_S = 3.0   # how long to wait for stragglers after the last event
+
+
+def load_trace(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    header = events[0] if events and events[0].get('ev') == 'start' else {}
+    if header.get('version', 1) > ds.ClipboardRecorder.VERSION:
+        raise SystemExit(f"{path}: trace version {header['version']} is newer than this tool")
+    return [e for e in events if e.get('ev') in ('clipboard', 'drop', 'edit')]
+
+
+class Synthesizer:
+    """Deterministic stand-in content for a traced (type, size, hash)."""
+    def __init__(self, root):
+        self.files_dir = os.path.join(root, 'replay-files')
+        os.makedirs(self.files_dir, exist_ok=True)
+
+    def content(self, item):
+        kind, size, digest = item['type'], item.get('size', 0), item.get('hash', '0' * 16)
+        if kind == ds.ItemType.URL.value:
+            base = f"https://{digest[:8]}.invalid/"
+            return base + (digest * (size // len(digest) + 1))[:max(0, size - len(base))]
+        if kind == ds.ItemType.FILE.value:
+            path = os.path.join(self.files_dir, digest + '.txt')
+            if not os.path.exists(path):
+                open(path, 'w').close()
+            return path
+        # No whitespace: the capture path strips it, and edits match on content
+        return (digest * (size // len(digest) + 1))[:max(size, 1)]
+
+    def image(self, item):
+        image = QImage(max(1, item.get('w', 64)), max(1, item.get('h', 64)),
+                       QImage.Format.Format_RGB32)
+        digest = item.get('hash', '000000')
+        image.fill(QColor('#' + digest[:6]))
+        return image
+
+
+class Replayer:
+    def __init__(self, window, events, speed, max_gap):
+        self.window = window
+        self.events = events
+        self.synth = Synthesizer(SCRATCH)
+        self.clipboard = QApplication.clipboard()
+        self.results = [None] * len(events)
+        self._pending_clip = deque()     # event indexes waiting for an ingest batch
+        self._pending_images = deque()   # (event index, "Image WxH" label)
+        self._injected = {}              # event index -> perf_counter at injection
+        self._next = 0
+        self._last_injected = None
+        self.loop = QEventLoop()
+
+        # Replay schedule: recorded gaps scaled by speed, capped at max_gap
+        self.delays = []
+        previous = events[0]['t'] if events else 0
+        for event in events:
+            gap = max(0.0, event['t'] - previous)
+            previous = event['t']
+            gap = gap / speed if speed > 0 else 0.0
+            self.delays.append(min(gap, max_gap) if max_gap is not None else gap)
+
+        # Time the shelf's own slots by standing in front of them
+        window.ingest.batch_ready.disconnect(window._apply_clipboard_batch)
+        window.ingest.batch_ready.connect(self._on_batch)
+        window.image_capture.image_ready.disconnect(window._apply_clipboard_image)
+        window.image_capture.image_ready.connect(self._on_image)
+
+    def run(self):
+        if self.events:
+            QTimer.singleShot(int(self.delays[0] * 1000), self._inject_next)
+            self.loop.exec()
+
+    def _inject_next(self):
+        index = self._next
+        event = self.events[index]
+        if event['ev'] == 'edit' and self._pending_clip:
+            # The user edited something already on the shelf; at high speeds
+            # it can still be sitting in the ingest queue
+            QTimer.singleShot(10, self._inject_next)
+            return
+        self._next += 1
+        try:
+            getattr(self, '_inject_' + event['ev'])(index, event)
+        except Exception as e:
+            print(f"event {index} ({event['ev']}) failed: {e!r}", file=sys.stderr)
+        self._last_injected = time.perf_counter()
+        if self._next < len(self.events):
+            QTimer.singleShot(int(self.delays[self._next] * 1000), self._inject_next)
+        else:
+            self._wait_for_stragglers()
+
+    def _wait_for_stragglers(self):
+        if not (self._pending_clip or self._pending_images) or \
+                time.perf_counter() - self._last_injected > SETTLE_S:
+            self.loop.quit()
+        else:
+            QTimer.singleShot(50, self._wait_for_stragglers)
+
+    def _finish(self, index, latency, apply_time, **extra):
+        event = self.events[index]
+        self.results[index] = dict(
+            index=index, t=event['t'], ev=event['ev'], items=len(event.get('items', [1])),
+            latency_ms=round(latency * 1000, 3), apply_ms=round(apply_time * 1000, 3), **extra)
+
+    # ── Injection ──
+    def _inject_clipboard(self, index, event):
+        items = event['items']
+        self._injected[index] = time.perf_counter()
+        if items[0]['type'] == ds.ItemType.IMAGE.value:
+            item = items[0]
+            self._pending_images.append((index, f"Image {item.get('w')}×{item.get('h')}"))
+            self.clipboard.setImage(self.synth.image(item))
+            return
+        self._pending_clip.append(index)
+        if all(item['type'] == ds.ItemType.FILE.value for item in items):
+            mime = QMimeData()
+            mime.setUrls([QUrl.fromLocalFile(self.synth.content(item)) for item in items])
+            self.clipboard.setMimeData(mime)
+        else:
+            self.clipboard.setText('\n'.join(self.synth.content(item) for item in items))
+
+    def _inject_drop(self, index, event):
+        batch = [{'type': ds.ItemType(item['type']), 'content': self.synth.content(item)}
+                 for item in event['items']]
+        started = time.perf_counter()
+        self.window.add_items(batch)
+        elapsed = time.perf_counter() - started
+        self._finish(index, elapsed, elapsed)
+
+    def _inject_edit(self, index, event):
+        old = self.synth.content(event['old'])
+        target = next((w for w in self.window._get_all_items()
+                       if w.data_type == ds.ItemType.TEXT and w.content == old), None)
+        if target is None:
+            self._finish(index, 0.0, 0.0, missed=True)
+            return
+        started = time.perf_counter()
+        target.content = self.synth.content(event['item'])
+        self.window.save_favorites()
+        elapsed = time.perf_counter() - started
+        self._finish(index, elapsed, elapsed)
+
+    # ── Completion ──
+    def _on_batch(self, entries):
+        started = time.perf_counter()
+        self.window._apply_clipboard_batch(entries)
+        done = time.perf_counter()
+        # A flush releases everything the ingest queue held, so every
+        # clipboard event injected so far is now on the shelf
+        while self._pending_clip:
+            index = self._pending_clip.popleft()
+            self._finish(index, done - self._injected.pop(index), done - started,
+                         batch=len(entries))
+
+    def _on_image(self, entry):
+        started = time.perf_counter()
+        self.window._apply_clipboard_image(entry)
+        done = time.perf_counter()
+        for position, (index, label) in enumerate(self._pending_images):
+            if label == entry.get('content'):
+                # Older ones with the same picture were dropped as duplicates
+                for _ in range(position):
+                    skipped, _ = self._pending_images.popleft()
+                    self._finish(skipped, 0.0, 0.0, deduplicated=True)
+                self._pending_images.popleft()
+                self._finish(index, done - self._injected.pop(index), done - started)
+                break
+
+
+def build_report(events, results, args, top):
+    finished = [r for r in results if r is not None]
+    applied = [r for r in finished if not (r.get('missed') or r.get('deduplicated'))]
+    summary = {}
+    for kind in ('clipboard', 'drop', 'edit'):
+        rows = [r for r in applied if r['ev'] == kind]
+        if rows:
+            summary[kind] = {
+                'latency': summarize([r['latency_ms'] / 1000 for r in rows]),
+                'apply': summarize([r['apply_ms'] / 1000 for r in rows]),
+            }
+    return {
+        'meta': run_metadata(trace=os.path.abspath(args.trace), speed=args.speed,
+                             max_gap=args.max_gap, events=len(events)),
+        'summary': summary,
+        'unfinished': len(results) - len(finished),
+        'missed_edits': sum(1 for r in finished if r.get('missed')),
+        'deduplicated_images': sum(1 for r in finished if r.get('deduplicated')),
+        'slowest': sorted(applied, key=lambda r: r['latency_ms'], reverse=True)[:top],
+        'events': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a DropShelf clipboard trace")
+    parser.add_argument('trace', help="a .jsonl trace from Record Clipboard / 'dropshelf_cli.py record'")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="time compression; 10 replays ten times faster, 0 as fast as possible")
+    parser.add_argument('--max-gap', type=float, default=5.0,
+                        help="longest pause between events, in replay seconds")
+    parser.add_argument('--top', type=int, default=10, help="slowest events to list")
+    parser.add_argument('-o', '--output', help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    events = load_trace(args.trace)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = fresh_window(BenchHost())
+    try:
+        deadline = time.monotonic() + 2
+        while window._startup_steps and time.monotonic() < deadline:
+            pump()
+        replayer = Replayer(window, events, args.speed, args.max_gap)
+        replayer.run()
+        results = replayer.results
+    finally:
+        close_window(window)
+        shutil.rmtree(SCRATCH, ignore_errors=True)
+
+    report = build_report(events, results, args, args.top)
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+    else:
+        print(data)
+    for kind, stats in report['summary'].items():
+        print(f"{kind:<9} n={stats['latency']['n']:<6} latency median {stats['latency']['median']:.1f} ms"
+              f"  p95 {stats['latency']['p95']:.1f} ms  apply p95 {stats['apply']['p95']:.1f} ms",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
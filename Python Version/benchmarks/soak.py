@@ -0,0 +1,285 @@
+"""
+Soak test: days of clipboard churn compressed into minutes.
+
+    python benchmarks/soak.py [--events 20000] [--rate 200] [--samples 40]
+                              [--seed 0] [-o soak.json]
+
+A fake clipboard driver copies text, URLs, file paths and images through the
+real QClipboard, so every event goes through _on_clipboard_change, the
+ingest queue and image capture. Deletes, undo, sort and filter changes,
+searches, tab switches, theme refreshes and favorite toggles are mixed in.
+RSS, live QObjects, threads and open file descriptors are sampled as it
+runs; the exit status is 1 if any of them is still climbing after warm-up.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import random
+import shutil
+import argparse
+import threading
+import statistics
+
+from harness import SCRATCH, ds, BenchHost, pump, fresh_window, close_window, run_metadata
+from PyQt6.QtCore import QObject, QTimer, QEventLoop, QUrl, QMimeData
+from PyQt6.QtGui import QImage, QColor
+from PyQt6.QtWidgets import QApplication
+
+WARMUP_FRACTION = 0.25   # samples ignored while caches and pools fill up
+
+# metric -> (relative, absolute) growth allowed between the first and last
+# third of the post-warm-up samples
+GROWTH_TOLERANCE = {
+    'rss':       (0.10, 16 * 1024 * 1024),
+    'qobjects':  (0.05, 50),
+    'threads':   (0.0, 2),
+    'fds':       (0.0, 4),
+}
+
+# action -> relative weight per event
+ACTIONS = {
+    'copy_text': 50, 'copy_url': 15, 'copy_files': 6, 'copy_image': 2,
+    'delete': 8, 'undo': 3, 'sort': 3, 'filter': 2, 'search': 4,
+    'tab': 3, 'theme': 1, 'favorite': 3,
+}
+
+
+def live_qobjects(app):
+    """QObjects reachable from the application and its top-level widgets."""
+    objects = set(app.findChildren(QObject))
+    for widget in app.topLevelWidgets():
+        objects.add(widget)
+        objects.update(widget.findChildren(QObject))
+    return len(objects)
+
+
+def open_fds():
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def os_threads():
+    try:
+        return len(os.listdir('/proc/self/task'))
+    except OSError:
+        return threading.active_count()
+
+
+class FakeClipboard:
+    """Copies synthetic content through the real QClipboard, as another app would."""
+    def __init__(self, rng):
+        self.rng = rng
+        self.clipboard = QApplication.clipboard()
+        self.files_dir = os.path.join(SCRATCH, 'files')
+        os.makedirs(self.files_dir, exist_ok=True)
+        # A bounded pool, so re-copies exercise dedup like real use does
+        self.texts = [f"note {i}: " + " ".join(rng.choice("lorem ipsum dolor sit amet".split())
+                                               for _ in range(rng.randint(3, 40)))
+                      for i in range(3000)]
+        self.urls = [f"https://site{i % 120}.invalid/page/{i}" for i in range(2000)]
+
+    def copy_text(self):
+        text = self.rng.choice(self.texts)
+        if self.rng.random() < 0.02:
+            text = text * 4000   # occasionally large enough to go out of line
+        self.clipboard.setText(text)
+
+    def copy_url(self):
+        self.clipboard.setText(self.rng.choice(self.urls))
+
+    def copy_files(self):
+        paths = []
+        for _ in range(self.rng.randint(1, 3)):
+            path = os.path.join(self.files_dir, f"file_{self.rng.randint(0, 500)}.txt")
+            if not os.path.exists(path):
+                open(path, 'w').close()
+            paths.append(path)
+        mime = QMimeData()
+        mime.setUrls([QUrl.fromLocalFile(p) for p in paths])
+        self.clipboard.setMimeData(mime)
+
+    def copy_image(self):
+        image = QImage(self.rng.randint(64, 640), self.rng.randint(64, 480),
+                       QImage.Format.Format_RGB32)
+        image.fill(QColor(self.rng.randint(0, 255), self.rng.randint(0, 255),
+                          self.rng.randint(0, 255)))
+        self.clipboard.setImage(image)
+
+
+class Soak:
+    def __init__(self, window, args):
+        self.window = window
+        self.rng = random.Random(args.seed)
+        self.driver = FakeClipboard(self.rng)
+        self.events = args.events
+        self.sample_every = max(1, args.events // args.samples)
+        self.done = 0
+        self.counts = dict.fromkeys(ACTIONS, 0)
+        self.samples = []
+        self.error = None
+        self.started = time.perf_counter()
+        self._names = list(ACTIONS)
+        self._weights = list(ACTIONS.values())
+        self.loop = QEventLoop()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.step)
+        self.timer.start(max(1, int(1000 / args.rate)))
+
+    def run(self):
+        self.sample()
+        self.loop.exec()
+        self.timer.stop()
+        self.sample()
+
+    def step(self):
+        action = self.rng.choices(self._names, self._weights)[0]
+        handler = getattr(self.driver if action.startswith('copy_') else self, action)
+        try:
+            handler()
+        except Exception as e:
+            # An exception escaping a slot would abort the process
+            self.error = f"{action}: {e!r}"
+            self.loop.quit()
+            return
+        self.counts[action] += 1
+        self.done += 1
+        if self.done % self.sample_every == 0:
+            self.sample()
+        if self.done >= self.events:
+            self.loop.quit()
+
+    # ── Shelf actions ──
+    def _visible_items(self):
+        return [w for w in self.window._get_all_items() if w.isVisible()]
+
+    def delete(self):
+        items = self._visible_items()
+        if items:
+            self.window.handle_item_deletion_request(self.rng.choice(items))
+
+    def undo(self):
+        self.window.undo_delete()
+
+    def sort(self):
+        combo = self.window.sort_combo
+        self.window.sort_ascending = self.rng.random() < 0.5
+        combo.setCurrentIndex(self.rng.randrange(combo.count()))
+
+    def filter(self):
+        combo = self.window.filter_combo
+        combo.setCurrentIndex(self.rng.randrange(combo.count()))
+
+    def search(self):
+        if self.window.search_input.text() or self.rng.random() < 0.5:
+            self.window.search_input.clear()
+        else:
+            self.window.search_input.setText(self.rng.choice(["note", "site1", "ipsum", "file_"]))
+
+    def tab(self):
+        self.window.switch_tab(self.rng.choice(["all", "fav", "history"]))
+
+    def theme(self):
+        self.window.apply_theme()
+
+    def favorite(self):
+        items = self._visible_items()
+        if items:
+            self.rng.choice(items).toggle_favorite()
+
+    # ── Sampling ──
+    def sample(self):
+        gc.collect()
+        app = QApplication.instance()
+        self.samples.append({
+            'events': self.done,
+            'elapsed_s': round(time.perf_counter() - self.started, 2),
+            'rss': ds.process_rss(),
+            'qobjects': live_qobjects(app),
+            'threads': os_threads(),
+            'fds': open_fds(),
+            'items': len(self.window._get_all_items()),
+            'history': len(self.window.clipboard_history),
+            'undo': len(self.window.undo_stack),
+        })
+        last = self.samples[-1]
+        print(f"{last['events']:>7} events  rss {ds.format_bytes(last['rss'] or 0):>9}  "
+              f"qobjects {last['qobjects']:>6}  threads {last['threads']:>3}  "
+              f"fds {last['fds']}  items {last['items']}", file=sys.stderr)
+
+
+def growth_verdict(samples):
+    """Per metric: the first and last third of the post-warm-up samples, and whether it grew."""
+    steady = samples[int(len(samples) * WARMUP_FRACTION):]
+    third = max(1, len(steady) // 3)
+    verdict = {}
+    for metric, (relative, absolute) in GROWTH_TOLERANCE.items():
+        values = [s[metric] for s in steady if s[metric] is not None]
+        if len(values) < 3:
+            continue
+        first = statistics.mean(values[:third])
+        last = statistics.mean(values[-third:])
+        rising = sum(1 for a, b in zip(values, values[1:]) if b > a)
+        growing = (last > first * (1 + relative) + absolute
+                   and rising >= (len(values) - 1) / 2)
+        verdict[metric] = {'first': round(first), 'last': round(last),
+                           'rising_steps': rising, 'growing': growing}
+    return verdict
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DropShelf soak test")
+    parser.add_argument('--events', type=int, default=20000, help="actions to run (default %(default)s)")
+    parser.add_argument('--rate', type=float, default=200, help="actions per second to aim for")
+    parser.add_argument('--samples', type=int, default=40, help="resource samples to take")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    host = BenchHost()
+    window = fresh_window(host)
+    try:
+        # Let the staged startup finish so its services count as baseline
+        deadline = time.monotonic() + 2
+        while window._startup_steps and time.monotonic() < deadline:
+            pump()
+        soak = Soak(window, args)
+        soak.run()
+    finally:
+        close_window(window)
+        shutil.rmtree(SCRATCH, ignore_errors=True)
+
+    verdict = growth_verdict(soak.samples)
+    failed = sorted(m for m, v in verdict.items() if v['growing'])
+    if soak.error:
+        print(f"ERROR {soak.error}", file=sys.stderr)
+        failed.append('error')
+    report = {
+        'meta': run_metadata(events=args.events, rate=args.rate, seed=args.seed),
+        'actions': soak.counts,
+        'samples': soak.samples,
+        'verdict': verdict,
+        'error': soak.error,
+        'ok': not failed,
+    }
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+    else:
+        print(data)
+    for metric in failed:
+        if metric in verdict:
+            v = verdict[metric]
+            print(f"GROWING {metric}: {v['first']} -> {v['last']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Command-line client for a running DropShelf.
+
+    python dropshelf_cli.py add <path|url|text> [...] [--tag TAG] [--fav]
+    python dropshelf_cli.py search <query> [--limit N] [--json]
+    python dropshelf_cli.py list [--type file|url|text|image] [--limit N] [--json]
+    python dropshelf_cli.py show | stats | export [FILE]
+    python dropshelf_cli.py trace start | stop | status | export [FILE]
+    python dropshelf_cli.py memory [report | snapshot | start | stop]
+    python dropshelf_cli.py record start [FILE] | stop | status
+
+Talks to the instance over its local socket using the length-prefixed JSON
+protocol served by DropShelf's CommandServer. Only the standard library
+modules it needs are imported, so a call finishes in tens of milliseconds.
+"""
+import sys
+import os
+import json
+import socket
+
+APP_ID = "DropShelf"
+COMMANDS = ('add', 'search', 'list', 'show', 'stats', 'export', 'trace', 'memory',
+            'record', 'help')
+CONNECT_TIMEOUT = 0.5
+REPLY_TIMEOUT   = 10.0
+
+
+class NotRunning(Exception):
+    pass
+
+
+def _server_path():
+    if sys.platform == 'win32':
+        return '\\\\.\\pipe\\' + APP_ID
+    # QLocalServer puts its socket in QDir::tempPath(), which honours TMPDIR
+    return os.path.join(os.environ.get('TMPDIR') or '/tmp', APP_ID)
+
+
+class _Connection:
+    """One request/reply channel: a Unix socket, or the named pipe on Windows."""
+    def __init__(self):
+        path = _server_path()
+        if sys.platform == 'win32':
+            try:
+                self._pipe = open(path, 'r+b', buffering=0)
+            except OSError:
+                raise NotRunning(path)
+            self._sock = None
+        else:
+            self._pipe = None
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                self._sock.connect(path)
+            except OSError:
+                self._sock.close()
+                raise NotRunning(path)
+            self._sock.settimeout(REPLY_TIMEOUT)
+
+    def _send(self, data):
+        if self._sock is not None:
+            self._sock.sendall(data)
+        else:
+            self._pipe.write(data)
+
+    def _recv_exact(self, n):
+        chunks = []
+        while n:
+            chunk = self._sock.recv(n) if self._sock is not None else self._pipe.read(n)
+            if not chunk:
+                raise ConnectionError("DropShelf closed the connection")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b''.join(chunks)
+
+    def request(self, obj):
+        body = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+        self._send(len(body).to_bytes(4, 'big') + body)
+        length = int.from_bytes(self._recv_exact(4), 'big')
+        return json.loads(self._recv_exact(length).decode('utf-8'))
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+        else:
+            self._pipe.close()
+
+
+def send(obj):
+    """Send one command to the running instance and return its reply dict."""
+    conn = _Connection()
+    try:
+        return conn.request(obj)
+    finally:
+        conn.close()
+
+
+def is_command(argv):
+    """True when argv (without the program name) starts with a CLI subcommand."""
+    return bool(argv) and argv[0].lower() in COMMANDS
+
+
+def try_show():
+    """Ask a running instance to show itself; False if none is listening."""
+    try:
+        return send({'cmd': 'SHOW'}).get('ok', False)
+    except (NotRunning, OSError, ValueError):
+        return False
+
+
+def _usage():
+    print("usage:\n" + __doc__.strip().split('\n\n')[1], file=sys.stderr)
+    return 2
+
+
+def _parse(args):
+    """Split argv into positionals and --options (flags map to True)."""
+    positional, options = [], {'tag': []}
+    it = iter(args)
+    for arg in it:
+        if arg in ('--fav', '--json'):
+            options[arg[2:]] = True
+        elif arg in ('--tag', '--type', '--limit'):
+            value = next(it, None)
+            if value is None:
+                raise ValueError(f"{arg} needs a value")
+            if arg == '--tag':
+                options['tag'].append(value)
+            else:
+                options[arg[2:]] = value
+        elif arg.startswith('--'):
+            raise ValueError(f"unknown option {arg}")
+        else:
+            positional.append(arg)
+    return positional, options
+
+
+def _print_items(reply, as_json):
+    if as_json:
+        print(json.dumps(reply, ensure_ascii=False, indent=2))
+        return
+    for item in reply.get('items', []):
+        star = '*' if item.get('is_favorite') else ' '
+        content = str(item.get('content', '')).replace('\n', ' ')
+        print(f"{star} {item.get('type', '?'):5}  {content[:200]}")
+    shown = len(reply.get('items', []))
+    if reply.get('total', shown) > shown:
+        print(f"({shown} of {reply['total']})", file=sys.stderr)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        return _usage()
+    command, rest = argv[0].lower(), argv[1:]
+    try:
+        positional, opts = _parse(rest)
+        if command == 'add':
+            if positional == ['-']:
+                positional = [sys.stdin.read()]
+            if not positional:
+                return _usage()
+            items = []
+            for value in positional:
+                # Relative paths only mean something in this shell's directory
+                if os.path.exists(value):
+                    value = os.path.abspath(value)
+                items.append({'content': value, 'tags': opts['tag'],
+                              'favorite': opts.get('fav', False)})
+                if opts.get('type'):
+                    items[-1]['type'] = opts['type']
+            reply = send({'cmd': 'ADD_BATCH', 'items': items})
+            if reply.get('ok'):
+                print(f"Added {reply['added']} item(s)")
+        elif command in ('search', 'list'):
+            request = {'cmd': command.upper()}
+            if command == 'search':
+                if not positional:
+                    return _usage()
+                request['query'] = ' '.join(positional)
+            if opts.get('type'):
+                request['type'] = opts['type']
+            if opts.get('limit'):
+                request['limit'] = int(opts['limit'])
+            reply = send(request)
+            if reply.get('ok'):
+                _print_items(reply, opts.get('json', False))
+        elif command == 'show':
+            reply = send({'cmd': 'SHOW'})
+        elif command == 'stats':
+            reply = send({'cmd': 'STATS'})
+            if reply.get('ok'):
+                print(json.dumps({k: v for k, v in reply.items() if k != 'ok'}, indent=2))
+        elif command == 'export':
+            reply = send({'cmd': 'EXPORT'})
+            if reply.get('ok'):
+                data = json.dumps(reply['items'], indent=2)
+                if positional:
+                    with open(positional[0], 'w', encoding='utf-8') as f:
+                        f.write(data)
+                    print(f"Exported {len(reply['items'])} items to {positional[0]}")
+                else:
+                    print(data)
+        elif command == 'trace':
+            action = positional[0].lower() if positional else 'status'
+            reply = send({'cmd': 'TRACE', 'action': action})
+            if reply.get('ok'):
+                if action != 'export':
+                    state = 'recording' if reply['enabled'] else 'stopped'
+                    print(f"Tracing {state}, {reply['spans']} span(s) buffered")
+                elif len(positional) > 1:
+                    with open(positional[1], 'w', encoding='utf-8') as f:
+                        json.dump(reply['trace'], f)
+                    print(f"Wrote {len(reply['trace']['traceEvents'])} events to {positional[1]}")
+                else:
+                    print(json.dumps(reply['trace']))
+        elif command == 'record':
+            request = {'cmd': 'RECORD', 'action': positional[0].lower() if positional else 'status'}
+            if len(positional) > 1:
+                request['path'] = os.path.abspath(positional[1])
+            reply = send(request)
+            if reply.get('ok'):
+                state = 'recording' if reply['recording'] else 'stopped'
+                print(f"Clipboard trace {state}: {reply['path'] or '-'} ({reply['events']} events)")
+        elif command == 'memory':
+            action = positional[0].lower() if positional else 'report'
+            reply = send({'cmd': 'MEMORY', 'action': action})
+            if reply.get('ok'):
+                print(json.dumps({k: v for k, v in reply.items() if k != 'ok'}, indent=2))
+        else:
+            return _usage()
+    except NotRunning:
+        print("DropShelf is not running.", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not reply.get('ok'):
+        print(f"Error: {reply.get('error', 'unknown error')}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""Which launches DropShelf.py hands to dropshelf_cli.  python -m pytest tests"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dropshelf_cli
+
+
+class IsCommandTest(unittest.TestCase):
+    def test_subcommands_go_to_the_cli(self):
+        for argv in (['search', 'foo'], ['ADD', 'x'], ['stats'], ['help']):
+            self.assertTrue(dropshelf_cli.is_command(argv), argv)
+
+    def test_app_options_start_the_app(self):
+        for argv in ([], ['--daemon'], ['--daemon', '-platform', 'offscreen'],
+                     ['-platform', 'offscreen'], ['-style', 'fusion']):
+            self.assertFalse(dropshelf_cli.is_command(argv), argv)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""ClipboardIngest burst coalescing.  python -m pytest tests"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# DropShelf creates its data directory and log file on import
+SCRATCH = tempfile.mkdtemp(prefix='dropshelf-test-')
+for var in ('XDG_DATA_HOME', 'APPDATA', 'HOME'):
+    os.environ[var] = SCRATCH
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DropShelf as ds
+from PyQt6.QtCore import QCoreApplication
+
+TEXT = ds.ItemType.TEXT
+
+
+class ClipboardIngestTest(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.ingest = ds.ClipboardIngest()
+        self.batches = []
+        self.ingest.batch_ready.connect(self.batches.append)
+
+    def test_fractional_wait_arms_timer(self):
+        # A burst that's been open a non-whole number of ms used to hand
+        # QTimer.start() a float and raise TypeError
+        with mock.patch.object(ds.time, 'monotonic', side_effect=[100.0, 100.2137]):
+            self.ingest.submit([(TEXT, "a")])
+            self.ingest.submit([(TEXT, "b")])
+        self.assertTrue(self.ingest._timer.isActive())
+        self.assertEqual(self.ingest._timer.interval(), ds.CLIPBOARD_COALESCE_MS)
+
+    def test_burst_capped_at_max_delay(self):
+        with mock.patch.object(ds.time, 'monotonic', side_effect=[100.0, 100.5]):
+            self.ingest.submit([(TEXT, "a")])
+            self.ingest.submit([(TEXT, "b")])
+        self.assertEqual(self.ingest._timer.interval(), ds.CLIPBOARD_MAX_DELAY_MS - 500)
+
+    def test_repeats_collapse_in_arrival_order(self):
+        for text in ("a", "b", "a", "c"):
+            self.ingest.submit([(TEXT, text)])
+        self.ingest.flush()
+        self.assertEqual(self.batches, [[(TEXT, "b"), (TEXT, "a"), (TEXT, "c")]])
+        self.assertIsNone(self.ingest._burst_started)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""CommandServer startup against live and stale sockets.  python -m pytest tests"""
+import os
+import sys
+import json
+import socket
+import tempfile
+import unittest
+from unittest import mock
+
+# DropShelf creates its data directory and log file on import
+SCRATCH = tempfile.mkdtemp(prefix='dropshelf-test-')
+for var in ('XDG_DATA_HOME', 'APPDATA', 'HOME'):
+    os.environ[var] = SCRATCH
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DropShelf as ds
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtNetwork import QLocalServer
+
+
+@unittest.skipIf(sys.platform == 'win32', "stale socket files are a Unix thing")
+class CommandServerStartTest(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        patcher = mock.patch.object(ds, 'APP_ID', f"dropshelf-test-{os.getpid()}-{id(self)}")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(QLocalServer.removeServer, ds.APP_ID)
+
+    def test_live_instance_keeps_its_socket(self):
+        first = ds.CommandServer(backend=None)
+        self.assertTrue(first.server.isListening())
+        second = ds.CommandServer(backend=None)
+        self.assertFalse(second.server.isListening())
+        # The running instance is still reachable
+        self.assertTrue(os.path.exists(first.server.fullServerName()))
+        self.assertTrue(ds.CommandServer._server_alive(ds.APP_ID))
+        second.close()
+        first.close()
+
+    def test_stale_socket_is_replaced(self):
+        probe = ds.CommandServer(backend=None)
+        path = probe.server.fullServerName()
+        probe.close()
+        # What a crashed instance leaves behind: a socket file nobody listens on
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(path)
+        stale.close()
+        self.assertTrue(os.path.exists(path))
+        server = ds.CommandServer(backend=None)
+        self.assertTrue(server.server.isListening())
+        self.assertTrue(ds.CommandServer._server_alive(ds.APP_ID))
+        server.close()
+
+
+
+class _Backend:
+    """Just enough of DropShelfWindow for ADD: records what would be added."""
+    def __init__(self):
+        self.added = []
+        self.classifier = ds.ContentClassifier()
+
+    def add_items(self, batch):
+        self.added.extend(batch)
+        return batch
+
+
+class CommandServerAddTest(unittest.TestCase):
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        patcher = mock.patch.object(ds, 'APP_ID', f"dropshelf-test-{os.getpid()}-{id(self)}")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = _Backend()
+        self.server = ds.CommandServer(self.backend)
+        self.addCleanup(self.server.close)
+
+    def dispatch(self, request):
+        return self.server._dispatch(json.dumps(request).encode('utf-8'))
+
+    def test_explicit_types_accepted(self):
+        for dtype in ('text', 'url', 'file'):
+            entries = self.server._item_entries({'type': dtype, 'content': 'x'})
+            self.assertEqual(entries[0]['type'], ds.ItemType(dtype))
+
+    def test_image_type_rejected(self):
+        # An image without a blob would break EXPORT for the whole shelf
+        with self.assertRaises(ValueError):
+            self.server._item_entries({'type': 'image', 'content': 'hello'})
+        with self.assertRaises(ValueError):
+            self.server._item_entries({'type': 'bogus', 'content': 'hello'})
+
+    def test_batch_with_image_adds_nothing(self):
+        reply = self.dispatch({'cmd': 'ADD_BATCH', 'items': [
+            {'type': 'text', 'content': 'fine'}, {'type': 'image', 'content': 'hello'}]})
+        self.assertFalse(reply['ok'])
+        self.assertEqual(self.backend.added, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+"""
+AsyncFetchEngine and TitleFetchService against a local stand-in HTTP server.
+
+    python -m pytest tests        (or: python -m unittest discover tests)
+
+The stand-in speaks raw HTTP/1.1 over a socketserver, so each test controls
+keep-alive, body pacing and hangs exactly.
+"""
+import os
+import sys
+import time
+import tempfile
+import threading
+import socketserver
+import unittest
+import concurrent.futures
+from unittest import mock
+
+# DropShelf creates its data directory and log file on import
+SCRATCH = tempfile.mkdtemp(prefix='dropshelf-test-')
+for var in ('XDG_DATA_HOME', 'APPDATA', 'HOME'):
+    os.environ[var] = SCRATCH
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DropShelf as ds
+from PyQt6.QtCore import QCoreApplication
+
+TITLE_RU = "Привет, мир"
+
+
+def respond(handler, body, content_type='text/html', extra=b''):
+    handler.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Type: " + content_type.encode() +
+                        b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\n" +
+                        extra + b"\r\n" + body)
+
+
+class StandIn(socketserver.ThreadingTCPServer):
+    """HTTP/1.1 server on 127.0.0.1 whose routes write raw responses."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, routes):
+        self.routes = routes        # path -> fn(handler); returning False closes
+        self.connections = 0
+        self.requests = []
+        self.closed_by_client = threading.Event()
+        self.release = threading.Event()   # lets hanging routes finish
+        super().__init__(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def stop(self):
+        self.release.set()
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        try:
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                path = line.split()[1].decode()
+                while self.rfile.readline() not in (b'\r\n', b''):
+                    pass
+                self.server.requests.append(path)
+                if self.server.routes[path](self) is False:
+                    return
+        except OSError:
+            pass   # the client hung up mid-response
+
+
+def page(handler):
+    respond(handler, b"<html><head><title>Hello</title></head><body>hi</body></html>")
+
+
+def slow_tail(handler):
+    """The title arrives at once; the rest of a 1 MB body only after release."""
+    head = b"<html><head><title>Early</title></head><body>"
+    handler.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                        b"Content-Length: 1000000\r\n\r\n" + head)
+    handler.wfile.flush()
+    handler.server.release.wait(5)
+    handler.wfile.write(b"x" * (1000000 - len(head)))
+    return False
+
+
+def header_charset(handler):
+    # The header wins over a contradicting <meta>
+    body = ('<html><head><meta charset="utf-8"><title>' + TITLE_RU +
+            '</title></head></html>').encode('windows-1251')
+    respond(handler, body, 'text/html; charset=windows-1251')
+
+
+def meta_charset(handler):
+    body = ('<html><head><meta charset="koi8-r"><title>' + TITLE_RU +
+            '</title></head></html>').encode('koi8-r')
+    respond(handler, body)
+
+
+def hang(handler):
+    """Read the request, never answer, and note when the client gives up."""
+    handler.connection.settimeout(5)
+    try:
+        if handler.rfile.read(1) == b'':
+            handler.server.closed_by_client.set()
+    except OSError:
+        pass
+    return False
+
+
+ROUTES = {'/page': page, '/slow': slow_tail, '/cp1251': header_charset,
+          '/koi8': meta_charset, '/hang': hang}
+
+
+class FetchEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StandIn(ROUTES)
+        self.other = StandIn(ROUTES)
+        self.engine = ds.AsyncFetchEngine()
+
+    def tearDown(self):
+        self.engine.stop()
+        self.engine._thread.join(2)
+        self.server.stop()
+        self.other.stop()
+
+    def run_fetch(self, coro, timeout=5):
+        return self.engine.submit(coro).result(timeout)
+
+    def test_keep_alive_reused_per_host(self):
+        for server in (self.server, self.other, self.server, self.other):
+            ok, title, _ = self.run_fetch(self.engine.fetch_title(server.url('/page')))
+            self.assertTrue(ok)
+            self.assertEqual(title, "Hello")
+        # Two requests each, over one pooled connection per host:port
+        self.assertEqual((self.server.connections, self.other.connections), (1, 1))
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_stops_reading_at_title(self):
+        started = time.monotonic()
+        result = self.run_fetch(self.engine.fetch(self.server.url('/slow'), max_bytes=10 ** 7,
+                                                  stop_at=b'</title'))
+        self.assertLess(time.monotonic() - started, 2)   # didn't wait for the tail
+        self.assertTrue(result.ok)
+        self.assertIn(b'</title>', result.body)
+        self.assertLess(len(result.body), 65536)
+        # Too much body left to drain, so the connection isn't parked
+        self.assertEqual(self.engine._idle.get(('http', '127.0.0.1', self.server.server_address[1])) or [], [])
+
+    def test_charset_from_header_beats_meta(self):
+        ok, title, _ = self.run_fetch(self.engine.fetch_title(self.server.url('/cp1251')))
+        self.assertTrue(ok)
+        self.assertEqual(title, TITLE_RU)
+
+    def test_charset_from_meta(self):
+        ok, title, _ = self.run_fetch(self.engine.fetch_title(self.server.url('/koi8')))
+        self.assertTrue(ok)
+        self.assertEqual(title, TITLE_RU)
+
+    def test_detect_charset_fallback(self):
+        self.assertEqual(ds.detect_charset({}, b"<html>"), 'utf-8')
+        self.assertEqual(ds.detect_charset({'content-type': 'text/html; charset=bogus'},
+                                           b'<meta charset="latin-1">'), 'iso8859-1')
+
+    def test_read_timeout(self):
+        with mock.patch.object(ds, 'FETCH_READ_TIMEOUT', 0.3):
+            started = time.monotonic()
+            result = self.run_fetch(self.engine.fetch(self.server.url('/hang')))
+        self.assertFalse(result.ok)
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_cancel_closes_connection(self):
+        future = self.engine.submit(self.engine.fetch(self.server.url('/hang')))
+        deadline = time.monotonic() + 2
+        while not self.server.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        future.cancel()
+        self.assertTrue(future.cancelled())
+        self.assertTrue(self.server.closed_by_client.wait(2))
+
+    def test_stop_unwinds_pending_tasks(self):
+        self.engine.submit(self.engine.fetch(self.server.url('/hang')))
+        deadline = time.monotonic() + 2
+        while not self.server.requests and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.engine.stop()
+        self.engine._thread.join(2)
+        self.assertFalse(self.engine._thread.is_alive())
+        # Nothing left pending to be destroyed with the loop
+        self.assertEqual(ds.asyncio.all_tasks(self.engine._loop), set())
+
+
+class _HangingEngine:
+    """Hands out futures that only finish when cancelled."""
+    def submit(self, coro):
+        return concurrent.futures.Future()
+
+    def fetch_title(self, url):
+        return None
+
+
+class TitleServiceShutdownTest(unittest.TestCase):
+    def test_shutdown_with_fetches_in_flight(self):
+        app = QCoreApplication.instance() or QCoreApplication([])
+        service = ds.TitleFetchService(_HangingEngine(), cache=ds.TitleCache())
+        for i in range(ds.TITLE_FETCH_WORKERS):
+            service.request(f"https://h{i}.invalid/", lambda url, title: None)
+        service._pump()
+        self.assertEqual(len(service._in_flight), ds.TITLE_FETCH_WORKERS)
+        # cancel() runs _on_result synchronously, which pops from _in_flight
+        service.shutdown()
+        self.assertEqual(service._in_flight, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Search and name sort over out-of-line text.  python -m pytest tests"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# DropShelf creates its data directory and log file on import
+SCRATCH = tempfile.mkdtemp(prefix='dropshelf-test-')
+for var in ('XDG_DATA_HOME', 'APPDATA', 'HOME'):
+    os.environ[var] = SCRATCH
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DropShelf as ds
+
+# Large enough to go out of line; the marker sits past the preview
+LARGE = "x" * ds.LARGE_TEXT_THRESHOLD + " Needle " + "y" * 10
+
+
+class _Item:
+    """The slice of DraggableItem that compare_names uses."""
+    def __init__(self, blob_store, text):
+        entry = ds.store_out_of_line(blob_store, {'type': 'text', 'content': text})
+        self.blob_store, self.blob_key = blob_store, entry.get('blob')
+        self.out_of_line = bool(self.blob_key)
+        self.preview = entry['content']
+
+    def search_text(self):
+        return self.preview.lower()
+
+    def full_search_text(self):
+        return self.blob_store.search_text(self.blob_key) if self.out_of_line else self.search_text()
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(dir=SCRATCH)
+        self.blob_store = ds.BlobStore(os.path.join(self.dir, 'blobs'))
+
+    def test_entry_search_text_reads_past_preview(self):
+        entry = ds.store_out_of_line(self.blob_store, {'type': 'text', 'content': LARGE})
+        self.assertNotIn('needle', entry['content'].lower())
+        self.assertIn('needle', ds.entry_search_text(self.blob_store, entry))
+
+    def test_search_cache_is_bounded(self):
+        keys = [self.blob_store.put_text(c * 100) for c in "ABC"]
+        with mock.patch.object(ds, 'BLOB_SEARCH_CACHE_CHARS', 250):
+            for key in keys:
+                self.assertEqual(self.blob_store.search_text(key), self.blob_store.get_text(key).lower())
+        self.assertEqual(list(self.blob_store._search_texts), keys[1:])
+        self.assertEqual(self.blob_store._search_chars, 200)
+
+    def test_archive_searches_full_text(self):
+        archive = ds.ShelfArchive(os.path.join(self.dir, 'archive.db'), blob_store=self.blob_store)
+        entry = ds.store_out_of_line(self.blob_store, {
+            'type': 'text', 'content': LARGE, 'tags': [], 'date_added': '2024-01-01T00:00:00'})
+        archive.put([entry])
+        self.assertEqual(archive.count(None, 'needle'), 1)
+        self.assertEqual([e['blob'] for e in archive.page(10, query='needle')], [entry['blob']])
+        archive.close()
+
+    def test_name_order_past_preview(self):
+        # Identical previews; only the full text tells them apart
+        b = _Item(self.blob_store, LARGE.replace("Needle", "b"))
+        a = _Item(self.blob_store, LARGE.replace("Needle", "a"))
+        short = _Item(self.blob_store, "x" * 10)
+        items = sorted([b, a, short], key=ds.functools.cmp_to_key(ds.compare_names))
+        self.assertEqual(items, [short, a, b])
+
+
+if __name__ == '__main__':
+    unittest.main()
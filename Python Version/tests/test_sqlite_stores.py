@@ -0,0 +1,89 @@
+"""Opening ShelfArchive and ClipboardHistory over damaged files.  python -m pytest tests"""
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+# DropShelf creates its data directory and log file on import
+SCRATCH = tempfile.mkdtemp(prefix='dropshelf-test-')
+for var in ('XDG_DATA_HOME', 'APPDATA', 'HOME'):
+    os.environ[var] = SCRATCH
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DropShelf as ds
+
+
+class OpenSqliteTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(dir=SCRATCH)
+        self.blob_store = ds.BlobStore(os.path.join(self.dir, 'blobs'))
+
+    def damaged(self, name):
+        path = os.path.join(self.dir, name)
+        with open(path, 'wb') as f:
+            f.write(b"not a database" * 100)
+        return path
+
+    def open_stores(self, archive_path, history_path):
+        archive = ds.ShelfArchive(archive_path, blob_store=self.blob_store)
+        history = ds.ClipboardHistory(self.blob_store, history_path, legacy=None)
+        self.addCleanup(archive.close)
+        self.addCleanup(history.close)
+        return archive, history
+
+    def test_corrupt_files_are_set_aside(self):
+        archive_path, history_path = self.damaged('archive.db'), self.damaged('history.db')
+        archive, history = self.open_stores(archive_path, history_path)
+        for store, path in ((archive, archive_path), (history, history_path)):
+            self.assertEqual(len(store), 0)
+            self.assertTrue(os.path.exists(path + '.corrupt'))
+        history.append([ds.history_record({'type': 'text', 'content': "after"}, "2024-01-01")])
+        self.assertEqual(len(history), 1)
+
+    def test_second_corruption_keeps_first_backup(self):
+        path = self.damaged('history.db')
+        ds.ClipboardHistory(self.blob_store, path, legacy=None).close()
+        with open(path + '.corrupt', 'rb') as f:
+            first = f.read()
+        self.damaged('history.db')
+        history = ds.ClipboardHistory(self.blob_store, path, legacy=None)
+        self.addCleanup(history.close)
+        with open(path + '.corrupt', 'rb') as f:
+            self.assertEqual(f.read(), first)
+        backups = [n for n in os.listdir(self.dir) if n.startswith('history.db.corrupt-')]
+        self.assertEqual(len(backups), 1)
+
+    def test_locked_database_is_left_alone(self):
+        path = os.path.join(self.dir, 'history.db')
+        history = ds.ClipboardHistory(self.blob_store, path, legacy=None)
+        history.append([ds.history_record({'type': 'text', 'content': "kept"}, "2024-01-01")])
+        history.close()
+        holder = sqlite3.connect(path, isolation_level=None)
+        self.addCleanup(holder.close)
+        holder.execute("BEGIN EXCLUSIVE")
+        connect = sqlite3.connect
+        with mock.patch.object(ds.sqlite3, 'connect',
+                               side_effect=lambda p: connect(p, timeout=0.1)):
+            with self.assertRaises(sqlite3.OperationalError):
+                ds.ClipboardHistory(self.blob_store, path, legacy=None)
+        holder.execute("ROLLBACK")
+        self.assertFalse(os.path.exists(path + '.corrupt'))
+        history = ds.ClipboardHistory(self.blob_store, path, legacy=None)
+        self.addCleanup(history.close)
+        self.assertEqual(len(history), 1)
+
+    def test_open_failure_is_raised(self):
+        path = os.path.join(self.dir, 'archive.db')
+        ds.ShelfArchive(path, blob_store=self.blob_store).close()
+        with mock.patch.object(ds.sqlite3, 'connect',
+                               side_effect=sqlite3.OperationalError("unable to open database file")):
+            with self.assertRaises(sqlite3.OperationalError):
+                ds.ShelfArchive(path, blob_store=self.blob_store)
+        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path + '.corrupt'))
+
+
+if __name__ == '__main__':
+    unittest.main()